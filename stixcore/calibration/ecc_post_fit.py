@@ -25,18 +25,61 @@ This script to:
 
 """
 
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
 from lmfit import Model
 
 from astropy.io import fits
 
+from stixcore.config.config import CONFIG
 from stixcore.util.logging import get_logger
 
-__ALL__ = ["ecc_post_fit_on_fits", "ecc_post_fit"]
+__ALL__ = ["ecc_post_fit_on_fits", "ecc_post_fit", "fit_ba_lines", "read_all_pixels"]
 
 logger = get_logger(__name__)
 
+N_DETECTORS = 32
+N_PIXELS = 12
+
+#: the fit results of one pixel, see `Fit_Ba_Lines_Robust`
+BA_FIT_DTYPE = np.dtype(
+    [
+        ("DET", np.int64),
+        ("PIX", np.int64),
+        ("P31", np.float64),
+        ("err_P31", np.float64),
+        ("dE31", np.float64),
+        ("err_dE31", np.float64),
+        ("Flag31", np.bool_),
+        ("P81", np.float64),
+        ("err_P81", np.float64),
+        ("dE81", np.float64),
+        ("err_dE81", np.float64),
+        ("Flag81", np.bool_),
+        ("H31", np.float64),
+        ("H81", np.float64),
+    ]
+)
+
+# order of the results returned by Fit_Ba_Lines_Robust
+BA_FIT_RESULTS = [
+    "P31",
+    "P81",
+    "dE31",
+    "dE81",
+    "err_P31",
+    "err_P81",
+    "err_dE31",
+    "err_dE81",
+    "H31",
+    "H81",
+    "Flag31",
+    "Flag81",
+]
+
 
 def open_fits_tables(fits_path):
     # Get the data from .fits
@@ -64,6 +107,71 @@ def Read_fits_STIX_One_Pixel(data, PIX, DETECTOR_ID, Nbin=2024, NRebin=1, NSigma
     return erg_c, obs, yerr
 
 
+def read_all_pixels(data, Nbin=2024, NRebin=1):
+    """Read the spectra of all detectors and pixels.
+
+    Parameters
+    ----------
+    data : `astropy.io.fits.FITS_rec`
+        the ECC calibrated spectra (ERG_center and a column per pixel)
+
+    Returns
+    -------
+    `tuple` (`numpy.ndarray`, `numpy.ndarray`)
+        the energy bin centers (n) and the spectra (32 * 12, n) ordered by detector and pixel
+    """
+    nbin = int(Nbin / NRebin)
+    erg_c = data.ERG_center[:nbin]
+    obs = np.stack([data.field(3 + i)[:nbin] for i in range(N_DETECTORS * N_PIXELS)])
+    return erg_c, obs
+
+
+def _fit_pixels(erg_c, spectra):
+    return [Fit_Ba_Lines_Robust(erg_c, obs) for obs in spectra]
+
+
+def fit_ba_lines(erg_c, spectra, *, max_workers=None):
+    """Fit the Ba-133 31 and 81 keV lines of all pixel spectra.
+
+    The spectra are fitted in process by default. With more than one worker they are split into
+    one chunk per worker process of a new process pool, only opt in for stand alone use (e.g. the
+    benchmark) and not within the pipeline workers.
+
+    Parameters
+    ----------
+    erg_c : `numpy.ndarray`
+        the energy bin centers (n)
+    spectra : `numpy.ndarray`
+        the spectra (32 * 12, n) ordered by detector and pixel
+    max_workers : `int`, optional
+        number of worker processes, by default config 'ECC.post_fit_workers' (1: in process)
+
+    Returns
+    -------
+    `numpy.ndarray`
+        the fit results of each pixel (structured array of `BA_FIT_DTYPE`)
+    """
+    if max_workers is None:
+        max_workers = CONFIG.getint("ECC", "post_fit_workers", fallback=1)
+    erg_c = np.asarray(erg_c)
+    spectra = np.asarray(spectra)
+
+    if max_workers <= 1:
+        results = _fit_pixels(erg_c, spectra)
+    else:
+        chunks = np.array_split(spectra, min(max_workers, len(spectra)))
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            chunk_results = executor.map(_fit_pixels, [erg_c] * len(chunks), chunks)
+            results = [fit for chunk in chunk_results for fit in chunk]
+
+    res = np.zeros(len(spectra), dtype=BA_FIT_DTYPE)
+    res["DET"] = np.arange(len(spectra)) // N_PIXELS + 1
+    res["PIX"] = np.arange(len(spectra)) % N_PIXELS
+    for name, values in zip(BA_FIT_RESULTS, zip(*results)):
+        res[name] = values
+    return res
+
+
 def line(x, slope, intercept):
     """a line"""
     return slope * x + intercept
@@ -79,6 +187,16 @@ def gaussian(x, amp, cen, wid):
     return amp * np.exp(-((x - cen) ** 2) / (2 * wid**2))
 
 
+@lru_cache
+def _ba_line_models():
+    # the models are reused for all pixels (and ECC threads) of a process, lmfit fits copies of the parameters
+    mod81 = Model(gaussian) + Model(line)
+    pars81 = mod81.make_params(amp=10, cen=81, wid=0.5, slope=0, intercept=0)
+    mod31 = Model(gaussian, prefix="g1_") + Model(poly)
+    pars31 = mod31.make_params(g1_amp=10, g1_cen=30.6, g1_wid=0.4, degree=0.0, slope=0, intercept=0.0)
+    return (mod81, pars81), (mod31, pars31)
+
+
 def Fit_Ba_Lines_Robust(erg_c, obs):
     """
     OL, oct 22, 2024
@@ -93,8 +211,7 @@ def Fit_Ba_Lines_Robust(erg_c, obs):
     x = erg_c[pipo]
     x = np.array(x, dtype="float64")
     y = np.array(y, dtype="float64")
-    mod = Model(gaussian) + Model(line)
-    pars = mod.make_params(amp=10, cen=81, wid=0.5, slope=0, intercept=0)
+    (mod, pars), (mod31, pars31) = _ba_line_models()
     result = mod.fit(y, pars, x=x)
 
     if (
@@ -122,10 +239,7 @@ def Fit_Ba_Lines_Robust(erg_c, obs):
     x = np.array(x, dtype="float64")
     y = np.array(y, dtype="float64")
 
-    mod = Model(gaussian, prefix="g1_") + Model(poly)
-    pars = mod.make_params(g1_amp=10, g1_cen=30.6, g1_wid=0.4, degree=0.0, slope=0, intercept=0.0)
-
-    result = mod.fit(y, pars, x=x)
+    result = mod31.fit(y, pars31, x=x)
 
     if (
         (result.params["g1_wid"].stderr is not None)
@@ -159,44 +273,12 @@ def ecc_post_fit_on_fits(erg_file, para_file, livetime):
 
 
 def ecc_post_fit(data_erg, gain, off, goc, livetime):
-    DETs = np.arange(32) + 1
-    LARGEs = [0, 1, 2, 3, 4, 5, 6, 7]
-    SMALLs = [8, 9, 10, 11]
-    PIXELs = LARGEs + SMALLs
-
-    accumulator = []
-
-    # Proceed to fit individually each pixel spectrum in the list of files
-    for DET in DETs:
-        for PIX in PIXELs:  # or in  LARGEs, SMALLs
-            erg_c, obs, yerr = Read_fits_STIX_One_Pixel(data_erg, PIX=PIX, DETECTOR_ID=DET)
-
-            P31, P81, dE31, dE81, err_P31, err_P81, err_dE31, err_dE81, H31, H81, Goodness_Flag31, Goodness_Flag81 = (
-                Fit_Ba_Lines_Robust(erg_c, obs / livetime)
-            )
-
-            dict = {
-                "DET": [DET],
-                "PIX": [PIX],
-                "P31": [P31],
-                "err_P31": [err_P31],
-                "dE31": [dE31],
-                "err_dE31": [err_dE31],
-                "Flag31": [Goodness_Flag31],
-                "P81": [P81],
-                "err_P81": [err_P81],
-                "dE81": [dE81],
-                "err_dE81": [err_dE81],
-                "Flag81": [Goodness_Flag81],
-            }
-            logger.debug(dict)
-
-            # NB: this is faster to append a list of dict and create DataFrame at the end
-            # than concatenating the DataFrame row by row, this slows down dramatically progressively
-            accumulator.append(pd.DataFrame(dict))
-
-    df = pd.concat(accumulator)
-    df = df.reset_index(drop=True)
+    # Proceed to fit each pixel spectrum (32 detectors x 12 pixels)
+    erg_c, obs = read_all_pixels(data_erg)
+    res = fit_ba_lines(erg_c, obs / livetime)
+    logger.debug(res)
+
+    df = pd.DataFrame({name: res[name] for name in BA_FIT_DTYPE.names if name not in ("H31", "H81")})
 
     # 3- gain and offset correction factors of ECC pre-calibrated data
     G_prime = (df["P81"] - df["P31"]) / (80.9979 - (30.6254 * 33.8 + 30.9731 * 62.4) / (62.4 + 33.8))
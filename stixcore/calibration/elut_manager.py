@@ -1,12 +1,15 @@
 import sys
 from pathlib import Path
+from collections import OrderedDict
 
 from stixpy.calibration.detector import get_sci_channels
 from stixpy.io.readers import read_elut, read_elut_index
 
 from astropy.table import QTable
 
+from stixcore.config.config import CONFIG
 from stixcore.data.test import test_data
+from stixcore.util.content_cache import ContentCache, hash_files
 from stixcore.util.logging import get_logger
 from stixcore.util.singleton import Singleton
 
@@ -14,21 +17,31 @@ __all__ = ["ELUTManager"]
 
 ELUT_DATA_DIR = Path(__file__).parent.parent / "config" / "data" / "common" / "elut"
 
+ELUT_ARRAYS = ("offset", "gain", "pixel", "detector", "adc", "e_actual", "e_width_actual")
+
 logger = get_logger(__name__)
 
 
 class ELUTManager(metaclass=Singleton):
     """Manages ELUT (Energy Look-Up Table) data and provides date-based access to ELUT tables."""
 
-    def __init__(self, data_root=None):
+    def __init__(self, data_root=None, cache=None, max_cached=None):
         """Create the manager for ELUT data.
 
         Parameters
         ----------
         data_root : `str` | `pathlib.Path`, optional
             Path to the directory with ELUT data. If None, uses default path.
+        cache : `stixcore.util.content_cache.ContentCache`, optional
+            Cache for the parsed ELUT arrays shared by all processes. If None, uses default cache.
+        max_cached : `int`, optional
+            Number of ELUTs kept in memory, by default config 'Pipeline.elut_cache_size'.
         """
-        self.elut_cache = {}
+        self.elut_cache = OrderedDict()
+        self.cache = cache if cache is not None else ContentCache()
+        if max_cached is None:
+            max_cached = CONFIG.getint("Pipeline", "elut_cache_size", fallback=16)
+        self.max_cached = max_cached
         if data_root is None:
             data_root = ELUT_DATA_DIR
         self.data_root = Path(data_root)
@@ -106,6 +119,52 @@ class ELUTManager(metaclass=Singleton):
             logger.error(f"Error reading ELUT file {elut_file}: {e}")
             raise
 
+    def load_elut(self, elut_file, sci_channels):
+        """Load an ELUT from the shared cache, read and add it to the cache if not present yet.
+
+        The arrays of cached ELUTs are read-only memory maps keyed by the hash of the ELUT file.
+
+        Parameters
+        ----------
+        elut_file : `str`
+            The filename of the ELUT file to load
+        sci_channels : `QTable`
+            The science channel definition
+
+        Returns
+        -------
+        `stixpy.io.readers.ELUT`
+            The ELUT data
+
+        Raises
+        ------
+        FileNotFoundError
+            If the ELUT file doesn't exist
+        """
+        elut_path = self.data_root / elut_file
+        if not elut_path.exists():
+            raise FileNotFoundError(f"ELUT file not found: {elut_path}")
+
+        key = f"elut_{hash_files(elut_path)}"
+        cached = self.cache.get(key)
+        if cached is None:
+            elut = self.read_elut(elut_file, sci_channels)
+            self.cache.put(key, meta={"file": elut.file}, arrays={name: getattr(elut, name) for name in ELUT_ARRAYS})
+            return elut
+
+        meta, arrays = cached
+        logger.debug(f"Using ELUT {elut_file} from cache {self.cache.root}")
+        # same structure as returned by stixpy.io.readers.read_elut
+        elut = type("ELUT", (object,), dict())
+        elut.file = meta["file"]
+        for name in ELUT_ARRAYS:
+            setattr(elut, name, arrays[name])
+        elut.e = sci_channels["Elower"]
+        elut.e_sci_low = sci_channels["Elower"]
+        elut.e_sci_high = sci_channels["Eupper"]
+        elut.e_width = sci_channels["Eupper"] - sci_channels["Elower"]
+        return elut
+
     def get_elut(self, date) -> tuple[object, QTable]:
         """Get the ELUT table for a given date.
 
@@ -136,12 +195,15 @@ class ELUTManager(metaclass=Singleton):
         # Check cache first
         if elut_file in self.elut_cache:
             logger.debug(f"Using cached ELUT: {elut_file}")
+            self.elut_cache.move_to_end(elut_file)
             return self.elut_cache[elut_file]
 
-        # Read ELUT and cache it
+        # Load ELUT and cache it, drop the least recently used one
         sci_channels = get_sci_channels(date)
-        elut_table = self.read_elut(elut_file, sci_channels)
+        elut_table = self.load_elut(elut_file, sci_channels)
         self.elut_cache[elut_file] = (elut_table, sci_channels)
+        while len(self.elut_cache) > self.max_cached:
+            self.elut_cache.popitem(last=False)
 
         return self.elut_cache[elut_file]
 
@@ -10,6 +10,7 @@ from stixpy.io.readers import read_elut
 from astropy.table import QTable
 
 from stixcore.calibration.elut_manager import ELUTManager
+from stixcore.util.content_cache import ContentCache
 
 
 class TestELUTManagerBasics:
@@ -104,6 +105,27 @@ class TestELUTManagerBasics:
         # Results should be identical (cached)
         assert result1 is result2
 
+    def test_shared_cache(self, tmp_path):
+        """Test that ELUTs are loaded from the shared on-disk cache."""
+        manager = ELUTManager(cache=ContentCache(tmp_path), max_cached=1)
+
+        test_date = datetime(2022, 8, 1)
+        elut_read, _ = manager.get_elut(test_date)
+        assert len(list(tmp_path.iterdir())) == 1
+
+        # in memory LRU only keeps one ELUT
+        manager.get_elut(datetime(2024, 8, 1))
+        assert manager.cache_size == 1
+
+        elut_cached, sci_channels = manager.get_elut(test_date)
+        assert elut_cached is not elut_read
+        assert isinstance(elut_cached.adc, np.memmap)
+        assert not elut_cached.adc.flags.writeable
+        assert elut_cached.file == elut_read.file
+        assert np.all(elut_cached.adc == elut_read.adc)
+        assert np.all(elut_cached.e_actual == elut_read.e_actual)
+        assert np.all(elut_cached.e_sci_high == sci_channels["Eupper"])
+
     def test_clear_cache(self):
         """Test cache clearing functionality."""
         manager = ELUTManager()
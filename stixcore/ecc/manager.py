@@ -1,3 +1,4 @@
+import os
 import json
 import shutil
 import tempfile
@@ -7,6 +8,8 @@ from datetime import datetime
 from contextlib import contextmanager
 from configparser import ConfigParser
 
+from stixcore.config.config import CONFIG
+from stixcore.util.content_cache import ContentCache, hash_files, link_tree
 from stixcore.util.logging import get_logger
 
 __all__ = ["ECCManager"]
@@ -19,18 +22,24 @@ logger = get_logger(__name__)
 class ECCManager:
     """Manages ECC configurations and provides access to configuration data."""
 
-    def __init__(self, data_root=None):
+    def __init__(self, data_root=None, cache=None):
         """Create the manager for ECC configurations.
 
         Parameters
         ----------
         data_root : `str` | `pathlib.Path`, optional
             Path to the directory with all ECC configurations. If None, uses default path.
+        cache : `stixcore.util.content_cache.ContentCache`, optional
+            Cache for the parsed configurations and their read-only file snapshots. If None, uses
+            the default cache shared by all processes.
         """
         self.config_cache = dict()
         if data_root is None:
             data_root = ECC_CONF_INDEX_FILE.parent
         self.data_root = data_root
+        self.cache = cache if cache is not None else ContentCache()
+        # read-only files do not protect the shared snapshots against root: use copies
+        self.link_context = CONFIG.getboolean("ECC", "link_context", fallback=True) and os.geteuid() != 0
         self._load_index()
 
     @property
@@ -153,6 +162,10 @@ class ECCManager:
     def create_context(self, date=None):
         """Create a temporary folder with ECC configuration files for a given date.
 
+        The folder holds read-only hard links to a cached snapshot of the configuration (copies
+        if config 'ECC.link_context' is disabled, running as root or linking is not possible).
+        A snapshot evicted from the cache meanwhile is added again.
+
         Parameters
         ----------
         date : `datetime`, optional
@@ -183,32 +196,19 @@ class ECCManager:
         temp_dir = Path(tempfile.mkdtemp(prefix=f"ecc_context_{configuration_name}_"))
 
         try:
-            # Copy configuration files to temporary directory
-            config_source = self.get_configuration_path(configuration_name)
-            shutil.copytree(config_source, temp_dir, dirs_exist_ok=True)
+            entry, ECC_Config = self._get_cached_configuration(configuration_name)
+            try:
+                self._populate_context(entry, temp_dir)
+            except FileNotFoundError:
+                # evicted by another process since looked up
+                logger.info(f"ECC configuration {configuration_name} evicted from cache: adding it again")
+                self.config_cache.pop(configuration_name, None)
+                shutil.rmtree(temp_dir)
+                temp_dir.mkdir()
+                entry, ECC_Config = self._get_cached_configuration(configuration_name)
+                self._populate_context(entry, temp_dir)
 
             logger.info(f"Created ECC context in: {temp_dir}")
-
-            config = ConfigParser()
-            config.read(temp_dir / "post_ecc.ini")
-
-            ECC_Config = SimpleNamespace(
-                Max_Gain_Prime=config.getfloat("DEFAULT", "Max_Gain_Prime", fallback=1.4),
-                Min_Gain_Prime=config.getfloat("DEFAULT", "Min_Gain_Prime", fallback=0.4),
-                Min_Gain=config.getfloat("DEFAULT", "Min_Gain", fallback=0.4),
-                Ignore_Max_Gain_Prime_Det_Pix_List=json.loads(
-                    config.get("DEFAULT", "Ignore_Max_Gain_Prime_Det_Pix_List", fallback="[]")
-                ),
-                Ignore_Min_Gain_Prime_Det_Pix_List=json.loads(
-                    config.get("DEFAULT", "Ignore_Min_Gain_Prime_Det_Pix_List", fallback="[]")
-                ),
-                Ignore_Min_Gain_Det_Pix_List=json.loads(
-                    config.get("DEFAULT", "Ignore_Min_Gain_Det_Pix_List", fallback="[]")
-                ),
-                Name=configuration_name,
-            )
-
-            logger.info(f"Read config from in: {temp_dir / 'post_ecc.ini'}")
             return temp_dir, ECC_Config
 
         except Exception as e:
@@ -217,6 +217,80 @@ class ECCManager:
                 shutil.rmtree(temp_dir)
             raise e
 
+    def _populate_context(self, entry, context_path):
+        """Link or copy the files of a cache entry into a context directory."""
+        if self.link_context:
+            # the linked files are read-only and shared with the cache and all other contexts
+            link_tree(entry / "files", context_path)
+        else:
+            shutil.copytree(entry / "files", context_path, dirs_exist_ok=True)
+
+    def _get_cached_configuration(self, configuration_name):
+        """Get the cache entry of a configuration, add it to the cache if not present yet.
+
+        The cache key is the hash of the content of the configuration directory, so changed
+        configurations get a new entry.
+
+        Parameters
+        ----------
+        configuration_name : `str`
+            configuration identifier
+
+        Returns
+        -------
+        `pathlib.Path`
+            the directory of the cache entry with the configuration files in the 'files' folder
+        `SimpleNamespace`
+            config read from post_ecc.ini
+        """
+        key = self.config_cache.get(configuration_name)
+        cached = self.cache.get(key) if key else None
+        if cached is None:
+            config_source = self.get_configuration_path(configuration_name)
+            key = f"ecc_{configuration_name}_{hash_files(config_source)}"
+            cached = self.cache.get(key)
+            if cached is None:
+                settings = self._read_post_ecc_config(config_source / "post_ecc.ini")
+                self.cache.put(key, meta=settings, files=config_source)
+                cached = settings, {}
+            self.config_cache[configuration_name] = key
+
+        settings, _ = cached
+        return self.cache.path(key), SimpleNamespace(**settings, Name=configuration_name)
+
+    @staticmethod
+    def _read_post_ecc_config(config_file):
+        """Read the post ECC settings.
+
+        Parameters
+        ----------
+        config_file : `pathlib.Path`
+            the post_ecc.ini file
+
+        Returns
+        -------
+        `dict`
+            the settings with defaults for all missing values
+        """
+        config = ConfigParser()
+        config.read(config_file)
+        logger.info(f"Read config from in: {config_file}")
+
+        return dict(
+            Max_Gain_Prime=config.getfloat("DEFAULT", "Max_Gain_Prime", fallback=1.4),
+            Min_Gain_Prime=config.getfloat("DEFAULT", "Min_Gain_Prime", fallback=0.4),
+            Min_Gain=config.getfloat("DEFAULT", "Min_Gain", fallback=0.4),
+            Ignore_Max_Gain_Prime_Det_Pix_List=json.loads(
+                config.get("DEFAULT", "Ignore_Max_Gain_Prime_Det_Pix_List", fallback="[]")
+            ),
+            Ignore_Min_Gain_Prime_Det_Pix_List=json.loads(
+                config.get("DEFAULT", "Ignore_Min_Gain_Prime_Det_Pix_List", fallback="[]")
+            ),
+            Ignore_Min_Gain_Det_Pix_List=json.loads(
+                config.get("DEFAULT", "Ignore_Min_Gain_Det_Pix_List", fallback="[]")
+            ),
+        )
+
     def cleanup_context(self, context):
         """Clean up a temporary context directory.
 
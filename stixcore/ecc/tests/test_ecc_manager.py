@@ -9,6 +9,7 @@ from unittest.mock import patch, mock_open
 import pytest
 
 from stixcore.ecc.manager import ECCManager
+from stixcore.util.content_cache import ContentCache
 
 
 class TestECCManager:
@@ -370,3 +371,74 @@ class TestECCManager:
             with pytest.raises(FileNotFoundError, match="Configuration directory not found"):
                 with manager.context(date):
                     pass
+
+    def test_create_context_cached(self):
+        """Test that contexts link the files of a cached configuration snapshot."""
+        (self.config1_dir / "post_ecc.ini").write_text(
+            "[DEFAULT]\nMin_Gain = 0.5\nIgnore_Min_Gain_Det_Pix_List = [[1, 2]]\n"
+        )
+        cache = ContentCache(self.temp_dir / "cache")
+        with (
+            patch("stixcore.ecc.manager.open", mock_open(read_data=json.dumps(self.test_index))),
+            patch("stixcore.ecc.manager.os.geteuid", return_value=1000),
+        ):
+            manager = ECCManager(data_root=self.ecc_dir, cache=cache)
+
+            date = datetime(2021, 6, 15)
+            with manager.context(date) as (context_path1, config1), manager.context(date) as (context_path2, config2):
+                assert context_path1 != context_path2
+                assert config1 == config2
+                assert config1.Min_Gain == 0.5
+                assert config1.Max_Gain_Prime == 1.4
+                assert config1.Ignore_Min_Gain_Det_Pix_List == [[1, 2]]
+                assert config1.Name == "ecc_cfg_1"
+
+                # both contexts share the read-only files of one cache entry
+                (entry,) = cache.root.iterdir()
+                assert (context_path1 / "params.txt").samefile(entry / "files" / "params.txt")
+                assert (context_path2 / "params.txt").samefile(entry / "files" / "params.txt")
+                assert not (context_path1 / "params.txt").stat().st_mode & 0o222
+
+            # changed configuration gets a new entry
+            (self.config1_dir / "params.txt").write_text("new test parameters 1")
+            manager = ECCManager(data_root=self.ecc_dir, cache=cache)
+            with manager.context(date) as (context_path, _):
+                assert (context_path / "params.txt").read_text() == "new test parameters 1"
+            assert len(list(cache.root.iterdir())) == 2
+
+    def test_create_context_root(self):
+        """Test that contexts of root are copies, the read-only files do not protect the cache."""
+        cache = ContentCache(self.temp_dir / "cache")
+        with (
+            patch("stixcore.ecc.manager.open", mock_open(read_data=json.dumps(self.test_index))),
+            patch("stixcore.ecc.manager.os.geteuid", return_value=0),
+        ):
+            manager = ECCManager(data_root=self.ecc_dir, cache=cache)
+            with manager.context(datetime(2021, 6, 15)) as (context_path, _):
+                (entry,) = cache.root.iterdir()
+                assert not (context_path / "params.txt").samefile(entry / "files" / "params.txt")
+                assert (context_path / "params.txt").read_text() == "test parameters 1"
+
+    def test_create_context_evicted(self):
+        """Test that a configuration evicted from the cache by another process is added again."""
+        cache = ContentCache(self.temp_dir / "cache")
+        with patch("stixcore.ecc.manager.open", mock_open(read_data=json.dumps(self.test_index))):
+            manager = ECCManager(data_root=self.ecc_dir, cache=cache)
+            lookups = []
+
+            def get_cached_configuration(configuration_name):
+                cached = ECCManager._get_cached_configuration(manager, configuration_name)
+                if not lookups:
+                    # evicted by another process after the lookup
+                    cache.clear()
+                lookups.append(configuration_name)
+                return cached
+
+            with (
+                patch.object(manager, "_get_cached_configuration", get_cached_configuration),
+                manager.context(datetime(2021, 6, 15)) as (context_path, config),
+            ):
+                assert (context_path / "params.txt").read_text() == "test parameters 1"
+                assert config.Name == "ecc_cfg_1"
+            assert len(lookups) == 2
+            assert len(list(cache.root.iterdir())) == 1
@@ -0,0 +1,128 @@
+"""Persistent cache of the ephemeris values written to the FITS headers."""
+
+import json
+import hashlib
+import sqlite3
+
+from stixcore.util.logging import get_logger
+
+__all__ = ["EphemerisHeaderCache", "meta_kernel_fingerprint"]
+
+logger = get_logger(__name__)
+
+
+def meta_kernel_fingerprint(meta_kernel_pathes):
+    """Get a fingerprint of the content of meta kernels.
+
+    The kernels of a meta kernel do not change (new versions get new file names), so the content
+    of the meta kernels identifies the loaded ephemeris.
+
+    Parameters
+    ----------
+    meta_kernel_pathes : `list` of `pathlib.Path`
+        the loaded meta kernels in order of loading
+
+    Returns
+    -------
+    `str`
+        the fingerprint
+    """
+    fingerprint = hashlib.sha256()
+    for mk in meta_kernel_pathes:
+        fingerprint.update(mk.name.encode())
+        fingerprint.update(mk.read_bytes())
+    return fingerprint.hexdigest()
+
+
+class EphemerisHeaderCache:
+    """Cache of the ephemeris header values by meta kernel fingerprint and time.
+
+    The values are kept in memory and optionally in a sqlite DB file shared by all processes and
+    pipeline runs. Errors accessing the DB file are logged and the values are recomputed.
+    """
+
+    def __init__(self, filename=None):
+        """Create a new cache. Will open or create the given sqlite DB file.
+
+        Parameters
+        ----------
+        filename : path like object, optional
+            path to the sqlite database file, if not set the values are only cached in memory
+        """
+        self.filename = filename
+        self.conn = None
+        self.memory = dict()
+        if filename:
+            self._connect_database()
+
+    def _connect_database(self):
+        try:
+            self.conn = sqlite3.connect(self.filename, timeout=60)
+            self.conn.execute(
+                """CREATE TABLE if not exists ephemeris_headers (
+                        mk TEXT NOT NULL,
+                        et FLOAT NOT NULL,
+                        headers TEXT NOT NULL,
+                        PRIMARY KEY (mk, et)
+                    )
+                """
+            )
+            self.conn.commit()
+            logger.info(f"Ephemeris header cache loaded from {self.filename}")
+        except sqlite3.Error:
+            logger.warning(f"Failed to load ephemeris header cache from {self.filename}", exc_info=True)
+            self.close()
+
+    def get(self, mk, et):
+        """Get the cached header values.
+
+        Parameters
+        ----------
+        mk : `str`
+            the meta kernel fingerprint
+        et : `float`
+            the (rounded) ephemeris time
+
+        Returns
+        -------
+        `dict` or `None`
+            the header values or `None` if not cached
+        """
+        key = (mk, et)
+        if key not in self.memory and self.conn is not None:
+            try:
+                row = self.conn.execute("select headers from ephemeris_headers where mk = ? and et = ?", key).fetchone()
+                if row is not None:
+                    self.memory[key] = json.loads(row[0])
+            except sqlite3.Error:
+                logger.warning("Failed to read ephemeris header cache", exc_info=True)
+        return self.memory.get(key)
+
+    def put(self, mk, et, values):
+        """Add header values to the cache.
+
+        Parameters
+        ----------
+        mk : `str`
+            the meta kernel fingerprint
+        et : `float`
+            the (rounded) ephemeris time
+        values : `dict`
+            the header values (JSON serializable)
+        """
+        self.memory[(mk, et)] = values
+        if self.conn is not None:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "insert or replace into ephemeris_headers (mk, et, headers) values (?, ?, ?)",
+                        (mk, et, json.dumps(values)),
+                    )
+            except sqlite3.Error:
+                logger.warning("Failed to write ephemeris header cache", exc_info=True)
+
+    def close(self):
+        """Close the DB connection."""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -21,6 +21,7 @@ import astropy.units as u
 from astropy.time.core import Time as ApTime
 
 from stixcore.config.config import CONFIG
+from stixcore.ephemeris.cache import EphemerisHeaderCache, meta_kernel_fingerprint
 from stixcore.util.logging import get_logger
 from stixcore.util.singleton import Singleton
 
@@ -29,7 +30,17 @@ SOLAR_ORBITER_SRF_FRAME_ID = -144000
 SOLAR_ORBITER_STIX_ILS_FRAME_ID = -144851
 SOLAR_ORBITER_STIX_OPT_FRAME_D = -144852
 
-__all__ = ["SpiceKernelLoader", "Spice", "SpiceKernelManager", "SpiceKernelType"]
+__all__ = [
+    "SpiceKernelLoader",
+    "Spice",
+    "SpiceKernelManager",
+    "SpiceKernelType",
+    "SpiceClockCorrelation",
+    "EphemerisSampler",
+]
+
+J2000_UTC = np.datetime64("2000-01-01T12:00:00", "us")
+SEC_PER_DAY = 86400
 
 logger = get_logger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -226,6 +237,288 @@ class SpiceKernelLoader:
         return wrapped
 
 
+def _pool_values(name):
+    n, _ = spiceypy.dtpool(name)
+    return np.asarray(spiceypy.gdpool(name, 0, n), dtype=np.float64)
+
+
+class SpiceClockCorrelation:
+    """Vectorised SCET to UTC conversion from the SCLK correlation table of the loaded kernels.
+
+    The type 1 SCLK coefficients (encoded clock, parallel time, rate), partitions and the leap
+    second table are read once from the kernel pool. Whole coarse/fine arrays are then converted
+    with `numpy.searchsorted` and the same linear interpolation as ``spiceypy.scs2e`` does per
+    sample.
+    """
+
+    def __init__(self, clock_id=SOLAR_ORBITER_ID):
+        """Read the correlation table for the given clock from the kernel pool.
+
+        Parameters
+        ----------
+        clock_id : `int`, optional
+            the NAIF clock ID, by default SOLAR_ORBITER_ID
+
+        Raises
+        ------
+        ValueError
+            if the loaded SCLK kernel is not a two field type 1 clock
+        """
+        sid = -clock_id
+        try:
+            data_type = _pool_values(f"SCLK_DATA_TYPE_{sid}")[0]
+        except NotFoundError:
+            data_type = 1
+        if data_type != 1:
+            raise ValueError(f"Unsupported SCLK data type: {data_type}")
+
+        moduli = _pool_values(f"SCLK01_MODULI_{sid}").astype(np.int64)
+        if len(moduli) != 2:
+            raise ValueError(f"Unsupported number of SCLK fields: {len(moduli)}")
+        self.ticks_per_count = moduli[1]
+        try:
+            self.offsets = _pool_values(f"SCLK01_OFFSETS_{sid}").astype(np.int64)
+        except NotFoundError:
+            self.offsets = np.zeros(2, dtype=np.int64)
+        try:
+            self.time_system = int(_pool_values(f"SCLK01_TIME_SYSTEM_{sid}")[0])
+        except NotFoundError:
+            # TDB is the SPICE default parallel time system
+            self.time_system = 1
+
+        self.partition_start = _pool_values(f"SCLK_PARTITION_START_{sid}").astype(np.int64)
+        self.partition_end = _pool_values(f"SCLK_PARTITION_END_{sid}").astype(np.int64)
+        # ticks of all previous partitions
+        lengths = self.partition_end - self.partition_start
+        self.partition_base = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        coeffs = _pool_values(f"SCLK01_COEFFICIENTS_{sid}").reshape(-1, 3)
+        self.clock = coeffs[:, 0].astype(np.int64)
+        self.parallel = coeffs[:, 1]
+        self.rate = coeffs[:, 2]
+
+        self.delta_t_a = _pool_values("DELTET/DELTA_T_A")[0]
+        self.k = _pool_values("DELTET/K")[0]
+        self.eb = _pool_values("DELTET/EB")[0]
+        self.m = _pool_values("DELTET/M")
+        delta_at = _pool_values("DELTET/DELTA_AT").reshape(-1, 2)
+        self.leap_delta = delta_at[:, 0]
+        # TAI seconds past J2000 at which each DELTA_AT value takes effect
+        self.leap_tai = delta_at[:, 1] + delta_at[:, 0]
+
+    def encode(self, coarse, fine):
+        """Encode coarse and fine times into continuous SCLK ticks (like ``scencd``).
+
+        A clock value is placed in the first partition containing it.
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            coarse times
+        fine : `numpy.ndarray`
+            fine times
+
+        Returns
+        -------
+        `numpy.ndarray`
+            the encoded SCLK ticks as int64
+
+        Raises
+        ------
+        ValueError
+            if a clock value is outside of all partitions
+        """
+        ticks = (np.asarray(coarse, dtype=np.int64) - self.offsets[0]) * self.ticks_per_count + (
+            np.asarray(fine, dtype=np.int64) - self.offsets[1]
+        )
+        encoded = np.full(ticks.shape, -1, dtype=np.int64)
+        for start, end, base in reversed(list(zip(self.partition_start, self.partition_end, self.partition_base))):
+            in_part = (ticks >= start) & (ticks <= end)
+            encoded[in_part] = base + ticks[in_part] - start
+        if np.any(encoded < 0):
+            raise ValueError("SCLK value outside of all partitions")
+        return encoded
+
+    def _tdb_minus_tdt(self, tdt):
+        m = self.m[0] + self.m[1] * tdt
+        return self.k * np.sin(m + self.eb * np.sin(m))
+
+    def scet_to_et(self, coarse, fine):
+        """Convert SCET to ephemeris time (TDB seconds past J2000).
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            coarse times
+        fine : `numpy.ndarray`
+            fine times
+
+        Returns
+        -------
+        `numpy.ndarray`
+            ephemeris times
+        """
+        parallel = self._scet_to_parallel(coarse, fine)
+        if self.time_system == 2:
+            return parallel + self._tdb_minus_tdt(parallel)
+        return parallel
+
+    def _scet_to_parallel(self, coarse, fine):
+        encoded = self.encode(coarse, fine)
+        idx = np.clip(np.searchsorted(self.clock, encoded, side="right") - 1, 0, len(self.clock) - 1)
+        return self.parallel[idx] + self.rate[idx] * ((encoded - self.clock[idx]) / self.ticks_per_count)
+
+    def _scet_to_tdt(self, coarse, fine):
+        parallel = self._scet_to_parallel(coarse, fine)
+        if self.time_system == 2:
+            return parallel
+        # invert TDB = TDT + K sin(E(TDT)) as SPICE does for ET inputs
+        tdt = parallel
+        for _ in range(3):
+            tdt = parallel - self._tdb_minus_tdt(tdt)
+        return tdt
+
+    def scet_to_datetime64(self, coarse, fine):
+        """Convert SCET to UTC.
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            coarse times
+        fine : `numpy.ndarray`
+            fine times
+
+        Returns
+        -------
+        `numpy.ndarray`
+            UTC times as ``datetime64[us]``
+        """
+        tai = self._scet_to_tdt(coarse, fine) - self.delta_t_a
+        idx = np.clip(np.searchsorted(self.leap_tai, tai, side="right") - 1, 0, len(self.leap_tai) - 1)
+        utc = tai - self.leap_delta[idx]
+        return J2000_UTC + np.round(utc * 1e6).astype("timedelta64[us]")
+
+
+def _wrap_angle(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def _unwrap_angle(angle):
+    """Unwrap the angles (n, m) along the first axis, unavailable (NaN) values are skipped."""
+    angle = angle.copy()
+    for column in angle.T:
+        finite = np.isfinite(column)
+        column[finite] = np.unwrap(column[finite])
+    return angle
+
+
+def _positional_state(et):
+    """Get roll, pitch, yaw [rad], the Stonyhurst and the HEEQ position [km] of Solar Orbiter.
+
+    Unavailable data (e.g. missing attitude kernels) are NaN.
+    """
+    state = np.full(9, np.nan)
+    try:
+        sc = spiceypy.sce2c(SOLAR_ORBITER_ID, et)
+        cmat, *_ = spiceypy.ckgp(SOLAR_ORBITER_STIX_ILS_FRAME_ID, sc, 1.0, "SOLO_SUN_RTN")
+        state[0:3] = spiceypy.m2eul(cmat @ np.eye(3), 1, 2, 3)
+    except (SpiceyError, NotFoundError):
+        pass
+    try:
+        state[3:6] = spiceypy.spkezr("SOLO", et, "SUN_EARTH_CEQU", "None", "Sun")[0][:3]
+        state[6:9] = spiceypy.spkezr("SOLO", et, "SOLO_HEEQ", "None", "Sun")[0][:3]
+    except SpiceyError:
+        pass
+    return state
+
+
+class EphemerisSampler:
+    """Vectorised sampling of the positional data of Solar Orbiter for whole time arrays.
+
+    The state (attitude and positions) is evaluated once per (ephemeris) day on a regular grid and
+    linearly interpolated onto the requested times. The interpolation error of each grid interval
+    is estimated at the interval midpoint. Times in intervals with an estimated error above the
+    tolerance (e.g. attitude changes or gaps in the kernels) are evaluated exactly, as are days with
+    less samples than evaluations of the grid. Excursions shorter than half of the grid step might
+    not be detected.
+    """
+
+    def __init__(self, *, step=None, angle_tolerance=None, position_tolerance=None):
+        """Create a new sampler for the loaded kernels.
+
+        Parameters
+        ----------
+        step : `float`, optional
+            the grid step in seconds, by default config 'Spice.sampler_step'
+        angle_tolerance : `float`, optional
+            the maximal interpolation error of the attitude in rad, by default config
+            'Spice.sampler_angle_tolerance'
+        position_tolerance : `float`, optional
+            the maximal interpolation error of the positions in km, by default config
+            'Spice.sampler_position_tolerance'
+        """
+        self.step = step or CONFIG.getfloat("Spice", "sampler_step", fallback=300.0)
+        if angle_tolerance is None:
+            angle_tolerance = CONFIG.getfloat("Spice", "sampler_angle_tolerance", fallback=1e-6)
+        if position_tolerance is None:
+            position_tolerance = CONFIG.getfloat("Spice", "sampler_position_tolerance", fallback=1.0)
+        self.tolerance = np.array([angle_tolerance] * 3 + [position_tolerance] * 6)
+        self.days = dict()
+
+    def _get_day(self, day):
+        if day not in self.days:
+            grid = day * SEC_PER_DAY + np.arange(0, SEC_PER_DAY + self.step, self.step)
+            values = np.array([_positional_state(et) for et in grid])
+            values[:, 0:3] = _unwrap_angle(values[:, 0:3])
+            midpoints = np.array([_positional_state(et) for et in grid[:-1] + self.step / 2])
+            errors = np.abs(midpoints - (values[:-1] + values[1:]) / 2)
+            errors[:, 0:3] = np.abs(_wrap_angle(errors[:, 0:3]))
+            self.days[day] = grid, values, errors
+        return self.days[day]
+
+    def sample(self, et):
+        """Get the state for all ephemeris times.
+
+        Parameters
+        ----------
+        et : `numpy.ndarray`
+            the ephemeris times
+
+        Returns
+        -------
+        `tuple` (`numpy.ndarray`, `numpy.ndarray`)
+            the states (n, 9) roll, pitch, yaw [rad], SUN_EARTH_CEQU xyz [km] and SOLO_HEEQ xyz [km]
+            and the error bounds of the interpolation for each value (0 for exact values).
+        """
+        et = np.atleast_1d(np.asarray(et, dtype=np.float64))
+        states = np.empty((et.size, 9))
+        bounds = np.empty((et.size, 9))
+        days = np.floor(et / SEC_PER_DAY).astype(np.int64)
+        for day in np.unique(days):
+            in_day = days == day
+            t = et[in_day]
+            if day not in self.days and t.size < 2 * SEC_PER_DAY / self.step:
+                # evaluating the grid of the day is more expensive than the samples
+                states[in_day] = [_positional_state(e) for e in t]
+                bounds[in_day] = 0
+                continue
+            grid, values, errors = self._get_day(day)
+            idx = np.clip(np.searchsorted(grid, t, side="right") - 1, 0, len(grid) - 2)
+            frac = ((t - grid[idx]) / self.step)[:, np.newaxis]
+            day_states = values[idx] + (values[idx + 1] - values[idx]) * frac
+            day_bounds = errors[idx]
+
+            exact = ~np.all(day_bounds <= self.tolerance, axis=1)
+            if exact.any():
+                day_states[exact] = [_positional_state(e) for e in t[exact]]
+                day_bounds[exact] = 0
+            states[in_day] = day_states
+            bounds[in_day] = day_bounds
+
+        states[:, 0:3] = _wrap_angle(states[:, 0:3])
+        return states, bounds
+
+
 class Spice(SpiceKernelLoader, metaclass=Singleton):
     """Wrapper to spice functions.
 
@@ -250,6 +543,20 @@ class Spice(SpiceKernelLoader, metaclass=Singleton):
     <Quantity 44917232.72028707 km>)
     """
 
+    def __init__(self, meta_kernel_pathes):
+        """Create an instance loading the spice kernel in the given meta kernel file.
+
+        Parameters
+        ----------
+        meta_kernel_path : list of `str` or `pathlib.Path`
+            Path to the meta kernel
+        """
+        super().__init__(meta_kernel_pathes)
+        self._clock_correlation = dict()
+        self._ephemeris_sampler = dict()
+        self._header_cache = EphemerisHeaderCache(CONFIG.get("Spice", "header_cache_file", fallback=None))
+        self._mk_fingerprint = meta_kernel_fingerprint([mkp for mkp, _, _ in self.meta_kernel_path])
+
     def scet_to_utc(self, scet):
         """
         Convert SCET to UTC time string in ISO format.
@@ -316,6 +623,39 @@ class Spice(SpiceKernelLoader, metaclass=Singleton):
             ephemeris_time = spiceypy.scs2e(SOLAR_ORBITER_ID, scet)
         return spiceypy.et2datetime(ephemeris_time)
 
+    def get_clock_correlation(self):
+        """Get the SCLK correlation of the loaded kernels.
+
+        The correlation is extracted once from the kernel pool and cached per loaded meta kernels.
+
+        Returns
+        -------
+        `SpiceClockCorrelation`
+            The clock correlation.
+        """
+        key = tuple(str(mkp) for mkp, _, _ in self.meta_kernel_path)
+        if key not in self._clock_correlation:
+            self._clock_correlation[key] = SpiceClockCorrelation()
+        return self._clock_correlation[key]
+
+    def scet_to_datetime64(self, coarse, fine):
+        """
+        Convert arrays of SCET to UTC.
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            coarse times
+        fine : `numpy.ndarray`
+            fine times
+
+        Returns
+        -------
+        `numpy.ndarray`
+            UTC times as ``datetime64[us]``
+        """
+        return self.get_clock_correlation().scet_to_datetime64(coarse, fine)
+
     def datetime_to_scet(self, adatetime):
         """
         Convert datetime to SCET.
@@ -388,6 +728,70 @@ class Spice(SpiceKernelLoader, metaclass=Singleton):
 
         return rsun_arc
 
+    def get_ephemeris_sampler(self):
+        """Get the ephemeris sampler of the loaded kernels.
+
+        The sampler (and its evaluated days) is cached per loaded meta kernels.
+
+        Returns
+        -------
+        `EphemerisSampler`
+            The sampler.
+        """
+        key = tuple(str(mkp) for mkp, _, _ in self.meta_kernel_path)
+        if key not in self._ephemeris_sampler:
+            self._ephemeris_sampler[key] = EphemerisSampler()
+        return self._ephemeris_sampler[key]
+
+    def sample_auxiliary_positional_data(self, times):
+        """Get the auxiliary positional data for an array of times.
+
+        Vectorised version of `get_auxiliary_positional_data` and `get_sun_disc_size` based
+        on the `EphemerisSampler`.
+
+        Parameters
+        ----------
+        times : `stixcore.time.SCETime`
+            the times
+
+        Returns
+        -------
+        `tuple` (`dict`, `dict`)
+            The columns 'roll_angle_rpy', 'solo_loc_carrington_dist', 'solo_loc_carrington_lonlat',
+            'solo_loc_heeq_zxy' and 'spice_disc_size' and the upper bounds of the interpolation
+            errors of each column.
+        """
+        coarse = np.atleast_1d(times.coarse)
+        fine = np.atleast_1d(times.fine)
+        et = self.get_clock_correlation().scet_to_et(coarse, fine)
+        states, bounds = self.get_ephemeris_sampler().sample(et)
+
+        x, y, z = states[:, 3:6].T
+        dist = np.sqrt(x**2 + y**2 + z**2)
+        dist_err = np.linalg.norm(bounds[:, 3:6], axis=1)
+        sun_radius = (1 * u.R_sun).to_value("km")
+        disc_size = np.arcsin(sun_radius / dist)
+        columns = {
+            "roll_angle_rpy": np.rad2deg(states[:, 0:3]) * u.deg,
+            "solo_loc_carrington_dist": dist[:, np.newaxis] * u.km,
+            "solo_loc_carrington_lonlat": np.rad2deg(
+                np.column_stack([np.arctan2(y, x), np.arctan2(z, np.sqrt(x**2 + y**2))])
+            )
+            * u.deg,
+            "solo_loc_heeq_zxy": states[:, 6:9] * u.km,
+            "spice_disc_size": (disc_size * u.rad).to("arcsec"),
+        }
+        errors = {
+            "roll_angle_rpy": np.rad2deg(bounds[:, 0:3].max(initial=0)) * u.deg,
+            "solo_loc_carrington_dist": dist_err.max(initial=0) * u.km,
+            "solo_loc_carrington_lonlat": np.rad2deg(np.nanmax(dist_err / dist, initial=0)) * u.deg,
+            "solo_loc_heeq_zxy": bounds[:, 6:9].max(initial=0) * u.km,
+            "spice_disc_size": (
+                np.nanmax(sun_radius / (dist * np.sqrt(dist**2 - sun_radius**2)) * dist_err, initial=0) * u.rad
+            ).to("arcsec"),
+        }
+        return columns, errors
+
     def get_position(self, *, date, frame):
         """
         Get the position of SolarOrbiter at the given date in the given coordinate frame.
@@ -463,71 +867,121 @@ class Spice(SpiceKernelLoader, metaclass=Singleton):
 
         return x, y
 
+    def get_header_cache(self):
+        """Get the cache of the ephemeris header values.
+
+        The cache is persisted in the sqlite file of config 'Spice.header_cache_file' if set. The
+        values are keyed by the fingerprint of the loaded meta kernels.
+
+        Returns
+        -------
+        `stixcore.ephemeris.cache.EphemerisHeaderCache`
+            The cache.
+        """
+        return self._header_cache
+
+    @staticmethod
+    def _get_ephemeris_header_values(et):
+        obstime = ApTime(spiceypy.et2utc(et, "ISOC", 6), scale="utc")
+
+        # HeliographicStonyhurst
+        solo_sun_hg, sun_solo_lt = spiceypy.spkezr("SOLO", et, "SUN_EARTH_CEQU", "None", "Sun")
+        # Convert to spherical and add units
+        hg_rad, hg_lon, hg_lat = spiceypy.reclat(solo_sun_hg[:3])
+        hg_rad = hg_rad * u.km
+        hg_lat, hg_lon = (hg_lat * u.rad).to("deg"), (hg_lon * u.rad).to("deg")
+        # Calculate radial velocity add units
+        rad_vel, *_ = spiceypy.reclat(solo_sun_hg[3:])
+        rad_vel = rad_vel * (u.km / u.s)
+
+        hgs = HeliographicStonyhurst(hg_lon, hg_lat, hg_rad, obstime=obstime.to_datetime())
+        hgc = hgs.transform_to(HeliographicCarrington(obstime=hgs.obstime, observer="Earth"))
+
+        rsun_arc = np.arcsin((1 * u.R_sun) / hg_rad).decompose().to("arcsec")
+
+        solo_sun_hee, _ = spiceypy.spkezr("SOLO", et, "SOLO_HEE", "None", "Sun")
+        solo_sun_hci, _ = spiceypy.spkezr("SOLO", et, "SOLO_HCI", "None", "Sun")
+        solo_sun_hae, _ = spiceypy.spkezr("SOLO", et, "SUN_ARIES_ECL", "None", "Sun")
+        solo_sun_heeq, _ = spiceypy.spkezr("SOLO", et, "SOLO_HEEQ", "None", "Sun")
+        solo_sun_gse, earth_solo_lt = spiceypy.spkezr("SOLO", et, "EARTH_SUN_ECL", "None", "Earth")
+        sun_earth_hee, sun_earth_lt = spiceypy.spkezr("Earth", et, "SOLO_HEE", "None", "Sun")
+
+        header_results = dict()
+        header_results["RSUN_ARC"] = rsun_arc.to_value("arcsec")
+        header_results["HGLT_OBS"] = hg_lat.to_value("deg")
+        header_results["HGLN_OBS"] = hg_lon.to_value("deg")
+        header_results["CRLT_OBS"] = hgc.lat.to_value("deg")
+        header_results["CRLN_OBS"] = hgc.lon.to_value("deg")
+        header_results["DSUN_OBS"] = hg_rad.to_value("m")
+        header_results["HEEX_OBS"] = (solo_sun_hee[0] * u.km).to_value("m")
+        header_results["HEEY_OBS"] = (solo_sun_hee[1] * u.km).to_value("m")
+        header_results["HEEZ_OBS"] = (solo_sun_hee[2] * u.km).to_value("m")
+        header_results["HCIX_OBS"] = (solo_sun_hci[0] * u.km).to_value("m")
+        header_results["HCIY_OBS"] = (solo_sun_hci[1] * u.km).to_value("m")
+        header_results["HCIZ_OBS"] = (solo_sun_hci[2] * u.km).to_value("m")
+        header_results["HCIX_VOB"] = (solo_sun_hci[3] * (u.km / u.s)).to_value("m/s")
+        header_results["HCIY_VOB"] = (solo_sun_hci[4] * (u.km / u.s)).to_value("m/s")
+        header_results["HCIZ_VOB"] = (solo_sun_hci[5] * (u.km / u.s)).to_value("m/s")
+        header_results["HAEX_OBS"] = (solo_sun_hae[0] * u.km).to_value("m")
+        header_results["HAEY_OBS"] = (solo_sun_hae[1] * u.km).to_value("m")
+        header_results["HAEZ_OBS"] = (solo_sun_hae[0] * u.km).to_value("m")
+        header_results["HEQX_OBS"] = (solo_sun_heeq[0] * u.km).to_value("m")
+        header_results["HEQY_OBS"] = (solo_sun_heeq[1] * u.km).to_value("m")
+        header_results["HEQZ_OBS"] = (solo_sun_heeq[2] * u.km).to_value("m")
+        header_results["GSEX_OBS"] = (solo_sun_gse[0] * u.km).to_value("m")
+        header_results["GSEY_OBS"] = (solo_sun_gse[1] * u.km).to_value("m")
+        header_results["GSEZ_OBS"] = (solo_sun_gse[2] * u.km).to_value("m")
+        header_results["OBS_VR"] = rad_vel.to_value("m/s")
+        header_results["EAR_TDEL"] = sun_earth_lt - sun_solo_lt
+        header_results["SUN_TIME"] = sun_solo_lt
+
+        return {k: float(v) for k, v in header_results.items()}
+
     def get_fits_headers(self, *, start_time, average_time):
+        """Get the ephemeris FITS header keywords of an observation.
+
+        The ephemeris values are evaluated at the average time rounded to config
+        'Spice.header_cache_tolerance' seconds and cached per loaded meta kernels
+        (see `get_header_cache`).
+
+        Parameters
+        ----------
+        start_time : `astropy.time.Time`
+            the start time of the observation
+        average_time : `astropy.time.Time` or `stixcore.time.SCETime`
+            the average time of the observation
+
+        Returns
+        -------
+        `tuple`
+            the header keywords (name, value, comment)
+        """
         try:
             et = spiceypy.scs2e(SOLAR_ORBITER_ID, str(average_time))
         except (SpiceBADPARTNUMBER, SpiceINVALIDSCLKSTRING):
             et = spiceypy.utc2et(average_time.isot)
 
+        tolerance = CONFIG.getfloat("Spice", "header_cache_tolerance", fallback=1.0)
+        if tolerance > 0:
+            et = round(et / tolerance) * tolerance
+
         headers = (
             ("SPICE_MK", ", ".join([mkp.name for mkp, mkt, mkd in self.meta_kernel_path]), "SPICE meta kernel file"),
         )
 
         header_results = defaultdict(lambda: "")
         try:
-            # HeliographicStonyhurst
-            solo_sun_hg, sun_solo_lt = spiceypy.spkezr("SOLO", et, "SUN_EARTH_CEQU", "None", "Sun")
-            # Convert to spherical and add units
-            hg_rad, hg_lon, hg_lat = spiceypy.reclat(solo_sun_hg[:3])
-            hg_rad = hg_rad * u.km
-            hg_lat, hg_lon = (hg_lat * u.rad).to("deg"), (hg_lon * u.rad).to("deg")
-            # Calculate radial velocity add units
-            rad_vel, *_ = spiceypy.reclat(solo_sun_hg[3:])
-            rad_vel = rad_vel * (u.km / u.s)
-
-            hgs = HeliographicStonyhurst(hg_lon, hg_lat, hg_rad, obstime=average_time.to_datetime())
-            hgc = hgs.transform_to(HeliographicCarrington(obstime=hgs.obstime, observer="Earth"))
-
-            rsun_arc = np.arcsin((1 * u.R_sun) / hg_rad).decompose().to("arcsec")
-
-            solo_sun_hee, _ = spiceypy.spkezr("SOLO", et, "SOLO_HEE", "None", "Sun")
-            solo_sun_hci, _ = spiceypy.spkezr("SOLO", et, "SOLO_HCI", "None", "Sun")
-            solo_sun_hae, _ = spiceypy.spkezr("SOLO", et, "SUN_ARIES_ECL", "None", "Sun")
-            solo_sun_heeq, _ = spiceypy.spkezr("SOLO", et, "SOLO_HEEQ", "None", "Sun")
-            solo_sun_gse, earth_solo_lt = spiceypy.spkezr("SOLO", et, "EARTH_SUN_ECL", "None", "Earth")
-            sun_earth_hee, sun_earth_lt = spiceypy.spkezr("Earth", et, "SOLO_HEE", "None", "Sun")
-
-            header_results["RSUN_ARC"] = rsun_arc.to_value("arcsec")
-            header_results["HGLT_OBS"] = hg_lat.to_value("deg")
-            header_results["HGLN_OBS"] = hg_lon.to_value("deg")
-            header_results["CRLT_OBS"] = hgc.lat.to_value("deg")
-            header_results["CRLN_OBS"] = hgc.lon.to_value("deg")
-            header_results["DSUN_OBS"] = hg_rad.to_value("m")
-            header_results["HEEX_OBS"] = (solo_sun_hee[0] * u.km).to_value("m")
-            header_results["HEEY_OBS"] = (solo_sun_hee[1] * u.km).to_value("m")
-            header_results["HEEZ_OBS"] = (solo_sun_hee[2] * u.km).to_value("m")
-            header_results["HCIX_OBS"] = (solo_sun_hci[0] * u.km).to_value("m")
-            header_results["HCIY_OBS"] = (solo_sun_hci[1] * u.km).to_value("m")
-            header_results["HCIZ_OBS"] = (solo_sun_hci[2] * u.km).to_value("m")
-            header_results["HCIX_VOB"] = (solo_sun_hci[3] * (u.km / u.s)).to_value("m/s")
-            header_results["HCIY_VOB"] = (solo_sun_hci[4] * (u.km / u.s)).to_value("m/s")
-            header_results["HCIZ_VOB"] = (solo_sun_hci[5] * (u.km / u.s)).to_value("m/s")
-            header_results["HAEX_OBS"] = (solo_sun_hae[0] * u.km).to_value("m")
-            header_results["HAEY_OBS"] = (solo_sun_hae[1] * u.km).to_value("m")
-            header_results["HAEZ_OBS"] = (solo_sun_hae[0] * u.km).to_value("m")
-            header_results["HEQX_OBS"] = (solo_sun_heeq[0] * u.km).to_value("m")
-            header_results["HEQY_OBS"] = (solo_sun_heeq[1] * u.km).to_value("m")
-            header_results["HEQZ_OBS"] = (solo_sun_heeq[2] * u.km).to_value("m")
-            header_results["GSEX_OBS"] = (solo_sun_gse[0] * u.km).to_value("m")
-            header_results["GSEY_OBS"] = (solo_sun_gse[1] * u.km).to_value("m")
-            header_results["GSEZ_OBS"] = (solo_sun_gse[2] * u.km).to_value("m")
-            header_results["OBS_VR"] = rad_vel.to_value("m/s")
-            header_results["EAR_TDEL"] = sun_earth_lt - sun_solo_lt
-            header_results["SUN_TIME"] = sun_solo_lt
-            header_results["DATE_EAR"] = (start_time + (sun_earth_lt - sun_solo_lt) * u.s).fits
-            header_results["DATE_SUN"] = (start_time - sun_solo_lt * u.s).fits
+            cache = self.get_header_cache()
+            values = cache.get(self._mk_fingerprint, et)
+            if values is None:
+                values = self._get_ephemeris_header_values(et)
+                cache.put(self._mk_fingerprint, et, values)
+            header_results.update(values)
+            header_results["DATE_EAR"] = (start_time + values["EAR_TDEL"] * u.s).fits
+            header_results["DATE_SUN"] = (start_time - values["SUN_TIME"] * u.s).fits
 
         except Exception:
+            header_results = defaultdict(lambda: "")
             headers = headers + (("SPICE_ER", "1", "Pointing Data might be corrupt due to SPICE / time issues"),)
 
         headers = headers + (
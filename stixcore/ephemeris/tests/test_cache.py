@@ -0,0 +1,32 @@
+from stixcore.ephemeris.cache import EphemerisHeaderCache, meta_kernel_fingerprint
+
+
+def test_meta_kernel_fingerprint(tmp_path):
+    mk = tmp_path / "solo_ANC_soc-flown-mk_V105_20200515_001.tm"
+    mk.write_text("KERNELS_TO_LOAD = ( 'a.bsp' )")
+    fingerprint = meta_kernel_fingerprint([mk])
+    assert fingerprint == meta_kernel_fingerprint([mk])
+
+    mk.write_text("KERNELS_TO_LOAD = ( 'b.bsp' )")
+    assert fingerprint != meta_kernel_fingerprint([mk])
+
+
+def test_header_cache_memory():
+    cache = EphemerisHeaderCache()
+    assert cache.get("mk", 1.0) is None
+    cache.put("mk", 1.0, {"DSUN_OBS": 1.5e11})
+    assert cache.get("mk", 1.0) == {"DSUN_OBS": 1.5e11}
+    assert cache.get("other_mk", 1.0) is None
+    assert cache.get("mk", 2.0) is None
+
+
+def test_header_cache_persistent(tmp_path):
+    values = {"DSUN_OBS": 151234567890.12345, "EAR_TDEL": -12.345678901234}
+    cache = EphemerisHeaderCache(tmp_path / "cache.sqlite")
+    cache.put("mk", 662774469.1, values)
+    cache.close()
+
+    cache = EphemerisHeaderCache(tmp_path / "cache.sqlite")
+    assert cache.get("mk", 662774469.1) == values
+    assert cache.get("mk", 662774470.1) is None
+    cache.close()
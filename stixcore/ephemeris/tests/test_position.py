@@ -1,5 +1,6 @@
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -7,7 +8,13 @@ import pytest
 import astropy.units as u
 
 from stixcore.config.config import CONFIG
-from stixcore.ephemeris.manager import Spice, SpiceKernelManager
+from stixcore.ephemeris.manager import (
+    SEC_PER_DAY,
+    EphemerisSampler,
+    Spice,
+    SpiceKernelManager,
+    _wrap_angle,
+)
 from stixcore.time.datetime import SCETime
 
 
@@ -50,6 +57,105 @@ def test_aux_missing(spice):
     assert np.allclose(orient, orient_ref, equal_nan=True)
 
 
+def test_sample_aux(spice):
+    start = SCETime.from_string(spice.datetime_to_scet(datetime(2020, 10, 7, 11, 50)).split("/")[-1])
+    times = start + np.arange(0, 1200, 7.3) * u.s
+    columns, errors = spice.sample_auxiliary_positional_data(times)
+
+    for i in [0, 47, len(times) - 1]:
+        orient, dist, car, heeq = spice.get_auxiliary_positional_data(date=times[i])
+        assert np.allclose(columns["roll_angle_rpy"][i], orient, atol=errors["roll_angle_rpy"] + 1e-9 * u.deg)
+        assert np.allclose(columns["solo_loc_carrington_dist"][i], dist, atol=errors["solo_loc_carrington_dist"])
+        assert np.allclose(columns["solo_loc_carrington_lonlat"][i], car, atol=1e-6 * u.deg)
+        assert np.allclose(columns["solo_loc_heeq_zxy"][i], heeq, atol=errors["solo_loc_heeq_zxy"] + 1e-3 * u.km)
+        assert np.allclose(
+            columns["spice_disc_size"][i], spice.get_sun_disc_size(date=times[i]), atol=errors["spice_disc_size"]
+        )
+
+    # no attitude data
+    missing = SCETime.from_string(spice.datetime_to_scet(datetime(2023, 10, 7, 12)).split("/")[-1])
+    columns, _ = spice.sample_auxiliary_positional_data(missing)
+    assert np.isnan(columns["roll_angle_rpy"]).all()
+
+
+def test_sample_aux_grid(spice):
+    start = SCETime.from_string(spice.datetime_to_scet(datetime(2020, 10, 7, 11, 50)).split("/")[-1])
+    times = start + np.arange(0, 1200, 7.3) * u.s
+    missing = SCETime.from_string(spice.datetime_to_scet(datetime(2023, 10, 7, 12)).split("/")[-1])
+    sampler = spice.get_ephemeris_sampler()
+    et = spice.get_clock_correlation().scet_to_et(times.coarse, times.fine)
+    missing_et = spice.get_clock_correlation().scet_to_et(np.atleast_1d(missing.coarse), np.atleast_1d(missing.fine))
+    # evaluated days are interpolated even for a few samples
+    for day in np.unique(np.floor(np.append(et, missing_et) / SEC_PER_DAY)):
+        sampler._get_day(int(day))
+
+    _, bounds = sampler.sample(et)
+    assert (bounds[:, 3:9] > 0).any()
+    columns, errors = spice.sample_auxiliary_positional_data(times)
+    for i in [0, 47, len(times) - 1]:
+        orient, dist, car, heeq = spice.get_auxiliary_positional_data(date=times[i])
+        assert np.allclose(columns["roll_angle_rpy"][i], orient, atol=errors["roll_angle_rpy"] + 1e-9 * u.deg)
+        assert np.allclose(columns["solo_loc_carrington_dist"][i], dist, atol=errors["solo_loc_carrington_dist"])
+        assert np.allclose(
+            columns["solo_loc_carrington_lonlat"][i], car, atol=errors["solo_loc_carrington_lonlat"] + 1e-6 * u.deg
+        )
+        assert np.allclose(columns["solo_loc_heeq_zxy"][i], heeq, atol=errors["solo_loc_heeq_zxy"] + 1e-3 * u.km)
+
+    # no attitude data: the interpolation error is unknown and the exact values are used
+    states, bounds = sampler.sample(missing_et)
+    assert np.isnan(states[:, 0:3]).all()
+    assert (bounds == 0).all()
+    columns, errors = spice.sample_auxiliary_positional_data(missing)
+    orient, dist, car, heeq = spice.get_auxiliary_positional_data(date=missing)
+    assert np.allclose(columns["solo_loc_heeq_zxy"][0], heeq, atol=1e-3 * u.km)
+    assert errors["solo_loc_heeq_zxy"] == 0
+
+
+def test_ephemeris_sampler_grid():
+    day = 7000
+
+    def state(et):
+        t = et - day * SEC_PER_DAY
+        values = np.empty(9)
+        # roll wraps at +-pi
+        values[0] = _wrap_angle(np.pi - 0.5 + 1e-4 * t)
+        values[1:3] = 0.01 * np.sin(t / 2e4 + np.arange(2))
+        values[3:9] = 1e8 + 1e3 * np.sin(t / 1e4 + np.arange(6))
+        # attitude gap
+        if 40000 <= t < 41000:
+            values[0:3] = np.nan
+        return values
+
+    et = day * SEC_PER_DAY + np.arange(0, SEC_PER_DAY, 37.3)
+    exact = np.array([state(e) for e in et])
+    sampler = EphemerisSampler(step=300, angle_tolerance=1e-6, position_tolerance=1.0)
+    with patch("stixcore.ephemeris.manager._positional_state", side_effect=state):
+        # few samples of a day not evaluated yet are exact
+        states, bounds = sampler.sample(et[:10])
+        assert sampler.days == {}
+        assert (bounds == 0).all()
+        assert np.array_equal(states[:, 3:9], exact[:10, 3:9])
+
+        # more samples than grid points: the grid of the day is evaluated and interpolated
+        states, bounds = sampler.sample(et)
+    assert list(sampler.days) == [day]
+
+    interpolated = bounds.any(axis=1)
+    assert interpolated.sum() > len(et) / 2
+    errors = np.abs(states - exact)
+    errors[:, 0:3] = np.abs(_wrap_angle(states[:, 0:3] - exact[:, 0:3]))
+    assert (errors[interpolated, 0:3] <= 1.1 * bounds[interpolated, 0:3] + 1e-9).all()
+    assert (errors[interpolated, 3:9] <= 1.1 * bounds[interpolated, 3:9] + 1e-3).all()
+    # intervals above the tolerance (attitude gap) fall back to the exact values
+    gap = np.isnan(exact[:, 0])
+    assert gap.any()
+    # the interpolated angles are wrapped again
+    assert (np.abs(states[~gap, 0]) <= np.pi).all()
+    assert not interpolated[gap].any()
+    assert np.isnan(states[gap, 0:3]).all()
+    assert np.array_equal(states[~interpolated, 3:9], exact[~interpolated, 3:9])
+
+
 def test_get_orientation(spice):
     # from idl sunspice
     # CSPICE_FURNSH, 'test_position_20201001_V01.mk'
@@ -87,6 +193,18 @@ def test_get_fits_headers(spice):
     assert np.allclose(arr[1:, 0], arr[1:, 1])
 
 
+def test_get_fits_headers_cached(spice):
+    start = SCETime(683769519, 58289).to_time()
+    h1 = spice.get_fits_headers(start_time=start, average_time=start + 0.2 * u.s)
+    assert len(spice.get_header_cache().memory) > 0
+    # same rounded average time but other start time
+    h2 = spice.get_fits_headers(start_time=start + 1 * u.s, average_time=start + 0.3 * u.s)
+
+    v1, v2 = dict((k, v) for k, v, _ in h1), dict((k, v) for k, v, _ in h2)
+    assert v1["DSUN_OBS"] == v2["DSUN_OBS"]
+    assert v1["DATE_SUN"] != v2["DATE_SUN"]
+
+
 def test_get_fits_headers_in_off_times(spice):
     start_scet = SCETime(983769519, 58289)
     avg_scet = start_scet + 12 * u.h
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+import numpy as np
 import pytest
 
 from stixcore.ephemeris.manager import Spice
@@ -50,3 +51,12 @@ def test_scet_to_datetime_round_trips(spice):
     # Only have 3 significant figures in milliseconds precision
     dt = spice.scet_to_datetime(spice.datetime_to_scet(atime)) - atime
     assert dt.total_seconds() < 1e-3
+
+
+def test_scet_to_datetime64_matches_spice(spice):
+    coarse = np.array([0, 625237315, 636518400, 656035200, 681000000])
+    fine = np.array([0, 44104, 1, 32768, 65535])
+    utc = spice.scet_to_datetime64(coarse, fine)
+    for c, f, t in zip(coarse, fine, utc):
+        ref = spice.scet_to_datetime(f"{c}:{f}").replace(tzinfo=None)
+        assert abs((t.astype(object) - ref).total_seconds()) <= 1e-6
@@ -1,7 +1,11 @@
 import os
+import re
+import pickle
 import sqlite3
 import threading
 from types import SimpleNamespace
+from pathlib import Path
+from contextlib import nullcontext
 
 import numpy as np
 from scipy import interpolate
@@ -15,15 +19,23 @@ __all__ = [
     "IDBStaticParameter",
     "IDBVariableParameter",
     "IDBPacketTree",
+    "IDBParsePlan",
     "IDBPi1ValPosition",
     "IDBPolynomialCalibration",
     "IDBCalibrationCurve",
+    "IDBTextualCalibration",
     "IDBCalibrationParameter",
 ]
 
 logger = get_logger(__name__)
 
 lock = threading.Lock()
+# sqlite3.threadsafety == 3: the sqlite library serializes access to a shared connection itself
+SERIALIZE_SQL = sqlite3.threadsafety != 3
+
+IDB_SNAPSHOT_SUFFIX = ".snapshot"
+# the sqlite file is read through a shared memory map if not copied into memory
+IDB_MMAP_SIZE = 256 * 1024 * 1024
 
 
 class IDBPi1ValPosition(SimpleNamespace):
@@ -117,6 +129,7 @@ class IDBPolynomialCalibration:
         try:
             self.orig = rows
             self.A = [float(row) for row in rows[0]]
+            self.coefficients = np.array(self.A)
             self.valid = True
         except (ValueError, IndexError):
             self.valid = False
@@ -137,10 +150,11 @@ class IDBPolynomialCalibration:
         `float`
             polynomial function value
         """
-        x = np.array(x)
-        res = self.A[0] * x**0 + self.A[1] * x**1 + self.A[2] * x**2 + self.A[3] * x**3 + self.A[4] * x**4
+        if not self.valid:
+            return None
 
-        return res.tolist() if self.valid else None
+        res = np.polynomial.polynomial.polyval(np.asarray(x), self.coefficients)
+        return res.tolist()
 
 
 class IDBCalibrationCurve:
@@ -164,6 +178,8 @@ class IDBCalibrationCurve:
 
         self.param = param
         self.orig = rows
+        self.tck = None
+        self.error = None
 
         if len(self) <= 1:
             logger.error(
@@ -172,6 +188,13 @@ class IDBCalibrationCurve:
             )
             self.valid = False
 
+        # fit the spline only once for all later calls
+        if self.valid and len(self) > 2:
+            try:
+                self.tck = interpolate.splrep(self.x, self.y)
+            except Exception as e:
+                self.error = e
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.orig})"
 
@@ -197,8 +220,9 @@ class IDBCalibrationCurve:
             return (self.y[1] - self.y[0]) / (self.x[1] - self.x[0]) * (raw - self.x[0]) + self.y[0]
 
         try:
-            tck = interpolate.splrep(self.x, self.y)
-            val = interpolate.splev(raw, tck)
+            if self.error is not None:
+                raise self.error
+            val = interpolate.splev(raw, self.tck)
             return val
         except Exception as e:
             logger.error(
@@ -207,6 +231,49 @@ class IDBCalibrationCurve:
             )
 
 
+class IDBTextualCalibration:
+    """A class to represent a textual calibration (TXP) defined in the IDB applied to whole arrays."""
+
+    def __init__(self, idb, pcf_curtx):
+        """Construct all the necessary attributes for the IDBTextualCalibration object.
+
+        Parameters
+        ----------
+        idb : `IDB`
+            the IDB to look up the texts
+        pcf_curtx : `str`
+            TXP_NUMBR like 'CAAT0005TM'
+        """
+        self.idb = idb
+        self.pcf_curtx = pcf_curtx
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.pcf_curtx})"
+
+    def __call__(self, raw):
+        """Look up the texts for the raw values.
+
+        Every distinct raw value is only looked up once and then broadcast back to the input shape.
+
+        Parameters
+        ----------
+        raw : `number` | `list` | `numpy.ndarray`
+            The raw values
+
+        Returns
+        -------
+        `numpy.ndarray` | `str`
+            The text for each raw value
+        """
+        if np.ndim(raw) == 0:
+            return self.idb.textual_interpret(self.pcf_curtx, raw.item() if hasattr(raw, "item") else raw)
+
+        raw = np.asarray(raw)
+        values, inverse = np.unique(raw, return_inverse=True)
+        lut = np.array([self.idb.textual_interpret(self.pcf_curtx, val.item()) for val in values])
+        return lut[inverse].reshape(raw.shape)
+
+
 class IDBParameter(IDBPacketTypeInfo):
     """A base class to represent a parameter of a SCOS-2000 Telemetry Packet.
 
@@ -467,34 +534,129 @@ class IDBPacketTree:
         self._name = value
 
 
+class IDBParsePlan:
+    """A compiled, flat representation of a `~stixcore/idb/idb/IDBPacketTree`.
+
+    The tree is walked once in depth first order and every parameter is turned into a read
+    instruction. Repeaters know the index of the first instruction after their group so the
+    executor can jump over the group (or loop over it) without walking the tree again.
+
+    Attributes
+    ----------
+    instructions : `tuple`
+        The read instructions each as tuple of
+        ``(node, is_static, offset, width, signed, end)``
+
+            node : `~stixcore/idb/idb/IDBPacketTree` the parse node (for name and parameter)
+            is_static : `bool` if the offset is an absolute bit position
+            offset : `int` absolute bit position (static) or relative bit offset (variable)
+            width : `int` number of bits to read
+            signed : `bool` read as two's complement signed integer
+            end : `int` index of the first instruction after the repeater group (``index + 1`` for
+            plain parameters)
+    """
+
+    def __init__(self, tree):
+        """Compile the parse plan for the given tree.
+
+        Parameters
+        ----------
+        tree : `~stixcore/idb/idb/IDBPacketTree`
+            the root of the parse tree as provided by `IDB.get_static_structure` or
+            `IDB.get_variable_structure`
+        """
+        instructions = []
+        if tree:
+            self._compile(tree, instructions)
+        self.instructions = tuple(instructions)
+
+    @classmethod
+    def _compile(cls, parent, instructions):
+        for pnode in parent.children:
+            param = pnode.parameter
+            is_static = not param.is_variable()
+            if is_static:
+                offset = param.PLF_OFFBY * 8 + param.PLF_OFFBI
+            else:
+                offset = int(param.VPD_OFFSET)
+            dtype, width = param.bin_format.split(":")
+
+            idx = len(instructions)
+            # placeholder until the end of the repeater group is known
+            instructions.append(None)
+            if pnode.children:
+                cls._compile(pnode, instructions)
+            instructions[idx] = (pnode, is_static, offset, int(width), dtype == "int", len(instructions))
+
+    @property
+    def is_static(self):
+        """Is every parameter at a fixed absolute position (no repeaters, no relative offsets).
+
+        Parameters wider than 64 bits can not be batch parsed either.
+
+        Returns
+        -------
+        `bool`
+            True if the plan can be used for batch parsing of many packets at once
+        """
+        return all(instr[1] and instr[3] <= 64 and instr[5] == i + 1 for i, instr in enumerate(self.instructions))
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} instructions)"
+
+
 class IDB:
     """Class provides reading functionality to a IDB (definition of TM/TC packet structures)."""
 
-    def __init__(self, filename):
+    # caches restored from / written to the precompiled snapshot file
+    SNAPSHOT_CACHES = (
+        "packet_info",
+        "parameter_structures",
+        "parse_plans",
+        "calibration",
+        "calibration_curves",
+        "calibration_polynomial",
+        "textual_parameter_lut",
+        "pi1_val_positions",
+        "s2k_table_contents",
+    )
+
+    def __init__(self, filename, *, in_memory=True, load_snapshot=True):
         """Create the IDB reader for a given file.
 
         Parameters
         ----------
         filename : `str` | `pathlib.Path`
             Path to the idb file
+        in_memory : `bool`, optional
+            copy the whole IDB into memory (default) or open the file read only through a
+            shared memory map
+        load_snapshot : `bool`, optional
+            restore the caches from the precompiled snapshot file if available (default)
         """
         self.conn = None
         self.cur = None
         self.parameter_structures = dict()
+        self.parse_plans = dict()
         self.packet_info = dict()
         self.parameter_units = dict()
         self.calibration_polynomial = dict()
         self.calibration = dict()
         self.calibration_curves = dict()
+        self.calibrators = dict()
         self.textual_parameter_lut = dict()
         self.soc_descriptions = dict()
         self.parameter_descriptions = dict()
         self.s2k_table_contents = dict()
+        self.pi1_val_positions = dict()
         self.filename = filename
         logger.info(f"Creating IDB reader for: {self.filename}")
 
         if self.filename:
-            self._connect_database()
+            self._connect_database(in_memory=in_memory, load_snapshot=load_snapshot)
 
     def is_connected(self):
         """Is the reader connected to the IDB.
@@ -528,15 +690,31 @@ class IDB:
         """
         return os.path.abspath(self.filename)
 
-    def _connect_database(self):
+    @property
+    def snapshot_filename(self):
+        """Get the path of the precompiled snapshot file next to the IDB file.
+
+        returns
+        -------
+        `pathlib.Path`
+            the path to the snapshot file like 'v2.26.34/idb.snapshot'
+        """
+        return Path(self.filename).with_suffix(IDB_SNAPSHOT_SUFFIX)
+
+    def _connect_database(self, in_memory=True, load_snapshot=True):
         try:
             # connect to the DB in read only mode
-            uri = self.filename.as_uri() + "?mode=ro"
-
-            source = sqlite3.connect(uri, check_same_thread=False, uri=True)
-            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
-            source.backup(self.conn)
-            source.close()
+            uri = Path(self.filename).as_uri() + "?mode=ro"
+
+            if in_memory:
+                source = sqlite3.connect(uri, check_same_thread=False, uri=True)
+                self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+                source.backup(self.conn)
+                source.close()
+            else:
+                # immutable: no locking or change detection, pages are shared via the page cache
+                self.conn = sqlite3.connect(uri + "&immutable=1", check_same_thread=False, uri=True)
+                self.conn.execute(f"PRAGMA mmap_size={IDB_MMAP_SIZE}")
 
             logger.info(f"IDB loaded from {self.filename}")
             self.cur = self.conn.cursor()
@@ -546,6 +724,83 @@ class IDB:
             self.close()
             raise
 
+        if load_snapshot:
+            self._load_snapshot()
+
+    def _load_snapshot(self):
+        """Restore the caches from the precompiled snapshot file if available and up to date.
+
+        returns
+        -------
+        `bool`
+            was the snapshot loaded
+        """
+        snapshot = self.snapshot_filename
+        try:
+            if not snapshot.exists() or snapshot.stat().st_mtime < Path(self.filename).stat().st_mtime:
+                return False
+
+            with snapshot.open("rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Failed to load IDB snapshot {snapshot}: {e}")
+            return False
+
+        if state.get("version") != self._version:
+            logger.warning(f"IDB snapshot version mismatch {snapshot}: {state.get('version')} != {self._version}")
+            return False
+
+        for name in self.SNAPSHOT_CACHES:
+            getattr(self, name).update(state["caches"].get(name, {}))
+        logger.info(f"IDB snapshot loaded from {snapshot}")
+        return True
+
+    def export_snapshot(self):
+        """Precompile all packet structures and calibrations and write them to the snapshot file.
+
+        All TM packets defined in the PID table are resolved into parse trees, parse plans and
+        calibration functions (including the textual lookup tables). The result is stored next to
+        the IDB file and restored on connect, so IDB readers (e.g. in worker processes) start with
+        warm caches instead of querying the database again.
+
+        returns
+        -------
+        `pathlib.Path`
+            the path to the written snapshot file
+        """
+        packets = self._execute("select distinct PID_TYPE, PID_STYPE, PID_PI1_VAL from PID", None, "list")
+        for service_type, service_subtype, pi1_val in packets:
+            if self.get_packet_pi1_val_position(service_type, service_subtype) is None:
+                pi1_val = None
+            try:
+                if self.get_packet_type_info(service_type, service_subtype, pi1_val) is None:
+                    continue
+                self.get_parse_plan(service_type, service_subtype, pi1_val)
+                for param in self.get_params_for_calibration(service_type, service_subtype, pi1_val):
+                    self.get_calibrator(param)
+            except Exception as e:
+                logger.warning(f"Failed to precompile TM({service_type},{service_subtype}) pi1_val: {pi1_val}: {e}")
+
+        textual = self._execute("select distinct TXP_NUMBR, TXP_FROM from TXP", None, "list")
+        for pcf_curtx, txp_from in textual:
+            try:
+                self.textual_interpret(pcf_curtx, int(txp_from))
+            except (TypeError, ValueError):
+                continue
+
+        state = {
+            "version": self._version,
+            "caches": {name: getattr(self, name) for name in self.SNAPSHOT_CACHES},
+        }
+        snapshot = self.snapshot_filename
+        tmp_file = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+        with tmp_file.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # atomic replace: concurrent readers see either the old or the new snapshot
+        os.replace(tmp_file, snapshot)
+        logger.info(f"IDB snapshot written to {snapshot}")
+        return snapshot
+
     def __repr__(self):
         return f"{__class__.__name__}({self.version}, {self.filename})"
 
@@ -558,18 +813,22 @@ class IDB:
         self.filename = state
 
         self.parameter_structures = dict()
+        self.parse_plans = dict()
         self.parameter_units = dict()
         self.packet_info = dict()
         self.calibration_polynomial = dict()
         self.calibration = dict()
         self.calibration_curves = dict()
+        self.calibrators = dict()
         self.textual_parameter_lut = dict()
         self.soc_descriptions = dict()
         self.parameter_descriptions = dict()
         self.s2k_table_contents = dict()
+        self.pi1_val_positions = dict()
 
         if self.filename:
-            self._connect_database()
+            # restored in worker processes: share the file and snapshot instead of copying the DB
+            self._connect_database(in_memory=False)
 
     def close(self):
         """Close the IDB connection."""
@@ -586,25 +845,20 @@ class IDB:
         return name, id + 1
 
     def _execute(self, sql, arguments=None, result_type="list"):
-        """Execute sql and return results in a list or a dictionary."""
+        """Execute sql and return results in a list or a dictionary.
+
+        Every call uses its own cursor on the read only in memory copy of the IDB. If the
+        sqlite library is built in serialized mode the calls can run from several threads
+        without a lock, otherwise all calls are serialised behind a global lock.
+        """
         if not self.cur:
             raise Exception("IDB is not initialized!")
-        else:
-            try:
-                lock.acquire()
-                if arguments:
-                    self.cur.execute(sql, arguments)
-                else:
-                    self.cur.execute(sql)
-                if result_type == "list":
-                    rows = self.cur.fetchall()
-                else:
-                    rows = [
-                        dict(zip([column[0] for column in self.cur.description], row)) for row in self.cur.fetchall()
-                    ]
-                return rows
-            finally:
-                lock.release()
+        with lock if SERIALIZE_SQL else nullcontext():
+            cur = self.conn.execute(sql, arguments) if arguments else self.conn.execute(sql)
+            if result_type == "list":
+                return cur.fetchall()
+            names = [column[0] for column in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
 
     def get_spid_info(self, spid):
         """Get SPID description.
@@ -682,15 +936,17 @@ class IDB:
         -------
         `IDBPi1ValPosition` or None
         """
+        if (service_type, service_subtype) in self.pi1_val_positions:
+            return self.pi1_val_positions[(service_type, service_subtype)]
+
         sql = (
             "select PIC_PI1_OFF, PIC_PI1_WID from PIC where PIC_TYPE = ? and PIC_STYPE = ? and PIC_PI1_OFF >= 0 limit 1"
         )
         args = (service_type, service_subtype)
         res = self._execute(sql, args, result_type="dict")
-        if res:
-            return IDBPi1ValPosition(**res[0])
-
-        return None
+        pos = IDBPi1ValPosition(**res[0]) if res else None
+        self.pi1_val_positions[(service_type, service_subtype)] = pos
+        return pos
 
     def get_parameter_description(self, name):
         """Get scos long description.
@@ -949,6 +1205,38 @@ class IDB:
         # lookup table
         return val
 
+    def get_calibrator(self, param):
+        """Get the compiled calibration function for a parameter.
+
+        The function is resolved once per PCF_CURTX and cached for the lifetime of the IDB.
+
+        Parameters
+        ----------
+        param : `IDBCalibrationParameter`
+
+        returns
+        -------
+        `IDBTextualCalibration` | `IDBCalibrationCurve` | `IDBPolynomialCalibration` | `None`
+            A callable taking raw values (scalar or arrays) or `None` if the calibration is not
+            supported.
+        """
+        key = (param.PCF_CATEG, param.PCF_CURTX)
+        if key in self.calibrators:
+            return self.calibrators[key]
+
+        calibrator = None
+        if param.PCF_CATEG == "S":
+            calibrator = IDBTextualCalibration(self, param.PCF_CURTX)
+        elif param.PCF_CATEG == "N":
+            prefix = re.split(r"\d+", param.PCF_CURTX)[0]
+            if prefix == "CIXP":
+                calibrator = self.get_calibration_curve(param)
+            elif prefix == "CIX":
+                calibrator = self.get_calibration_polynomial(param.PCF_CURTX)
+
+        self.calibrators[key] = calibrator
+        return calibrator
+
     def get_calibration_polynomial(self, mcf_ident):
         """gets calibration polynomial information for a given MCF_IDENT
 
@@ -1174,6 +1462,40 @@ class IDB:
         self.parameter_structures[(service_type, service_subtype, sp1_val)] = repeater[0]["node"]
         return repeater[0]["node"]
 
+    def get_parse_plan(self, service_type, service_subtype, sp1_val=None):
+        """Get the compiled parse plan for the specified TM packet.
+
+        The plan is compiled once from the static or variable parse tree and cached for the
+        lifetime of the IDB.
+
+        Parameters
+        ----------
+        service_type : `int`
+            The TM packet service type.
+        service_subtype : `int`
+            The TM packet service subtype.
+        sp1_val : `int` optional
+            The TM packet optional PI1_VAL default `None`
+
+        Returns
+        -------
+        `~stixcore/idb/idb/IDBParsePlan`
+            The flat list of read instructions for the packet.
+        """
+        key = (service_type, service_subtype, sp1_val)
+        if key in self.parse_plans:
+            return self.parse_plans[key]
+
+        packet_info = self.get_packet_type_info(service_type, service_subtype, sp1_val)
+        if packet_info.is_variable():
+            tree = self.get_variable_structure(service_type, service_subtype, sp1_val)
+        else:
+            tree = self.get_static_structure(service_type, service_subtype, sp1_val)
+
+        plan = IDBParsePlan(tree)
+        self.parse_plans[key] = plan
+        return plan
+
     def get_requestid_structure(self, service_type, service_subtype, sp1_val):
         """Create a dynamic parse tree for the specified TM packet.
 
@@ -5,9 +5,11 @@ import json
 import shutil
 import sqlite3
 import zipfile
+import threading
 import urllib.request
 from pathlib import Path
 
+import numpy as np
 from intervaltree import IntervalTree
 
 from stixcore.data.test import test_data
@@ -27,6 +29,8 @@ IDB_FORCE_VERSION_KEY = "__FORCE_VERSION__"
 
 logger = get_logger(__name__)
 
+idb_cache_lock = threading.Lock()
+
 
 class IDBManager(metaclass=Singleton):
     """Manages IDB (definition of TM/TC packet structures) Versions and provides a IDB reader."""
@@ -141,6 +145,12 @@ class IDBManager(metaclass=Singleton):
         except OSError:
             raise ValueError(f"No IDB version history found at: {IDB_VERSION_HISTORY_FILE}")
 
+        # flat sorted validity boundaries for the vectorised lookup in `find_versions`
+        intervals = sorted(self.history)
+        self._history_begin = np.array([i.begin for i in intervals], dtype=np.float64)
+        self._history_end = np.array([i.end for i in intervals], dtype=np.float64)
+        self._history_version = np.array([i.data for i in intervals] + [""])
+
     def find_version(self, obt=None):
         """Find IDB version operational at a given time.
 
@@ -162,6 +172,61 @@ class IDBManager(metaclass=Singleton):
             logger.error(f"No IDB version found for Time: {obt}\n{e}")
         return ""
 
+    def find_versions(self, coarse, fine=0):
+        """Find the IDB versions operational at many time points at once.
+
+        Vectorised counterpart to `find_version` using a single binary search over the validity
+        boundaries of the version history.
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            the SCET coarse times
+        fine : `numpy.ndarray`, optional
+            the SCET fine times, by default 0
+
+        Returns
+        -------
+        `numpy.ndarray`
+            the version label for each time point or an empty string if not covered by the history
+        """
+        coarse = np.asarray(coarse)
+        if coarse.size == 0:
+            return self._history_version[:0]
+
+        times = np.atleast_1d(SCETime(coarse=coarse, fine=np.asarray(fine)).as_float().value)
+        pos = np.searchsorted(self._history_begin, times, side="right") - 1
+        valid = pos >= 0
+        valid[valid] = times[valid] < self._history_end[pos[valid]]
+        # the last entry is the empty "not found" label
+        pos[~valid] = -1
+        return self._history_version[pos]
+
+    def find_version_runs(self, coarse, fine=0):
+        """Split a time ordered sequence (e.g. all packets of a product) into runs of the same IDB version.
+
+        Parameters
+        ----------
+        coarse : `numpy.ndarray`
+            the SCET coarse times
+        fine : `numpy.ndarray`, optional
+            the SCET fine times, by default 0
+
+        Returns
+        -------
+        `list` of (`str`, `slice`)
+            the version label (empty string if not covered by the history) and the index range of
+            each contiguous run
+        """
+        versions = self.find_versions(coarse, fine)
+        if len(versions) == 0:
+            return []
+
+        bounds = np.flatnonzero(versions[1:] != versions[:-1]) + 1
+        starts = [0, *bounds.tolist()]
+        stops = [*bounds.tolist(), len(versions)]
+        return [(str(versions[start]), slice(start, stop)) for start, stop in zip(starts, stops)]
+
     def compile_version(self, version_label, force=False, url="https://pub099.cs.technik.fhnw.ch/data/idb/"):
         """Download compiles and installs an IDB version of a public available URL.
            Some IDB parameters will be injected to support the raw tw engineering framework.
@@ -223,7 +288,7 @@ class IDBManager(metaclass=Singleton):
             shutil.rmtree(str(vdir / "raw"))
             (vdir / "idb.zip").unlink()
 
-        return self.has_version(version_label)
+        return self._install_snapshot(version_label)
 
     def download_version(self, version_label, force=False, url="https://pub099.cs.technik.fhnw.ch/data/idb/"):
         """Download and installs an IDB version of a public available URL.
@@ -278,7 +343,30 @@ class IDBManager(metaclass=Singleton):
             logger.error(e)
             return False
 
-        return self.has_version(version_label)
+        return self._install_snapshot(version_label)
+
+    def _install_snapshot(self, version_label):
+        """Check a newly installed IDB version and write its precompiled snapshot.
+
+        Parameters
+        ----------
+        version_label : `str` or (`int`, `int`, `int`)
+            a version definition
+
+        Returns
+        -------
+        `bool`
+            is the IDB version available, a failed snapshot export is only logged
+        """
+        if not self.has_version(version_label):
+            return False
+        try:
+            idb = IDB(Path(self._get_filename_for_version(version_label)), load_snapshot=False)
+            idb.export_snapshot()
+            idb.close()
+        except Exception as e:
+            logger.warning(f"Failed to export the snapshot of IDB version {version_label}: {e}")
+        return True
 
     @staticmethod
     def convert_mib_2_sqlite(*, in_folder, out_file, version_label):
@@ -475,13 +563,31 @@ class IDBManager(metaclass=Singleton):
             logger.debug("IDB version file not found")
             return False
 
-        idb = IDB(file)
+        idb = IDB(file, in_memory=False, load_snapshot=False)
         ver = idb.version
         idb.close()
         if ver != IDBManager.convert_version_label(version_label):
             logger.debug("IDB version mismatch")
         return ver == IDBManager.convert_version_label(version_label)
 
+    def export_snapshots(self):
+        """Write the precompiled snapshot file for all available IDB versions.
+
+        New versions get their snapshot on installation (see `download_version`), this refreshes
+        the snapshots of versions installed before.
+
+        Returns
+        -------
+        `list`
+            paths to the written snapshot files
+        """
+        snapshots = list()
+        for version in self.get_versions():
+            idb = IDB(Path(version["path"]) / IDB_FILENAME)
+            snapshots.append(idb.export_snapshot())
+            idb.close()
+        return snapshots
+
     def get_idb(self, version_label="2.26.34", obt=None):
         """Get the IDB for the specified version (or the latest available).
 
@@ -512,7 +618,10 @@ class IDBManager(metaclass=Singleton):
 
         if self.has_version(version_label):
             if version_label not in self.idb_cache:
-                self.idb_cache[version_label] = IDB(Path(self._get_filename_for_version(version_label)))
+                with idb_cache_lock:
+                    # an other thread might have loaded it in the meantime
+                    if version_label not in self.idb_cache:
+                        self.idb_cache[version_label] = IDB(Path(self._get_filename_for_version(version_label)))
 
             idb = self.idb_cache[version_label]
             if not idb.is_connected():
@@ -1,7 +1,9 @@
 import os
+import shutil
 import sqlite3
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from stixcore.data.test import test_data
@@ -10,6 +12,7 @@ from stixcore.idb.idb import (
     IDBCalibrationCurve,
     IDBCalibrationParameter,
     IDBPolynomialCalibration,
+    IDBTextualCalibration,
 )
 from stixcore.idb.manager import IDBManager
 
@@ -85,6 +88,26 @@ def test_pickle(idb):
     clone.close()
 
 
+@pytest.mark.remote_data
+def test_export_snapshot(idb, tmp_path):
+    filename = tmp_path / "idb.sqlite"
+    shutil.copy(idb.get_idb_filename(), filename)
+
+    writer = IDB(filename)
+    snapshot = writer.export_snapshot()
+    writer.close()
+    assert snapshot == tmp_path / "idb.snapshot"
+    assert snapshot.exists()
+
+    reader = IDB(filename, in_memory=False)
+    assert reader.version == VERSION
+    assert (21, 6, 30) in reader.parse_plans
+    assert len(reader.textual_parameter_lut) > 0
+    plan = reader.get_parse_plan(21, 6, 30)
+    assert len(plan) == len(idb.get_parse_plan(21, 6, 30))
+    reader.close()
+
+
 @pytest.mark.remote_data
 def test_get_parameter_description(idb):
     # a PCF param
@@ -220,6 +243,34 @@ def test_textual_interpret(idb):
     assert (info is None) or (info == 1)
 
 
+@pytest.mark.remote_data
+def test_get_calibrator(idb):
+    dummy = {
+        "PID_SPID": "a",
+        "PID_DESCR": "a",
+        "PID_TPSD": "a",
+        "PCF_NAME": "a",
+        "PCF_DESCR": "a",
+        "PCF_WIDTH": "a",
+        "PCF_PFC": "a",
+        "PCF_PTC": "a",
+        "S2K_TYPE": "a",
+        "PCF_CATEG": "S",
+        "PCF_UNIT": "",
+        "PCF_CURTX": "CAAT0005TM",
+    }
+    param = IDBCalibrationParameter(**dummy)
+    textual = idb.get_calibrator(param)
+    assert isinstance(textual, IDBTextualCalibration)
+    assert idb.get_calibrator(param) is textual
+    raw = np.array([[0, 0], [0, 0]])
+    assert (textual(raw) == np.array([[idb.textual_interpret("CAAT0005TM", 0)] * 2] * 2)).all()
+
+    dummy.update(PCF_CATEG="N", PCF_CURTX="CIX00036TM")
+    poly = idb.get_calibrator(IDBCalibrationParameter(**dummy))
+    assert poly is idb.get_calibration_polynomial("CIX00036TM")
+
+
 @pytest.mark.remote_data
 def test_get_calibration_polynomial(idb):
     poly = idb.get_calibration_polynomial("CIX00036TM")
@@ -1,7 +1,9 @@
 import os
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from stixcore.data.test import test_data
@@ -34,6 +36,11 @@ def test_has_version(versions, idb_manager):
     assert should == has_ver
 
 
+def test_has_version_without_snapshot(idb_manager):
+    with patch("stixcore.idb.idb.IDB._load_snapshot", side_effect=AssertionError):
+        assert idb_manager.has_version("2.26.34")
+
+
 @pytest.mark.remote_data
 def test_force_version_str(idb_manager):
     idb_manager.download_version("2.26.35", force=True)
@@ -79,6 +86,26 @@ def test_find_version(idb_manager):
     assert idb_manager.find_version(obt=None) == "2.26.32"
 
 
+@pytest.mark.remote_data
+def test_find_versions(idb_manager):
+    coarse = np.array([0, 631155005, 640198038, 640198039, 640265396, 2**31, 2**32 - 1])
+    fine = np.array([0, 0, 65535, 0, 0, 0, 0])
+
+    versions = idb_manager.find_versions(coarse, fine)
+    expected = [idb_manager.find_version(obt=SCETime(coarse=c, fine=f)) for c, f in zip(coarse[:-1], fine[:-1])]
+    assert versions[:-1].tolist() == expected
+    assert versions.tolist()[:5] == ["2.26.32", "2.26.32", "2.26.31", "2.26.31", "2.26.32"]
+    # times after the history are not found
+    assert versions[-1] == ""
+
+    runs = idb_manager.find_version_runs(coarse, fine)
+    assert [v for v, _ in runs] == ["2.26.32", "2.26.31", "2.26.32", versions[5], ""]
+    assert runs[0][1] == slice(0, 2)
+    assert runs[1][1] == slice(2, 4)
+    assert runs[2][1] == slice(4, 5)
+    assert idb_manager.find_version_runs([], []) == []
+
+
 @pytest.mark.remote_data
 def test_get_versions(idb_manager):
     versions = idb_manager.get_versions()
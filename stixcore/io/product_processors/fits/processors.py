@@ -1,5 +1,6 @@
 """Module for the different processing levels."""
 
+import os
 from datetime import datetime
 
 import numpy as np
@@ -10,13 +11,20 @@ from astropy.io.fits import table_to_hdu
 from astropy.table import QTable
 
 import stixcore
+from stixcore.config.config import CONFIG
 from stixcore.ephemeris.manager import Spice
 from stixcore.products.level0.scienceL0 import Aspect
+from stixcore.products.levelb.binary import packet_lengths
 from stixcore.products.product import FitsHeaderMixin, Product
 from stixcore.soop.manager import SOOPManager, SoopObservationType
 from stixcore.time.datetime import SEC_IN_DAY
+from stixcore.util.filelock import FileLock
 from stixcore.util.logging import get_logger
-from stixcore.util.util import get_complete_file_name_and_path
+from stixcore.util.util import (
+    get_complete_file_name_and_path,
+    get_journal_file_name_and_path,
+    get_journal_files,
+)
 
 __all__ = [
     "SEC_IN_DAY",
@@ -45,6 +53,30 @@ def version_format(version):
     return f"{version:02d}"
 
 
+def write_hdul(hdul, path):
+    """
+    Write the HDU list to a temporary file and move it in place.
+
+    Readers of the file (without holding the lock of the file) never see a partially written file.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    hdul.writeto(tmp_path, overwrite=True, checksum=True)
+    os.replace(tmp_path, path)
+
+
+def remove_journal(path):
+    """
+    Remove the journal of pure time appends of a daily file after it was merged into the file.
+    """
+    for journal_file in get_journal_files(path):
+        journal_file.unlink()
+
+
+def _scet_key(coarse, fine):
+    # sortable integer of the SCET coarse and fine (16 bit) time
+    return (np.asarray(coarse, dtype=np.int64) << 16) + np.asarray(fine, dtype=np.int64)
+
+
 def set_bscale_unsigned(table_hdu):
     """
     Set bscale value to 1 if unsigned int.
@@ -453,50 +485,40 @@ class FitsLBProcessor(FitsProcessor):
             path.mkdir(parents=True, exist_ok=True)
 
             fitspath = path / filename
-            if fitspath.exists():
-                logger.info("Fits file %s exists appending data", fitspath.name)
-                existing = Product(fitspath)
-                if (
-                    np.abs(
-                        [
-                            ((len(existing.data["data"][i]) / 2) - (existing.control["data_length"][i] + 7))
-                            for i in range(len(existing.data))
-                        ]
-                    ).sum()
-                    > 0
-                ):
+            with FileLock(fitspath):
+                if fitspath.exists():
+                    logger.info("Fits file %s exists appending data", fitspath.name)
+                    existing = Product(fitspath)
+                    if np.any(packet_lengths(existing.data["data"]) != existing.control["data_length"] + 7):
+                        raise ValueError("Header data lengths and data lengths do not agree")
+                    logger.debug("Existing %s, New %s", existing, prod)
+                    prod = prod + existing
+                    logger.debug("Combined %s", prod)
+
+                # control = unique(prod.control, ['scet_coarse', 'scet_fine', 'seq_count'])
+                # data = prod.data[np.isin(prod.data['control_index'], control['index'])]
+
+                control = prod.control
+                data = prod.data
+
+                if np.any(packet_lengths(data["data"]) != control["data_length"] + 7):
                     raise ValueError("Header data lengths and data lengths do not agree")
-                logger.debug("Existing %s, New %s", existing, prod)
-                prod = prod + existing
-                logger.debug("Combined %s", prod)
-
-            # control = unique(prod.control, ['scet_coarse', 'scet_fine', 'seq_count'])
-            # data = prod.data[np.isin(prod.data['control_index'], control['index'])]
-
-            control = prod.control
-            data = prod.data
-
-            if (
-                np.abs([((len(data["data"][i]) / 2) - (control["data_length"][i] + 7)) for i in range(len(data))]).sum()
-                > 0
-            ):
-                raise ValueError("Header data lengths and data lengths do not agree")
 
-            primary_header = self.generate_primary_header(filename, prod)
-            primary_hdu = fits.PrimaryHDU()
-            primary_hdu.header.update(primary_header)
-            primary_hdu.header.update({"HISTORY": "Processed by STIXCore LB"})
-
-            control_hdu = fits.BinTableHDU(control)
-            control_hdu.name = "CONTROL"
-            data_hdu = fits.BinTableHDU(data)
-            data_hdu.name = "DATA"
-            hdul = fits.HDUList([primary_hdu, control_hdu, data_hdu])
-
-            fullpath = path / filename
-            logger.info(f"start writing fits file to {fullpath}")
-            hdul.writeto(fullpath, overwrite=True, checksum=True)
-            files.append(fullpath)
+                primary_header = self.generate_primary_header(filename, prod)
+                primary_hdu = fits.PrimaryHDU()
+                primary_hdu.header.update(primary_header)
+                primary_hdu.header.update({"HISTORY": "Processed by STIXCore LB"})
+
+                control_hdu = fits.BinTableHDU(control)
+                control_hdu.name = "CONTROL"
+                data_hdu = fits.BinTableHDU(data)
+                data_hdu.name = "DATA"
+                hdul = fits.HDUList([primary_hdu, control_hdu, data_hdu])
+
+                fullpath = path / filename
+                logger.info(f"start writing fits file to {fullpath}")
+                write_hdul(hdul, fullpath)
+                files.append(fullpath)
             logger.info(f"done writing fits file to {fullpath}")
 
         return files
@@ -521,6 +543,9 @@ class FitsL0Processor:
         """
         Write level 0 products into fits files.
 
+        Pure time appends to an existing daily file are written to a journal next to the file (see
+        `append_journal`) all other products are merged with the existing file (and its journal).
+
         Parameters
         ----------
         product : `stixcore.product.level0`
@@ -552,99 +577,229 @@ class FitsL0Processor:
             path.mkdir(parents=True, exist_ok=True)
 
             fitspath = path / filename
-            fitspath_complete = get_complete_file_name_and_path(fitspath)
-            if fitspath.exists():
-                logger.info("Fits file %s exists appending data", fitspath.name)
-                existing = Product(fitspath)
-                logger.debug("Existing %s, Current %s", existing, prod)
-                prod = prod + existing
-                logger.debug("Combined %s", prod)
-            elif fitspath_complete.exists():
-                logger.info("Complete Fits file %s exists appending data", fitspath.name)
-                existing = Product(fitspath_complete)
-                logger.debug("Existing %s, Current %s", existing, prod)
-                prod = prod + existing
-                logger.debug("Combined %s", prod)
+            with FileLock(fitspath):
+                if self.append_journal(fitspath, prod, product, version=version):
+                    created_files.append(fitspath)
+                    continue
+
+                fitspath_complete = get_complete_file_name_and_path(fitspath)
+                if fitspath.exists():
+                    logger.info("Fits file %s exists appending data", fitspath.name)
+                    existing = Product(fitspath)
+                    logger.debug("Existing %s, Current %s", existing, prod)
+                    prod = prod + existing
+                    logger.debug("Combined %s", prod)
+                elif fitspath_complete.exists():
+                    logger.info("Complete Fits file %s exists appending data", fitspath.name)
+                    existing = Product(fitspath_complete)
+                    logger.debug("Existing %s, Current %s", existing, prod)
+                    prod = prod + existing
+                    logger.debug("Combined %s", prod)
+
+                hdul = self.generate_hdul(filename, prod, product, version=version)
+
+                filetowrite = path / filename
+                logger.info(f"Writing fits file to {filetowrite}")
+                write_hdul(hdul, filetowrite)
+                remove_journal(filetowrite)
+                created_files.append(filetowrite)
+        return created_files
 
-            control = prod.control
-            data = prod.data
+    def append_journal(self, fitspath, prod, product, *, version=0):
+        """
+        Write a pure time append to an existing daily file into a journal next to the file.
 
-            # add comment in the FITS for all error values
-            for col in data.columns:
-                if col.endswith("_comp_err"):
-                    data[col].description = "Error due only to integer compression"
+        The data of the product have to start strictly after the last control row of the file and
+        its journal (by `scet_coarse` and `scet_fine`). Each append is written as a separate FITS file
+        so the daily file itself is not read or rewritten. Reading the file with `Product` folds the
+        journal in and `compact_fits` or the next write with overlapping data merge it into the file.
 
-            idb_versions = QTable(
-                rows=[
-                    (version, range.start.as_float(), range.end.as_float())
-                    for version, range in prod.idb_versions.items()
-                ],
-                names=["version", "obt_start", "obt_end"],
-            )
+        Parameters
+        ----------
+        fitspath : `pathlib.Path`
+            The daily file, the caller has to hold its `FileLock`
+        prod : `stixcore.product.GenericProduct`
+            The (daily) product to append
+        product : `stixcore.product.GenericProduct`
+            The original product to write
+        version : `int`
+            the version modifier for the filename
 
-            primary_header = self.generate_primary_header(filename, prod, version=version)
-            primary_hdu = fits.PrimaryHDU()
-            primary_hdu.header.update(primary_header)
+        Returns
+        -------
+        `bool`
+            True if the product was journaled, False if it has to be merged into the file.
+        """
+        if (
+            not fitspath.exists()
+            or not CONFIG.getboolean("Pipeline", "fits_append_journal", fallback=True)
+            or prod.level not in ("L0", "L1")
+            or not prod.fits_daily_file
+            or len(prod.control) == 0
+            or "request_id" in prod.control.colnames
+            or not {"scet_coarse", "scet_fine"}.issubset(prod.control.colnames)
+        ):
+            return False
 
-            if isinstance(product, FitsHeaderMixin):
-                primary_hdu.header.update(product.get_additional_header_keywords())
+        journal_files = get_journal_files(fitspath)
+        last = -1
+        for file in [fitspath, *journal_files]:
+            try:
+                control = fits.getdata(file, "CONTROL")
+            except KeyError:
+                return False
+            if not {"scet_coarse", "scet_fine"}.issubset(control.names):
+                return False
+            last = max(last, _scet_key(control["scet_coarse"], control["scet_fine"]).max(initial=-1))
+
+        if _scet_key(prod.control["scet_coarse"], prod.control["scet_fine"]).min() <= last:
+            return False
+
+        journal_file = get_journal_file_name_and_path(fitspath, len(journal_files))
+        logger.info("Journaling time append to %s in %s", fitspath.name, journal_file.name)
+        write_hdul(self.generate_hdul(fitspath.name, prod, product, version=version), journal_file)
+        return True
+
+    def compact_fits(self, fitspath):
+        """
+        Merge the journal of pure time appends into the daily file.
 
-            # Add comment and history
-            [primary_hdu.header.add_comment(com) for com in prod.comment]
-            [primary_hdu.header.add_history(com) for com in prod.history]
-            primary_hdu.header.update({"HISTORY": "Processed by STIXCore L0"})
+        Parameters
+        ----------
+        fitspath : `pathlib.Path`
+            The daily file
 
-            # Convert time to be relative to start date
-            # it is important that the change to the relative time is done after the header is
-            # generated as this will use the original SCET time data
+        Returns
+        -------
+        `bool`
+            True if a journal was merged into the file.
+        """
+        with FileLock(fitspath):
+            if not get_journal_files(fitspath):
+                return False
+
+            prod = Product(fitspath)
+            version = int(fits.getval(fitspath, "VERSION"))
+            logger.info("Compacting journal into fits file %s", fitspath)
+            write_hdul(self.generate_hdul(fitspath.name, prod, prod, version=version), fitspath)
+            remove_journal(fitspath)
+        return True
+
+    def generate_hdul(self, filename, prod, product, *, version=0):
+        """
+        Generate the HDU list of a fits file.
 
-            if isinstance(prod, Aspect):
-                data["time"] = np.atleast_1d(np.float32((data["time"] - prod.scet_timerange.start).as_float()))
+        Parameters
+        ----------
+        filename : `str`
+            Filename
+        prod : `stixcore.product.BaseProduct`
+            The (combined) product written to the file, its time columns are converted in place
+        product : `stixcore.product.BaseProduct`
+            The original product to write
+        version : `int`
+            the version modifier for the filename
 
-                data["timedel"] = np.atleast_1d(np.float32(data["timedel"].as_float()))
-            else:
-                # In TM sent as uint in units of 0.1 so convert to cs as the time center
-                # can be on 0.5ds points
-                data["time"] = np.atleast_1d(
-                    np.around((data["time"] - prod.scet_timerange.start).as_float().to(u.cs)).astype("uint32")
-                )
-                data["timedel"] = np.atleast_1d(np.uint32(np.around(data["timedel"].as_float().to(u.cs))))
+        Returns
+        -------
+        `astropy.io.fits.HDUList`
+            The HDU list
+        """
+        control = prod.control
+        data = prod.data
 
-            try:
-                control["time_stamp"] = control["time_stamp"].as_float()
-            except KeyError as e:
-                if "time_stamp" not in repr(e):
-                    raise e
+        # add comment in the FITS for all error values
+        for col in data.columns:
+            if col.endswith("_comp_err"):
+                data[col].description = "Error due only to integer compression"
 
-            control_enc = fits.connect._encode_mixins(control)
-            control_hdu = table_to_hdu(control_enc)
-            control_hdu = set_bscale_unsigned(control_hdu)
-            control_hdu = add_default_tuint(control_hdu)
-            control_hdu.name = "CONTROL"
+        idb_versions = QTable(
+            rows=[
+                (version, range.start.as_float(), range.end.as_float()) for version, range in prod.idb_versions.items()
+            ],
+            names=["version", "obt_start", "obt_end"],
+        )
 
-            data_enc = fits.connect._encode_mixins(data)
-            data_hdu = table_to_hdu(data_enc)
-            data_hdu = set_bscale_unsigned(data_hdu)
-            data_hdu = add_default_tuint(data_hdu)
-            data_hdu.name = "DATA"
+        primary_hdu = self.generate_primary_hdu(filename, prod, product, version=version)
 
-            idb_enc = fits.connect._encode_mixins(idb_versions)
-            idb_hdu = table_to_hdu(idb_enc)
-            idb_hdu = set_bscale_unsigned(idb_hdu)
-            idb_hdu = add_default_tuint(idb_hdu)
-            idb_hdu.name = "IDB_VERSIONS"
+        # Convert time to be relative to start date
+        # it is important that the change to the relative time is done after the header is
+        # generated as this will use the original SCET time data
 
-            hdul = [primary_hdu, control_hdu, data_hdu, idb_hdu]
+        if isinstance(prod, Aspect):
+            data["time"] = np.atleast_1d(np.float32((data["time"] - prod.scet_timerange.start).as_float()))
 
-            FitsL0Processor.add_optional_energy_table(prod, hdul)
+            data["timedel"] = np.atleast_1d(np.float32(data["timedel"].as_float()))
+        else:
+            # In TM sent as uint in units of 0.1 so convert to cs as the time center
+            # can be on 0.5ds points
+            data["time"] = np.atleast_1d(
+                np.around((data["time"] - prod.scet_timerange.start).as_float().to(u.cs)).astype("uint32")
+            )
+            data["timedel"] = np.atleast_1d(np.uint32(np.around(data["timedel"].as_float().to(u.cs))))
 
-            hdul = fits.HDUList(hdul)
+        try:
+            control["time_stamp"] = control["time_stamp"].as_float()
+        except KeyError as e:
+            if "time_stamp" not in repr(e):
+                raise e
 
-            filetowrite = path / filename
-            logger.info(f"Writing fits file to {filetowrite}")
-            hdul.writeto(filetowrite, overwrite=True, checksum=True)
-            created_files.append(filetowrite)
-        return created_files
+        control_enc = fits.connect._encode_mixins(control)
+        control_hdu = table_to_hdu(control_enc)
+        control_hdu = set_bscale_unsigned(control_hdu)
+        control_hdu = add_default_tuint(control_hdu)
+        control_hdu.name = "CONTROL"
+
+        data_enc = fits.connect._encode_mixins(data)
+        data_hdu = table_to_hdu(data_enc)
+        data_hdu = set_bscale_unsigned(data_hdu)
+        data_hdu = add_default_tuint(data_hdu)
+        data_hdu.name = "DATA"
+
+        idb_enc = fits.connect._encode_mixins(idb_versions)
+        idb_hdu = table_to_hdu(idb_enc)
+        idb_hdu = set_bscale_unsigned(idb_hdu)
+        idb_hdu = add_default_tuint(idb_hdu)
+        idb_hdu.name = "IDB_VERSIONS"
+
+        hdul = [primary_hdu, control_hdu, data_hdu, idb_hdu]
+
+        FitsL0Processor.add_optional_energy_table(prod, hdul)
+
+        return fits.HDUList(hdul)
+
+    def generate_primary_hdu(self, filename, prod, product, *, version=0):
+        """
+        Generate the primary HDU.
+
+        Parameters
+        ----------
+        filename : `str`
+            Filename
+        prod : `stixcore.product.BaseProduct`
+            The (combined) product written to the file
+        product : `stixcore.product.BaseProduct`
+            The original product to write
+        version : `int`
+            the version modifier for the filename
+
+        Returns
+        -------
+        `astropy.io.fits.PrimaryHDU`
+            The primary HDU
+        """
+        primary_header = self.generate_primary_header(filename, prod, version=version)
+        primary_hdu = fits.PrimaryHDU()
+        primary_hdu.header.update(primary_header)
+
+        if isinstance(product, FitsHeaderMixin):
+            primary_hdu.header.update(product.get_additional_header_keywords())
+
+        # Add comment and history
+        [primary_hdu.header.add_comment(com) for com in prod.comment]
+        [primary_hdu.header.add_history(com) for com in prod.history]
+        primary_hdu.header.update({"HISTORY": "Processed by STIXCore L0"})
+        return primary_hdu
 
     @staticmethod
     def add_optional_energy_table(product, hdul):
@@ -822,10 +977,31 @@ class FitsL1Processor(FitsL0Processor):
 
         return headers + data_headers + soop_headers + time_headers, ephemeris_headers
 
+    def generate_primary_hdu(self, filename, prod, product, *, version=0):
+        """
+        Generate the primary HDU with the L1 and ephemeris headers.
+
+        See `FitsL0Processor.generate_primary_hdu`.
+        """
+        primary_header, header_override = self.generate_primary_header(filename, prod, version=version)
+        primary_hdu = fits.PrimaryHDU()
+        primary_hdu.header.update(primary_header)
+        primary_hdu.header.update(header_override)
+        primary_hdu.header.update(product.get_additional_header_keywords())
+
+        # Add comment and history
+        [primary_hdu.header.add_comment(com) for com in prod.comment]
+        [primary_hdu.header.add_history(com) for com in prod.history]
+        primary_hdu.header.update({"HISTORY": "Processed by STIXCore L1"})
+        return primary_hdu
+
     def write_fits(self, product, *, version=0):
         """
         Write level 0 products into fits files.
 
+        Pure time appends to an existing daily file are written to a journal next to the file (see
+        `append_journal`) all other products are merged with the existing file (and its journal).
+
         Parameters
         ----------
         product : `stixcore.product.level0`
@@ -859,93 +1035,110 @@ class FitsL1Processor(FitsL0Processor):
             path.mkdir(parents=True, exist_ok=True)
 
             fitspath = path / filename
-            fitspath_complete = get_complete_file_name_and_path(fitspath)
-
-            if fitspath.exists():
-                logger.info("Fits file %s exists appending data", fitspath.name)
-                existing = Product(fitspath)
-                logger.debug("Existing %s, Current %s", existing, prod)
-                prod = prod + existing
-                logger.debug("Combined %s", prod)
-            elif fitspath_complete.exists():
-                logger.info("Complete Fits file %s exists appending data", fitspath.name)
-                existing = Product(fitspath_complete)
-                logger.debug("Existing %s, Current %s", existing, prod)
-                prod = prod + existing
-                logger.debug("Combined %s", prod)
+            with FileLock(fitspath):
+                if self.append_journal(fitspath, prod, product, version=version):
+                    created_files.append(fitspath)
+                    continue
+
+                fitspath_complete = get_complete_file_name_and_path(fitspath)
+                if fitspath.exists():
+                    logger.info("Fits file %s exists appending data", fitspath.name)
+                    existing = Product(fitspath)
+                    logger.debug("Existing %s, Current %s", existing, prod)
+                    prod = prod + existing
+                    logger.debug("Combined %s", prod)
+                elif fitspath_complete.exists():
+                    logger.info("Complete Fits file %s exists appending data", fitspath.name)
+                    existing = Product(fitspath_complete)
+                    logger.debug("Existing %s, Current %s", existing, prod)
+                    prod = prod + existing
+                    logger.debug("Combined %s", prod)
+
+                hdul = self.generate_hdul(filename, prod, product, version=version)
+
+                filetowrite = path / filename
+                logger.info(f"Writing fits file to {filetowrite}")
+                write_hdul(hdul, filetowrite)
+                remove_journal(filetowrite)
+                created_files.append(filetowrite)
+        return created_files
 
-            control = prod.control
-            data = prod.data
+    def generate_hdul(self, filename, prod, product, *, version=0):
+        """
+        Generate the HDU list of a fits file.
 
-            # add comment in the FITS for all error values
-            for col in data.columns:
-                if col.endswith("_comp_err"):
-                    data[col].description = "Error due only to integer compression"
+        Parameters
+        ----------
+        filename : `str`
+            Filename
+        prod : `stixcore.product.BaseProduct`
+            The (combined) product written to the file, its time columns are converted in place
+        product : `stixcore.product.BaseProduct`
+            The original product to write
+        version : `int`
+            the version modifier for the filename
 
-            primary_header, header_override = self.generate_primary_header(filename, prod, version=version)
-            primary_hdu = fits.PrimaryHDU()
-            primary_hdu.header.update(primary_header)
-            primary_hdu.header.update(header_override)
-            primary_hdu.header.update(product.get_additional_header_keywords())
+        Returns
+        -------
+        `astropy.io.fits.HDUList`
+            The HDU list
+        """
+        control = prod.control
+        data = prod.data
 
-            # Add comment and history
-            [primary_hdu.header.add_comment(com) for com in prod.comment]
-            [primary_hdu.header.add_history(com) for com in prod.history]
-            primary_hdu.header.update({"HISTORY": "Processed by STIXCore L1"})
+        # add comment in the FITS for all error values
+        for col in data.columns:
+            if col.endswith("_comp_err"):
+                data[col].description = "Error due only to integer compression"
 
-            # Convert time to be relative to start date
-            # it is important that the change to the relative time is done after the header is
-            # generated as this will use the original SCET time data
+        primary_hdu = self.generate_primary_hdu(filename, prod, product, version=version)
 
-            # In TM sent as uint in units of 0.1 so convert to cs as the time center
-            # can be on 0.5ds points
-            data["time"] = np.atleast_1d(
-                np.around((data["time"] - prod.scet_timerange.start).as_float().to(u.cs)).astype("uint32")
-            )
-            data["timedel"] = np.atleast_1d(np.uint32(np.around(data["timedel"].as_float().to(u.cs))))
+        # Convert time to be relative to start date
+        # it is important that the change to the relative time is done after the header is
+        # generated as this will use the original SCET time data
 
-            try:
-                control["time_stamp"] = control["time_stamp"].as_float()
-            except KeyError as e:
-                if "time_stamp" not in repr(e):
-                    raise e
+        # In TM sent as uint in units of 0.1 so convert to cs as the time center
+        # can be on 0.5ds points
+        data["time"] = np.atleast_1d(
+            np.around((data["time"] - prod.scet_timerange.start).as_float().to(u.cs)).astype("uint32")
+        )
+        data["timedel"] = np.atleast_1d(np.uint32(np.around(data["timedel"].as_float().to(u.cs))))
 
-            control_enc = fits.connect._encode_mixins(control)
-            control_hdu = table_to_hdu(control_enc)
-            control_hdu = set_bscale_unsigned(control_hdu)
-            control_hdu = add_default_tuint(control_hdu)
-            control_hdu.name = "CONTROL"
+        try:
+            control["time_stamp"] = control["time_stamp"].as_float()
+        except KeyError as e:
+            if "time_stamp" not in repr(e):
+                raise e
 
-            data_enc = fits.connect._encode_mixins(data)
-            data_hdu = table_to_hdu(data_enc)
-            data_hdu = set_bscale_unsigned(data_hdu)
-            data_hdu = add_default_tuint(data_hdu)
-            data_hdu.name = "DATA"
+        control_enc = fits.connect._encode_mixins(control)
+        control_hdu = table_to_hdu(control_enc)
+        control_hdu = set_bscale_unsigned(control_hdu)
+        control_hdu = add_default_tuint(control_hdu)
+        control_hdu.name = "CONTROL"
 
-            hdul = [primary_hdu, control_hdu, data_hdu]
+        data_enc = fits.connect._encode_mixins(data)
+        data_hdu = table_to_hdu(data_enc)
+        data_hdu = set_bscale_unsigned(data_hdu)
+        data_hdu = add_default_tuint(data_hdu)
+        data_hdu.name = "DATA"
 
-            idb_versions = QTable(
-                rows=[
-                    (version, range.start.as_float(), range.end.as_float())
-                    for version, range in prod.idb_versions.items()
-                ],
-                names=["version", "obt_start", "obt_end"],
-            )
-            idb_enc = fits.connect._encode_mixins(idb_versions)
-            idb_hdu = table_to_hdu(idb_enc)
-            idb_hdu = add_default_tuint(idb_hdu)
-            idb_hdu.name = "IDB_VERSIONS"
-            hdul.append(idb_hdu)
+        hdul = [primary_hdu, control_hdu, data_hdu]
 
-            FitsL0Processor.add_optional_energy_table(prod, hdul)
+        idb_versions = QTable(
+            rows=[
+                (version, range.start.as_float(), range.end.as_float()) for version, range in prod.idb_versions.items()
+            ],
+            names=["version", "obt_start", "obt_end"],
+        )
+        idb_enc = fits.connect._encode_mixins(idb_versions)
+        idb_hdu = table_to_hdu(idb_enc)
+        idb_hdu = add_default_tuint(idb_hdu)
+        idb_hdu.name = "IDB_VERSIONS"
+        hdul.append(idb_hdu)
 
-            hdul = fits.HDUList(hdul)
+        FitsL0Processor.add_optional_energy_table(prod, hdul)
 
-            filetowrite = path / filename
-            logger.info(f"Writing fits file to {filetowrite}")
-            hdul.writeto(filetowrite, overwrite=True, checksum=True)
-            created_files.append(filetowrite)
-        return created_files
+        return fits.HDUList(hdul)
 
 
 class FitsL2Processor(FitsL1Processor):
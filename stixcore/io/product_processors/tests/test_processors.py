@@ -1,3 +1,4 @@
+from collections import defaultdict
 from unittest.mock import patch
 
 import numpy as np
@@ -12,9 +13,11 @@ from stixcore.io.product_processors.fits.processors import (
     FitsLBProcessor,
 )
 from stixcore.io.product_processors.plots.processors import PlotProcessor
+from stixcore.products.level0.housekeepingL0 import MaxiReport
 from stixcore.products.product import Product
 from stixcore.soop.manager import SOOPManager
-from stixcore.time import SCETime, SCETimeRange
+from stixcore.time import SCETime, SCETimeDelta, SCETimeRange
+from stixcore.util.util import get_journal_files
 
 
 @pytest.fixture
@@ -297,6 +300,63 @@ def test_level1_processor_generate_primary_header(product, soop_manager):
                 assert value == test_data[name]
 
 
+def _maxi_report(coarse):
+    # L0 HK maxi report with a packet for each coarse time
+    n_packets = len(coarse)
+    control = QTable()
+    control["scet_coarse"] = np.array(coarse, dtype=np.uint32)
+    control["scet_fine"] = np.zeros(n_packets, dtype=np.uint32)
+    control["integration_time"] = np.zeros(n_packets)
+    control["index"] = np.arange(n_packets)
+    control["raw_file"] = ["raw.xml"] * n_packets
+    control["packet"] = np.arange(n_packets)
+
+    data = QTable()
+    data["time"] = SCETime(control["scet_coarse"], control["scet_fine"])
+    data["timedel"] = SCETimeDelta(np.zeros(n_packets, dtype=int), 0)
+    data["hk_value"] = np.array(coarse, dtype=np.int64) % 1000
+    data["control_index"] = np.arange(n_packets)
+
+    idb_versions = defaultdict(SCETimeRange)
+    idb_versions["2.26.34"] = SCETimeRange(start=data["time"][0], end=data["time"][-1])
+    return MaxiReport(service_type=3, service_subtype=25, ssid=2, control=control, data=data, idb_versions=idb_versions)
+
+
+def test_level0_processor_journal_time_append(tmp_path):
+    coarse = 664070400 + 100 + 4 * np.arange(30)
+    processor = FitsL0Processor(tmp_path)
+    (fitspath,) = processor.write_fits(_maxi_report(coarse[:10]))
+    content, inode = fitspath.read_bytes(), fitspath.stat().st_ino
+
+    # pure time appends neither read nor rewrite the daily file
+    with patch("stixcore.io.product_processors.fits.processors.Product", side_effect=AssertionError):
+        assert processor.write_fits(_maxi_report(coarse[10:20])) == [fitspath]
+        assert processor.write_fits(_maxi_report(coarse[20:])) == [fitspath]
+    assert fitspath.read_bytes() == content
+    assert fitspath.stat().st_ino == inode
+    assert len(get_journal_files(fitspath)) == 2
+
+    # reading the file folds in the journal
+    journaled = Product(fitspath)
+    assert np.array_equal(journaled.control["scet_coarse"], coarse)
+    assert np.array_equal(journaled.data["hk_value"], coarse % 1000)
+    assert journaled.scet_timerange.end == SCETime(int(coarse[-1]), 0)
+
+    # overlapping data fall back to the full merge into the file
+    assert processor.write_fits(_maxi_report(coarse[5:15])) == [fitspath]
+    assert get_journal_files(fitspath) == []
+    merged = Product(fitspath)
+    assert np.array_equal(merged.control["scet_coarse"], coarse)
+    assert np.all(merged.data == journaled.data)
+
+    # compacting merges the journal into the file
+    processor.write_fits(_maxi_report(coarse[-1:] + 4))
+    assert processor.compact_fits(fitspath)
+    assert get_journal_files(fitspath) == []
+    assert not processor.compact_fits(fitspath)
+    assert np.array_equal(Product(fitspath).control["scet_coarse"], np.append(coarse, coarse[-1] + 4))
+
+
 @patch("stixcore.products.lowlatency.quicklookLL.LightCurveL3")
 def test_plot_processor_generate_filename(product):
     processor = PlotProcessor("some/path")
@@ -1,5 +1,7 @@
 """Module to encapsulate the SOC file reading and writing."""
 
+import re
+import mmap
 from pathlib import Path
 from binascii import unhexlify
 from xml.etree import ElementTree as Et
@@ -12,6 +14,13 @@ __all__ = ["SOCManager", "SOCPacketFile"]
 
 logger = get_logger(__name__)
 
+# Not sure why guess and extra moc header
+MOC_HEADER_LENGTH = 76
+
+TM_PACKET_PATTERN = re.compile(
+    rb"<(?:\w+:)?PktRawResponseElement\b[^>]*?\bpacketID=\"(\d+)\"[^>]*>\s*<[^>/]+>\s*([0-9A-Fa-f]*)\s*</"
+)
+
 
 class SOCPacketFile:
     """Represents a SOC xml file handler that can contain TM or TC data."""
@@ -52,26 +61,55 @@ class SOCPacketFile:
             else:
                 raise ValueError("xml does not contain any TM or TC response")
 
-    def get_packet_binaries(self):
+    def get_packet_binaries(self, *, use_mmap=False):
         """Get sequence of binary packet data form the SOC file.
 
+        The file is read incrementally and processed elements are released right away so the
+        memory usage does not depend on the file size.
+
+        Parameters
+        ----------
+        use_mmap : `bool`, optional
+            fast path: memory map the file and scan for the packet elements directly without a XML
+            parser, by default False
+
         Yields
         -------
-        ´bytes´
-            the next binary data of hexadecimal representation form the SOC file.
+        ´tuple´ (`int`, `bytes`)
+            the packet id and next binary data of hexadecimal representation form the SOC file.
         """
-        root = Et.parse(str(self.file)).getroot()
         if self.tmtc == TMTC.TC:
-            for i, node in enumerate(root.iter("PktTcReportListElement")):
-                # TODO add TC packer reading
-                pass
+            # TODO add TC packer reading
+            return
         elif self.tmtc == TMTC.TM:
-            for node in root.iter("PktRawResponseElement"):
+            if use_mmap:
+                yield from self._scan_packet_binaries()
+            else:
+                yield from self._iterparse_packet_binaries()
+
+    def _iterparse_packet_binaries(self):
+        parents = []
+        for event, node in Et.iterparse(str(self.file), events=("start", "end")):
+            if event == "start":
+                parents.append(node)
+                continue
+
+            parents.pop()
+            if node.tag == "PktRawResponseElement":
                 packet_id = int(node.attrib["packetID"])
-                packet = list(node)[0]
-                packet_binary = unhexlify(packet.text)
-                # Not sure why guess and extra moc header
-                yield packet_id, packet_binary[76:]
+                packet_binary = unhexlify(node[0].text)
+                yield packet_id, packet_binary[MOC_HEADER_LENGTH:]
+
+                # release the processed element
+                node.clear()
+                if parents:
+                    parents[-1].remove(node)
+
+    def _scan_packet_binaries(self):
+        with open(self.file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in TM_PACKET_PATTERN.finditer(mm):
+                packet_binary = unhexlify(match.group(2))
+                yield int(match.group(1)), packet_binary[MOC_HEADER_LENGTH:]
 
     def __repr__(self):
         return f"{self.__class__.__name__}('{self.file}')"
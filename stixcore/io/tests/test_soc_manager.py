@@ -46,3 +46,22 @@ def test_soc_file(base_dir):
         _ = SOCPacketFile(".foo/")
 
     assert "path not found" in str(e.value)
+
+
+def test_get_packet_binaries_streaming(tmp_path):
+    packets = [bytes(range(76)) + bytes([i, 2 * i, 255]) for i in range(5)]
+    elements = "\n".join(
+        f'<PktRawResponseElement packetID="{100 + i}">\n  <Packet>{p.hex().upper()}</Packet>\n</PktRawResponseElement>'
+        for i, p in enumerate(packets)
+    )
+    xml = tmp_path / "test.PktTmRaw.xml"
+    xml.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<ns2:ResponsePart xmlns:ns2="http://edds.egos.esa/model">'
+        f"<Response><PktRawResponse>{elements}</PktRawResponse></Response></ns2:ResponsePart>"
+    )
+    sf = SOCPacketFile(xml)
+    assert sf.tmtc == TMTC.TM
+
+    expected = [(100 + i, p[76:]) for i, p in enumerate(packets)]
+    assert list(sf.get_packet_binaries()) == expected
+    assert list(sf.get_packet_binaries(use_mmap=True)) == expected
@@ -163,7 +163,8 @@ class AspectANC(SingleProductProcessingStepMixin):
             data["duration"][0:-1] = dur
             data["duration"][:] = dur[-1]
 
-            data["spice_disc_size"] = [Spice.instance.get_sun_disc_size(date=d) for d in l1hk.data["time"]]
+            aux_data, _ = Spice.instance.sample_auxiliary_positional_data(l1hk.data["time"])
+            data["spice_disc_size"] = aux_data["spice_disc_size"]
 
             data["y_srf"] = 0.0
             data["z_srf"] = 0.0
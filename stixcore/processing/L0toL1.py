@@ -2,17 +2,16 @@ import warnings
 from time import perf_counter
 from pathlib import Path
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
 
 from sunpy.util.datatype_factory_base import NoMatchError
 
 from stixcore.config.config import CONFIG
 from stixcore.ephemeris.manager import Spice, SpiceKernelManager
 from stixcore.io.product_processors.fits.processors import FitsL1Processor
+from stixcore.processing.workers import WorkerPool
 from stixcore.products import Product
 from stixcore.products.level0.quicklookL0 import QLSpectraReshapeError
 from stixcore.products.level0.scienceL0 import NotCombineException
-from stixcore.soop.manager import SOOPManager
 from stixcore.util.logging import get_logger
 from stixcore.util.util import get_complete_file_name
 
@@ -36,6 +35,34 @@ class Level1:
         self.level0_files = sorted(list(self.source_dir.rglob("*.fits")))
         self.processor = FitsL1Processor(self.output_dir)
 
+    @staticmethod
+    def product_type(file):
+        """Get the processing group of a L0 file.
+
+        Parameters
+        ----------
+        file : `pathlib.Path`
+            the L0 file
+
+        Returns
+        -------
+        `tuple` (`tuple`, `bool`)
+            (prio, service, subservice, [SSID]) and if it is science data written to separate files
+        """
+        # group by service,subservice, ssid example: 'L0/21/6/30' as default
+        # or (prio, service, subservice, [SSID]) if all data is available
+        prio = 3
+        sci = False
+        product_type = (str(file.parent),)
+        if "L0" in file._parts:
+            product_type = tuple(map(int, file._parts[file._parts.index("L0") + 1 : -1]))
+            if product_type[0] == 21 and product_type[-1] in {20, 21, 22, 23, 24, 42}:  # sci data
+                sci = True
+                prio = 2
+            elif product_type[0] == 21:  # ql data
+                prio = 1
+        return (prio,) + product_type, sci
+
     def process_fits_files(self, files=None):
         all_files = list()
         if files is None:
@@ -45,35 +72,17 @@ class Level1:
         batch_size = CONFIG.getint("Pipeline", "parallel_batchsize_L1", fallback=150)
 
         for file in files:
-            # group by service,subservice, ssid example: 'L0/21/6/30' as default
-            # or (prio, service, subservice, [SSID], [BATCH]) if all data is available
-            batch = 0
-            prio = 3
-            product_type = str(file.parent)
-            if "L0" in file._parts:
-                product_type = tuple(map(int, file._parts[file._parts.index("L0") + 1 : -1]))
-                if product_type[0] == 21 and product_type[-1] in {20, 21, 22, 23, 24, 42}:  # sci data
-                    product_types_batch[product_type] += 1
-                    prio = 2
-                elif product_type[0] == 21:  # ql data
-                    prio = 1
-                batch = product_types_batch[product_type] // batch_size
-            product_types[(prio,) + product_type + (batch,)].append(file)
+            # (prio, service, subservice, [SSID], [BATCH])
+            product_type, sci = self.product_type(file)
+            if sci:
+                product_types_batch[product_type] += 1
+            batch = product_types_batch[product_type] // batch_size
+            product_types[product_type + (batch,)].append(file)
 
         jobs = []
-        with ProcessPoolExecutor() as executor:
-            # simple heuristic that the daily QL data takes longest so we start early
-            for pt, files in sorted(product_types.items()):
-                jobs.append(
-                    executor.submit(
-                        process_type,
-                        files,
-                        processor=FitsL1Processor(self.output_dir),
-                        soopmanager=SOOPManager.instance,
-                        spice_kernel_path=Spice.instance.meta_kernel_path,
-                        config=CONFIG,
-                    )
-                )
+        # simple heuristic that the daily QL data takes longest so we start early
+        for pt, files in sorted(product_types.items()):
+            jobs.append(WorkerPool.instance.submit(process_type, files, processor=FitsL1Processor(self.output_dir)))
 
         for job in jobs:
             try:
@@ -85,11 +94,8 @@ class Level1:
         return list(set(all_files))
 
 
-def process_type(files, *, processor, soopmanager, spice_kernel_path, config):
-    SOOPManager.instance = soopmanager
+def process_type(files, *, processor):
     all_files = list()
-    Spice.instance = Spice(spice_kernel_path)
-    CONFIG = config
 
     for file in files:
         try:
@@ -2,18 +2,16 @@ import warnings
 from time import perf_counter
 from pathlib import Path
 from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
 
 from sunpy.util.datatype_factory_base import NoMatchError
 
 from stixcore.config.config import CONFIG
 from stixcore.ecc.manager import ECCManager
-from stixcore.ephemeris.manager import Spice
 from stixcore.io.product_processors.fits.processors import FitsL2Processor
 from stixcore.processing.sswidl import SSWIDLProcessor
+from stixcore.processing.workers import WorkerPool
 from stixcore.products import Product
 from stixcore.products.level0.scienceL0 import NotCombineException
-from stixcore.soop.manager import SOOPManager
 from stixcore.util.logging import get_logger
 from stixcore.util.util import get_complete_file_name_and_path
 
@@ -36,6 +34,24 @@ class Level2:
         self.level1_files = sorted(list(self.source_dir.rglob("*.fits")))
         self.processor = FitsL2Processor(self.output_dir)
 
+    @staticmethod
+    def product_type(file):
+        """Get the processing group of a L1 file.
+
+        Parameters
+        ----------
+        file : `pathlib.Path`
+            the L1 file
+
+        Returns
+        -------
+        `tuple` (`tuple`, `bool`)
+            the product e.g. ('hk', 'maxi') and if it is science data written to separate files
+        """
+        mission, level, identifier, *_ = file.name.split("_")
+        tm_type = tuple(identifier.split("-")[1:])
+        return tm_type, tm_type[0] == "sci"
+
     def process_fits_files(self, files=None):
         all_files = list()
         if files is None:
@@ -47,26 +63,15 @@ class Level2:
 
         for file in files:
             # group by product: '(HK,maxi)'
-            mission, level, identifier, *_ = file.name.split("_")
-            tm_type = tuple(identifier.split("-")[1:])
-            if tm_type[0] == "sci":
+            tm_type, sci = self.product_type(file)
+            if sci:
                 product_types_batch[tm_type] += 1
             batch = product_types_batch[tm_type] // batch_size
             product_types[tm_type + (batch,)].append(file)
 
         jobs = []
-        with ProcessPoolExecutor() as executor:
-            for pt, files in product_types.items():
-                jobs.append(
-                    executor.submit(
-                        process_type,
-                        files,
-                        processor=FitsL2Processor(self.output_dir),
-                        soopmanager=SOOPManager.instance,
-                        spice_kernel_path=Spice.instance.meta_kernel_path,
-                        config=CONFIG,
-                    )
-                )
+        for pt, files in product_types.items():
+            jobs.append(WorkerPool.instance.submit(process_type, files, processor=FitsL2Processor(self.output_dir)))
 
         for job in jobs:
             try:
@@ -78,11 +83,7 @@ class Level2:
         return list(set(all_files))
 
 
-def process_type(files, *, processor, soopmanager, spice_kernel_path, config):
-    SOOPManager.instance = soopmanager
-    Spice.instance = Spice(spice_kernel_path)
-    CONFIG = config
-
+def process_type(files, *, processor):
     all_files = list()
     max_idlbatch = CONFIG.getint("IDLBridge", "batchsize", fallback=20)
     idlprocessor = SSWIDLProcessor(processor)
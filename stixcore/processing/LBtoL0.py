@@ -1,14 +1,12 @@
 import warnings
 from time import perf_counter
 from pathlib import Path
-from collections import defaultdict
-from concurrent.futures import ProcessPoolExecutor
 
 from stixcore.config.config import CONFIG
 from stixcore.ephemeris.manager import Spice, SpiceKernelManager
-from stixcore.idb.manager import IDBManager
 from stixcore.io.product_processors.fits.processors import FitsL0Processor
-from stixcore.io.RidLutManager import RidLutManager
+from stixcore.processing.scheduler import CostModel, TaskScheduler
+from stixcore.processing.workers import WorkerPool
 from stixcore.products.level0.quicklookL0 import QLSpectraReshapeError
 from stixcore.products.level0.scienceL0 import NotCombineException
 from stixcore.products.product import Product
@@ -23,20 +21,36 @@ class Level0:
     Input are LB Fits files and the result is written to FITS as well. Daily products will be added
     to existing FITS files if already present.
 
-    Groups all files into parallel processes by product type if daily products. For by request
-    products it is also grouped by type but additional into batches of a given size.
+    Groups all files by product type and splits them into tasks of about equal estimated processing
+    time (see `stixcore.processing.scheduler.TaskScheduler`). Tasks adding to the same daily file
+    are serialised by the file lock of the FITS writer.
     """
 
+    #: processing cost history of the product types shared by all runs of the process and
+    #: persisted to config 'Pipeline.cost_model_file' (if set) for later processes
+    cost_model = CostModel(CONFIG.get("Pipeline", "cost_model_file", fallback=""))
+
     def __init__(self, source_dir, output_dir):
         self.source_dir = Path(source_dir)
         self.output_dir = Path(output_dir)
         self.levelb_files = sorted(list(self.source_dir.rglob("*.fits")))
         self.processor = FitsL0Processor(self.output_dir)
-
-    def process_fits_files(self, files=None):
-        all_files = list()
-        tm = defaultdict(list)
-        tm_batch = defaultdict(int)
+        self.report = None
+
+    def plan(self, files=None):
+        """Group the files by TM type and split them into balanced tasks.
+
+        Parameters
+        ----------
+        files : `list` of `pathlib.Path`, optional
+            the LB files, by default all files of the source directory
+
+        Returns
+        -------
+        `tuple` (`stixcore.processing.scheduler.TaskScheduler`, `list`)
+            the scheduler and the planed tasks
+        """
+        tm = dict()
         batch_size = CONFIG.getint("Pipeline", "parallel_batchsize_L0", fallback=300)
         if files is None:
             files = self.levelb_files
@@ -44,26 +58,20 @@ class Level0:
         for file in files:
             mission, level, identifier, *_ = file.name.split("_")
             tm_type = tuple(map(int, identifier.split("-")[1:]))
-            if tm_type[0] == 21 and tm_type[-1] in {20, 21, 22, 23, 24, 42}:
-                tm_batch[tm_type] += 1
-            batch = tm_batch[tm_type] // batch_size
-            tm[tm_type + (batch,)].append(file)
-
-        # For each type
-        with ProcessPoolExecutor() as executor:
-            jobs = [
-                executor.submit(
-                    process_tm_type,
-                    files,
-                    tm_type,
-                    self.processor,
-                    # keep track of the used Spice kernel
-                    spice_kernel_path=Spice.instance.meta_kernel_path,
-                    config=CONFIG,
-                    idbm=IDBManager.instance,
-                )
-                for tm_type, files in tm.items()
-            ]
+            # the writers lock the (daily) output files so all types can be split in several jobs
+            tm.setdefault(tm_type, ([], True))[0].append(file)
+
+        scheduler = TaskScheduler(self.cost_model, WorkerPool.instance.workers, max_files=batch_size)
+        return scheduler, scheduler.plan(tm)
+
+    def process_fits_files(self, files=None):
+        all_files = list()
+        scheduler, tasks = self.plan(files)
+
+        # For each type: the workers of the shared pool keep the Spice kernels, IDB and RID LUT loaded
+        with WorkerPool.instance.lease() as executor:
+            jobs, self.report = scheduler.run(executor, process_tm_type, tasks, processor=self.processor)
+        self.cost_model.save()
 
         for job in jobs:
             try:
@@ -76,18 +84,13 @@ class Level0:
         return list(set(all_files))
 
 
-def process_tm_type(files, tm_type, processor, spice_kernel_path, config, idbm):
+def process_tm_type(files, tm_type, processor):
     all_files = []
-    Spice.instance = Spice(spice_kernel_path)
-    IDBManager.instance = idbm
-    CONFIG = config
 
     logger.info(f"Start Processing TM type: {tm_type} with {len(files)} files")
 
-    RidLutManager.instance = RidLutManager(Path(CONFIG.get("Publish", "rid_lut_file")), update=False)
-
     # Stand alone packet data
-    if (tm_type[0] == 21 and tm_type[-2] not in {20, 21, 22, 23, 24, 42}) or tm_type[0] != 21:
+    if (tm_type[0] == 21 and tm_type[-1] not in {20, 21, 22, 23, 24, 42}) or tm_type[0] != 21:
         for file in files:
             logger.info(f"processing file: {file}")
             levelb = Product(file)
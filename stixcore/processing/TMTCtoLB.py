@@ -1,11 +1,12 @@
 import warnings
 from time import perf_counter
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 from stixcore.config.config import CONFIG
 from stixcore.io.product_processors.fits.processors import FitsLBProcessor
 from stixcore.io.soc.manager import SOCManager
+from stixcore.processing.workers import WorkerPool
 from stixcore.products.levelb.binary import LevelB
 from stixcore.tmtc.packets import TMTC
 from stixcore.util.logging import get_logger
@@ -21,27 +22,109 @@ def tmtc_to_l0(tmtc_path, archive_path):
     return process_tmtc_to_levelbinary(files_to_process, archive_path)
 
 
-def process_tmtc_to_levelbinary(files_to_process, archive_path=None):
+def _batched(iterable, size):
+    """Yield successive lists of at most `size` items of the given iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _levelb_from_chunk(binaries, raw_file, binary):
+    """Parse a chunk of packet binaries of a raw file into LevelB products.
+
+    Runs in a worker process, the parsing errors are propagated to the caller.
+    """
+    packet_data = LevelB.read_packets(binaries, raw_file=raw_file)
+    return list(LevelB.from_packets(packet_data, binary=binary))
+
+
+def _merge_products(products, new_products):
+    """Merge LevelB products by product key (service, subservice, ssid) into `products`."""
+    for prod in new_products:
+        key = (prod.service_type, prod.service_subtype, prod.ssid)
+        products[key] = products[key] + prod if key in products else prod
+
+
+def _levelb_from_files(executor, tmtc_files, chunk_size, binary):
+    """Parse the given raw files in parallel chunks and merge the LevelB products.
+
+    A file with a chunk that can not be parsed is skipped entirely.
+    """
+    file_jobs = []
+    for tmtc_file in tmtc_files:
+        logger.info(f"Processing file: {tmtc_file}")
+        raw_file = tmtc_file.file.name
+        jobs = [
+            executor.submit(_levelb_from_chunk, chunk, raw_file, binary)
+            for chunk in _batched(tmtc_file.get_packet_binaries(), chunk_size)
+        ]
+        file_jobs.append((raw_file, jobs))
+
+    products = dict()
+    for raw_file, jobs in file_jobs:
+        file_products = dict()
+        try:
+            for job in jobs:
+                _merge_products(file_products, job.result())
+        except Exception as e:
+            logger.error("Error parsing %s", raw_file, exc_info=True)
+            for job in jobs:
+                job.cancel()
+            if CONFIG.getboolean("Logging", "stop_on_error", fallback=False):
+                raise e
+            continue
+        _merge_products(products, file_products.values())
+
+    return products
+
+
+def process_tmtc_to_levelbinary(files_to_process, archive_path=None, *, chunk_size=None, max_files=None):
+    """Convert raw TM files into LevelB FITS files.
+
+    The packets of up to `max_files` raw files are parsed in chunks of `chunk_size` packets in
+    parallel worker processes. The resulting products are merged per product key and each product
+    is written once (in parallel) so no two workers write to the same FITS file.
+
+    Parameters
+    ----------
+    files_to_process : iterable of `SOCPacketFile`
+        the raw TM files
+    archive_path : `pathlib.Path`, optional
+        the LevelB FITS archive root, by default config 'Paths.fits_archive'
+    chunk_size : `int`, optional
+        number of packets parsed per worker job, by default config 'Pipeline.parallel_tmtc_chunksize'
+    max_files : `int`, optional
+        number of raw files processed (held in memory) at once, by default config
+        'Pipeline.parallel_tmtc_files'
+
+    Returns
+    -------
+    `set`
+        all written FITS files
+    """
     if archive_path is None:
         archive_path = Path(CONFIG.get("Paths", "fits_archive"))
+    if chunk_size is None:
+        chunk_size = CONFIG.getint("Pipeline", "parallel_tmtc_chunksize", fallback=10000)
+    if max_files is None:
+        max_files = CONFIG.getint("Pipeline", "parallel_tmtc_files", fallback=4)
+    binary = CONFIG.getboolean("Pipeline", "levelb_binary_data", fallback=False)
+
     fits_processor = FitsLBProcessor(archive_path)
     all_files = set()
-    for tmtc_file in files_to_process:
-        logger.info(f"Processing file: {tmtc_file}")
-        jobs = []
-        with ProcessPoolExecutor() as executor:
-            for prod in LevelB.from_tm(tmtc_file):
-                if prod:
-                    jobs.append(executor.submit(fits_processor.write_fits, prod))
-
-        for job in jobs:
-            try:
-                new_files = job.result()
-                all_files.update(new_files)
-            except Exception as e:
-                logger.error("Error processing", exc_info=True)
-                if CONFIG.getboolean("Logging", "stop_on_error", fallback=False):
-                    raise e
+    with WorkerPool.instance.lease() as executor:
+        for tmtc_files in _batched(files_to_process, max_files):
+            products = _levelb_from_files(executor, tmtc_files, chunk_size, binary)
+            jobs = [executor.submit(fits_processor.write_fits, prod) for prod in products.values()]
+
+            for job in jobs:
+                try:
+                    new_files = job.result()
+                    all_files.update(new_files)
+                except Exception as e:
+                    logger.error("Error processing", exc_info=True)
+                    if CONFIG.getboolean("Logging", "stop_on_error", fallback=False):
+                        raise e
 
     return all_files
 
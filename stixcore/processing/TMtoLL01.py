@@ -14,12 +14,14 @@ from stixcore.io.product_processors.fits.processors import FitsLL01Processor
 from stixcore.io.soc.manager import SOCPacketFile
 from stixcore.products.levelb.binary import LevelB
 from stixcore.products.product import Product
+from stixcore.tmtc.packets import PacketFilter
 from stixcore.util.logging import get_logger
 
 Y_M_D_H_M = "%Y%m%d%H%M"
 DIR_ENVNAMES = [("requests", "instr_input_requests"), ("output", "instr_output")]
 REQUEST_GLOB = "request_[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]_[0-9][0-9][0-9][0-9][0-9][0-9]*"
 LLDP_VERSION = "00.07.00"
+LL_PACKET_FILTER = PacketFilter(service_type=21, service_subtype=6, ssid=(30, 34))
 
 logger = get_logger(__name__)
 
@@ -74,10 +76,10 @@ def process_request(request, outputdir):
     if len(tmtc_files) != 1:
         raise RequestException("Expected one tmtc file found %s.", len(tmtc_files))
     soc_file = SOCPacketFile(tmtc_files[0])
-    lb = LevelB.from_tm(soc_file)
+    # Only process light curve (30) and flare flag and location (34)
+    lb = LevelB.from_tm(soc_file, packet_filter=LL_PACKET_FILTER)
     prods = []
     for prod in lb:
-        # Only process light curve (30) and flare flag and location (34)
         if prod.ssid in (30, 34):
             tmp = Product._check_registered_widget(
                 level="L0",
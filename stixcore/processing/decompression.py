@@ -1,10 +1,77 @@
 """Processing module for applying the skm decompression for configured parameters."""
 
+from functools import cache
+from collections import defaultdict
+
+import numpy as np
+from stixpy.calibration.compression import CompressionRangeError, NonIntegerCompressionError
 from stixpy.calibration.compression import decompress as algo_decompress
 
 from stixcore.tmtc.parameter import CompressedParameter
+from stixcore.util.logging import get_logger
+
+__all__ = ["decompress", "decompress_sequence", "lut_decompress"]
+
+logger = get_logger(__name__)
+
+
+@cache
+def skm_lookup_table(s, k, m):
+    """Decompressed values and variances of all 2^8 compressed codes for a compression scheme.
+
+    Parameters
+    ----------
+    s : `int`
+        Number of sign bits
+    k : `int`
+        Number of bits for exponent
+    m : `int`
+        Number of bits for mantissa
+
+    Returns
+    -------
+    `tuple` (`numpy.ndarray`, `numpy.ndarray`)
+        The (read only) decompressed values and variances indexed by the compressed value.
+    """
+    values, variance = algo_decompress(np.arange(256), s=s, k=k, m=m, return_variance=True)
+    values.flags.writeable = False
+    variance.flags.writeable = False
+    return values, variance
+
+
+def lut_decompress(values, *, s, k, m):
+    """Decompress values by a lookup in the precomputed table of the compression scheme.
+
+    Same result as `stixpy.calibration.compression.decompress` with ``return_variance=True``.
+
+    Parameters
+    ----------
+    values : array-like (int)
+        Values to decompress
+    s : `int`
+        Number of sign bits
+    k : `int`
+        Number of bits for exponent
+    m : `int`
+        Number of bits for mantissa
+
+    Returns
+    -------
+    `tuple` (`numpy.ndarray`, `numpy.ndarray`)
+        The decompressed values and variances
+    """
+    values = np.atleast_1d(np.array(values))
+    if not np.issubdtype(values.dtype, np.integer):
+        raise NonIntegerCompressionError(f"Input must be an integer type not {values.dtype}")
+    if values.size > 0 and (values.min() < 0 or values.max() > 255):
+        raise CompressionRangeError("Compressed values must be in the range 0 to 255")
 
-__all__ = ["decompress"]
+    lut, variance_lut = skm_lookup_table(int(s), int(k), int(m))
+    decompressed = lut[values]
+    if s != 0 and not np.any(values >= 128):
+        # only signed if negative values are present
+        decompressed = decompressed.astype(np.uint64)
+    return decompressed, variance_lut[values]
 
 
 def apply_decompress(raw, skm):
@@ -23,12 +90,10 @@ def apply_decompress(raw, skm):
         A uncompressed version of the parameter
     """
     try:
-        decompressed, error = algo_decompress(
-            raw.value, s=skm[0].value, k=skm[1].value, m=skm[2].value, return_variance=True
-        )
+        decompressed, error = lut_decompress(raw.value, s=skm[0].value, k=skm[1].value, m=skm[2].value)
     except AttributeError:
         # If the compression scheme parameters are overridden they will be int no parameters
-        decompressed, error = algo_decompress(raw.value, s=skm[0], k=skm[1], m=skm[2], return_variance=True)
+        decompressed, error = lut_decompress(raw.value, s=skm[0], k=skm[1], m=skm[2])
     return CompressedParameter(
         name=raw.name,
         idb_info=raw.idb_info,
@@ -68,3 +133,60 @@ def decompress(packet):
 
         c += packet.data.apply(param_name, apply_decompress, skm)
     return c
+
+
+def decompress_sequence(packets):
+    """Apply parameter decompression for all packets of a sequence at once.
+
+    The values of each parameter are grouped by the (s, k, m) compression scheme over all packets
+    and each group is decompressed with a single table lookup. The decompressed values and
+    variances are written back into the parameter columns. Parameters already decompressed or
+    calibrated (per packet) are skipped.
+
+    Parameters
+    ----------
+    packets : `stixcore.tmtc.packets.PacketSequence`
+        The packets
+
+    Returns
+    -------
+    `int`
+        How many times the decompression algorithm was called.
+    """
+    schemes = defaultdict(lambda: defaultdict(list))
+    skms = defaultdict(list)
+    for i, decompression_parameter in enumerate(packets.decompression_parameters):
+        for param_name, skm_names in (decompression_parameter or {}).items():
+            column = packets.parameters.get(param_name)
+            if column is None or column.default_attr != "value":
+                continue
+            skm = tuple(n if isinstance(n, int) else packets.parameters[n][i] for n in skm_names)
+            schemes[param_name][tuple(int(getattr(v, "value", v)) for v in skm)].append(i)
+            skms[param_name].append(skm)
+
+    c = 0
+    for param_name, groups in schemes.items():
+        column = packets.parameters[param_name]
+        if len(skms[param_name]) != len(column):
+            logger.warning(f"Not all packets define a compression scheme for {param_name} skip decompression")
+            continue
+
+        raw = column.columns["value"]
+        offsets = column.offsets["value"]
+        results = []
+        for (s, k, m), indices in groups.items():
+            indices = np.array(indices)
+            starts = offsets[indices]
+            counts = offsets[indices + 1] - starts
+            # positions of all values of the packets in the flat value column
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            results.append((positions, *lut_decompress(raw[positions], s=s, k=k, m=m)))
+            c += 1
+
+        decompressed = np.empty(len(raw), dtype=np.result_type(*[r[1] for r in results]))
+        error = np.empty(len(raw), dtype=np.float64)
+        for positions, values, variance in results:
+            decompressed[positions] = values
+            error[positions] = variance
+        column.set_decompressed(decompressed, error, skms[param_name])
+    return c
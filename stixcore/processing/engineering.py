@@ -1,8 +1,5 @@
 """Processing module for converting raw to engineering values."""
 
-import re
-from collections.abc import Iterable
-
 import numpy as np
 
 from astropy.table.table import QTable
@@ -37,33 +34,16 @@ def apply_raw_to_engineering(raw, args):
     param, idb = args
     en = None
     if param.PCF_CATEG == "S":
-        if isinstance(raw.value, Iterable):
-            if isinstance(raw.value, list):
-                raw.value = np.array(raw.value)
-
-            en = np.array([idb.textual_interpret(param.PCF_CURTX, val.item()) for val in np.ravel(raw.value)]).reshape(
-                raw.value.shape
-            )
-
-        else:
-            en = idb.textual_interpret(param.PCF_CURTX, raw.value)
+        if isinstance(raw.value, list):
+            raw.value = np.array(raw.value)
+        en = idb.get_calibrator(param)(raw.value)
     elif param.PCF_CATEG == "N":
-        prefix = re.split(r"\d+", param.PCF_CURTX)[0]
-        if prefix == "CIXP":
-            curve = idb.get_calibration_curve(param)
-            en = curve(raw.value)
-            if en is None:
-                logger.error(
-                    f"Failed curve calibrate {param.PCF_NAME} / \
-                               {param.PCF_CURTX} due to bad coefficients {curve}"
-                )
-        elif prefix == "CIX":
-            poly = idb.get_calibration_polynomial(param.PCF_CURTX)
-            en = poly(raw.value)
+        calibrator = idb.get_calibrator(param)
+        if calibrator is not None:
+            en = calibrator(raw.value)
             if en is None:
                 logger.error(
-                    f"Failed polynomial calibrate {param.PCF_NAME} / \
-                               {param.PCF_CURTX} due to bad coefficients {poly}"
+                    f"Failed calibrate {param.PCF_NAME} / {param.PCF_CURTX} due to bad coefficients {calibrator}"
                 )
     else:
         er = f"Unsupported calibration method: {param.PCF_CATEG} for " + f"{param.PCF_NAME} / {param.PCF_CURTX}"
@@ -29,7 +29,9 @@ from stixcore.io.soc.manager import SOCPacketFile
 from stixcore.processing.L0toL1 import Level1
 from stixcore.processing.L1toL2 import Level2
 from stixcore.processing.LBtoL0 import Level0
+from stixcore.processing.streaming import StreamingPipeline
 from stixcore.processing.TMTCtoLB import process_tmtc_to_levelbinary
+from stixcore.processing.workers import WorkerPool
 from stixcore.products import Product
 from stixcore.soop.manager import SOOPManager
 from stixcore.util.logging import STX_LOGGER_DATE_FORMAT, STX_LOGGER_FORMAT, get_logger
@@ -221,19 +223,20 @@ def process_tm(path, **args):
             importlib.reload(stixcore)
             logger.info(f"new common conf detected new version is: {stixcore.__version_conf__}")
 
+        # restart the workers if any of the above changed
+        WorkerPool.instance.refresh()
+
         lb_files = process_tmtc_to_levelbinary([SOCPacketFile(path)])
         logger.info(f"generated LB files: \n{pformat(lb_files)}")
 
         l0_proc = Level0(CONFIG.get("Paths", "tm_archive"), CONFIG.get("Paths", "fits_archive"))
-        l0_files = l0_proc.process_fits_files(files=lb_files)
-        logger.info(f"generated L0 files: \n{pformat(l0_files)}")
-
         l1_proc = Level1(CONFIG.get("Paths", "tm_archive"), CONFIG.get("Paths", "fits_archive"))
-        l1_files = l1_proc.process_fits_files(files=l0_files)
-        logger.info(f"generated L1 files: \n{pformat(l1_files)}")
-
         l2_proc = Level2(CONFIG.get("Paths", "tm_archive"), CONFIG.get("Paths", "fits_archive"))
-        l2_files = l2_proc.process_fits_files(files=l1_files)
+
+        # each created file is processed to the next level as soon as it is written
+        l0_files, l1_files, l2_files = StreamingPipeline(l0_proc, l1_proc, l2_proc).process(list(lb_files))
+        logger.info(f"generated L0 files: \n{pformat(l0_files)}")
+        logger.info(f"generated L1 files: \n{pformat(l1_files)}")
         logger.info(f"generated L2 files: \n{pformat(l2_files)}")
 
         error_report.log_result([list(lb_files), l0_files, l1_files, l2_files])
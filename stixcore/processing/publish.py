@@ -21,14 +21,16 @@ import astropy.units as u
 from astropy.io import ascii, fits
 from astropy.io.fits.diff import HDUDiff
 from astropy.table import Table
+from astropy.time import Time
 
 from stixcore.config.config import CONFIG
 from stixcore.ephemeris.manager import Spice, SpiceKernelManager
+from stixcore.io.product_processors.fits.processors import FitsL0Processor, FitsL1Processor
 from stixcore.io.RidLutManager import RidLutManager
 from stixcore.products.product import Product
 from stixcore.time.datetime import SCETime
 from stixcore.util.logging import get_logger
-from stixcore.util.util import get_complete_file_name, is_incomplete_file_name
+from stixcore.util.util import get_complete_file_name, get_journal_files, is_incomplete_file_name
 
 __all__ = ["PublishConflicts", "PublishHistoryStorage", "publish_fits_to_esa", "PublishHistoryStorage", "PublishResult"]
 
@@ -347,7 +349,10 @@ do not answer to this mail.
 
 
 def update_ephemeris_headers(fits_file, spice):
-    """Updates all SPICE related data in FITS header and data table.
+    """Updates all SPICE related data in the FITS header.
+
+    Only the primary header is read and updated, the data tables are not parsed. The times of the
+    observation are taken from the header (the product is only loaded for files without them).
 
     Parameters
     ----------
@@ -356,21 +361,24 @@ def update_ephemeris_headers(fits_file, spice):
     spice : SpiceKernelManager
         Spice kernel manager with loaded spice kernels.
     """
-    product = Product(fits_file)
-    if product.level in ["L1", "L2", "ANC"]:
-        ephemeris_headers = spice.get_fits_headers(
-            start_time=product.utc_timerange.start, average_time=product.utc_timerange.center
-        )
-        with fits.open(fits_file, "update") as f:
-            for hdu in f:
-                now = datetime.now().isoformat(timespec="milliseconds")
-                hdu.header["HISTORY"] = f"updated ephemeris header with latest kernel at {now}"
-                # rename the header filename to be complete
-                hdu.header["FILENAME"] = get_complete_file_name(hdu.header["FILENAME"])
-                hdu.header.update(ephemeris_headers)
-                # just update the first primary HDU
-                break
-        logger.info(f"updated ephemeris headers of {fits_file}")
+    with fits.open(fits_file, "update") as f:
+        header = f[0].header
+        if header.get("LEVEL") not in ["L1", "L2", "ANC"]:
+            return
+        if "DATE-BEG" in header and "DATE-AVG" in header:
+            start_time, average_time = Time(header["DATE-BEG"]), Time(header["DATE-AVG"])
+        else:
+            product = Product(fits_file)
+            start_time, average_time = product.utc_timerange.start, product.utc_timerange.center
+        ephemeris_headers = spice.get_fits_headers(start_time=start_time, average_time=average_time)
+
+        now = datetime.now().isoformat(timespec="milliseconds")
+        header["HISTORY"] = f"updated ephemeris header with latest kernel at {now}"
+        # rename the header filename to be complete
+        header["FILENAME"] = get_complete_file_name(header["FILENAME"])
+        # just update the first primary HDU
+        header.update(ephemeris_headers)
+    logger.info(f"updated ephemeris headers of {fits_file}")
 
 
 def add_BSD_comment(p):
@@ -765,12 +773,17 @@ def publish_fits_to_esa(args):
             if version not in include_versions:
                 continue
 
-        last_mod = c.stat().st_ctime
-
         # should the level by published
         if level not in include_levels:
             continue
 
+        # merge the journal of time appends into the daily file (the merge restarts the waiting time)
+        if level in ("l0", "l1") and get_journal_files(c):
+            processor = FitsL1Processor if level == "l1" else FitsL0Processor
+            processor(c.parent).compact_fits(c)
+
+        last_mod = c.stat().st_ctime
+
         wp_s = LL_wait_period_s if level.startswith("ll") else wait_period_s
 
         # is the waiting time after last modification done
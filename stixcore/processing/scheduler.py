@@ -0,0 +1,376 @@
+"""Cost based scheduling of the pipeline tasks onto the shared worker pool."""
+
+import os
+import json
+import time
+from pathlib import Path
+from collections import defaultdict
+
+from astropy.io import fits
+
+from stixcore.util.logging import get_logger
+
+__all__ = ["CostModel", "Task", "TaskScheduler", "UtilisationReport"]
+
+logger = get_logger(__name__)
+
+#: estimated size of a packet in a FITS file (bytes) if the packet count can not be read
+PACKET_SIZE_ESTIMATE = 1024
+
+
+def count_packets(file):
+    """Get the number of packets (rows of the control table) of a pipeline FITS file.
+
+    Only the header is read. Falls back to an estimate from the file size.
+
+    Parameters
+    ----------
+    file : `pathlib.Path`
+        the FITS file
+
+    Returns
+    -------
+    `int`
+        the number of packets
+    """
+    try:
+        return max(1, fits.getheader(file, "CONTROL")["NAXIS2"])
+    except (OSError, KeyError):
+        return max(1, os.path.getsize(file) // PACKET_SIZE_ESTIMATE)
+
+
+class CostModel:
+    """Estimate the processing time of files based on the packet count and the product type history.
+
+    The processing rate (seconds per packet) of each product type is learned from the previous runs
+    as a moving average. Unknown product types use the mean rate of all known types.
+
+    The history is kept in memory of the process only, unless a file is given to load it from and
+    `save` it to (shared by all pipeline runs).
+    """
+
+    def __init__(self, file=None, *, smoothing=0.5, default_rate=1.0):
+        """Create a new cost model.
+
+        Parameters
+        ----------
+        file : `str` or `pathlib.Path`, optional
+            JSON file of the rates, loaded if present
+        smoothing : `float`, optional
+            weight of the latest run in the moving average of the rates
+        default_rate : `float`, optional
+            the rate used if there is no history at all
+        """
+        self.file = Path(file) if file else None
+        self.smoothing = smoothing
+        self.default_rate = default_rate
+        self.rates = dict()
+        if self.file is not None and self.file.exists():
+            try:
+                rates = json.loads(self.file.read_text())
+                self.rates = {tuple(map(int, key.split("-"))): rate for key, rate in rates.items()}
+            except (OSError, ValueError):
+                logger.warning(f"Could not read the cost model history {self.file}", exc_info=True)
+
+    def rate(self, product_type):
+        """Get the processing rate of a product type.
+
+        Parameters
+        ----------
+        product_type : `tuple`
+            the product type e.g. (21, 6, 30)
+
+        Returns
+        -------
+        `float`
+            the estimated seconds per packet
+        """
+        if product_type in self.rates:
+            return self.rates[product_type]
+        if self.rates:
+            return sum(self.rates.values()) / len(self.rates)
+        return self.default_rate
+
+    def estimate(self, product_type, packets):
+        """Estimate the processing time of packets of the given product type.
+
+        Parameters
+        ----------
+        product_type : `tuple`
+            the product type
+        packets : `int`
+            number of packets
+
+        Returns
+        -------
+        `float`
+            the estimated cost
+        """
+        return self.rate(product_type) * packets
+
+    def update(self, product_type, packets, seconds):
+        """Update the history of a product type with a measured processing time.
+
+        Parameters
+        ----------
+        product_type : `tuple`
+            the product type
+        packets : `int`
+            number of processed packets
+        seconds : `float`
+            the measured processing time
+        """
+        if packets <= 0:
+            return
+        rate = seconds / packets
+        if product_type in self.rates:
+            rate = self.smoothing * rate + (1 - self.smoothing) * self.rates[product_type]
+        self.rates[product_type] = rate
+
+    def save(self):
+        """Write the rates to the file of the model (if any) for the next runs."""
+        if self.file is None:
+            return
+        rates = {"-".join(map(str, key)): rate for key, rate in self.rates.items()}
+        try:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.file.with_name(f".{self.file.name}.{os.getpid()}")
+            tmp.write_text(json.dumps(rates, indent=1))
+            # atomic: concurrent pipeline runs never read a partial file
+            os.replace(tmp, self.file)
+        except OSError:
+            logger.warning(f"Could not write the cost model history {self.file}", exc_info=True)
+
+
+class Task:
+    """A group of files processed in one job.
+
+    Attributes
+    ----------
+    product_type : `tuple`
+        the product type of all files
+    files : `list`
+        the files to process
+    packets : `int`
+        total number of packets of the files
+    cost : `float`
+        the estimated processing time
+    """
+
+    def __init__(self, product_type, files=None, packets=0, cost=0.0):
+        self.product_type = product_type
+        self.files = files if files is not None else []
+        self.packets = packets
+        self.cost = cost
+
+    def add(self, file, packets, cost):
+        self.files.append(file)
+        self.packets += packets
+        self.cost += cost
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.product_type}, files={len(self.files)}, cost={self.cost:.2f})"
+
+
+class UtilisationReport:
+    """Timing summary of all tasks of a scheduled run.
+
+    Attributes
+    ----------
+    workers : `int`
+        number of worker processes
+    wall_time : `float`
+        the time of the complete run
+    busy_time : `dict`
+        the time each worker process (by pid) spent processing tasks
+    task_times : `list`
+        the task with its measured processing time
+    """
+
+    def __init__(self, workers, wall_time, task_times):
+        self.workers = workers
+        self.wall_time = wall_time
+        self.task_times = task_times
+        self.busy_time = defaultdict(float)
+        for _, pid, seconds in task_times:
+            self.busy_time[pid] += seconds
+
+    @property
+    def utilisation(self):
+        """Share of the available worker time spent processing tasks."""
+        if self.wall_time <= 0 or self.workers <= 0:
+            return 0.0
+        return min(1.0, sum(self.busy_time.values()) / (self.wall_time * self.workers))
+
+    @property
+    def critical_task(self):
+        """The task with the longest processing time."""
+        return max(self.task_times, key=lambda t: t[2], default=(None, None, 0.0))
+
+    def __str__(self):
+        task, _, seconds = self.critical_task
+        return (
+            f"{len(self.task_times)} tasks on {self.workers} workers in {self.wall_time:.1f}s "
+            f"utilisation: {self.utilisation:.0%} longest task: {task} {seconds:.1f}s"
+        )
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, os.getpid(), time.perf_counter() - start
+
+
+class TaskScheduler:
+    """Split files into load balanced tasks and run them on a process pool.
+
+    The caller decides per product type if its files can be split: splittable files are divided
+    into tasks of about equal estimated cost, all other files are processed in a single task. L0
+    marks all product types as splittable and relies on the file lock of the FITS writer to
+    serialise tasks adding to the same (daily) file. The tasks are submitted longest first.
+    """
+
+    def __init__(self, cost_model, workers, *, oversubscription=2, max_files=None):
+        """Create a new scheduler.
+
+        Parameters
+        ----------
+        cost_model : `CostModel`
+            the cost model to estimate the tasks and to record the measured times
+        workers : `int`
+            number of worker processes
+        oversubscription : `int`, optional
+            number of tasks per worker the splittable files are divided into
+        max_files : `int`, optional
+            maximum number of files per splittable task
+        """
+        self.cost_model = cost_model
+        self.workers = workers
+        self.oversubscription = oversubscription
+        self.max_files = max_files
+        self._start = time.perf_counter()
+        self._task_times = []
+
+    def plan(self, groups):
+        """Split groups of files into balanced tasks.
+
+        Parameters
+        ----------
+        groups : `dict`
+            product type -> (list of files, `bool` if the files can be processed in separate tasks)
+
+        Returns
+        -------
+        `list` of `Task`
+            the tasks ordered by estimated cost (longest first)
+        """
+        estimates = dict()
+        for product_type, (files, _) in groups.items():
+            estimates[product_type] = []
+            for file in files:
+                packets = count_packets(file)
+                estimates[product_type].append((file, packets, self.cost_model.estimate(product_type, packets)))
+
+        total = sum(cost for files in estimates.values() for *_, cost in files)
+        target = total / max(1, self.workers * self.oversubscription)
+
+        tasks = []
+        for product_type, (_, splittable) in groups.items():
+            task = Task(product_type)
+            for file, packets, cost in estimates[product_type]:
+                full = task.files and (task.cost + cost > target or len(task.files) == self.max_files)
+                if splittable and full:
+                    tasks.append(task)
+                    task = Task(product_type)
+                task.add(file, packets, cost)
+            if task.files:
+                tasks.append(task)
+
+        return sorted(tasks, key=lambda t: t.cost, reverse=True)
+
+    def submit(self, executor, fn, tasks, **kwargs):
+        """Submit all tasks to the executor and start the timing of a new run.
+
+        Parameters
+        ----------
+        executor : `concurrent.futures.Executor`
+            the executor
+        fn : callable
+            called with ``fn(task.files, task.product_type, **kwargs)`` for each task
+        tasks : `list` of `Task`
+            the tasks
+
+        Returns
+        -------
+        `list` of `tuple` (`Task`, `concurrent.futures.Future`)
+            the submitted timed jobs, see `complete`
+        """
+        self._start = time.perf_counter()
+        self._task_times = []
+        return [(task, executor.submit(_timed, fn, task.files, task.product_type, **kwargs)) for task in tasks]
+
+    def complete(self, task, job):
+        """Get the result of a submitted task and record its processing time.
+
+        Parameters
+        ----------
+        task : `Task`
+            the task
+        job : `concurrent.futures.Future`
+            the timed job of the task
+
+        Returns
+        -------
+        the result of ``fn`` for the task, the exception of ``fn`` is raised
+        """
+        result, pid, seconds = job.result()
+        self.cost_model.update(task.product_type, task.packets, seconds)
+        self._task_times.append((task, pid, seconds))
+        return result
+
+    def report(self):
+        """Create and log the utilisation report of the tasks completed since the last `submit`.
+
+        Returns
+        -------
+        `UtilisationReport`
+            the report
+        """
+        report = UtilisationReport(self.workers, time.perf_counter() - self._start, self._task_times)
+        logger.info(f"Scheduled run: {report}")
+        return report
+
+    def run(self, executor, fn, tasks, **kwargs):
+        """Process all tasks on the executor and update the cost model with the measured times.
+
+        Parameters
+        ----------
+        executor : `concurrent.futures.Executor`
+            the executor
+        fn : callable
+            called with ``fn(task.files, task.product_type, **kwargs)`` for each task
+        tasks : `list` of `Task`
+            the tasks
+
+        Returns
+        -------
+        `tuple` (`list`, `UtilisationReport`)
+            the jobs with the results of ``fn`` for each task and the utilisation report of the run
+        """
+        jobs = self.submit(executor, fn, tasks, **kwargs)
+        for task, job in jobs:
+            try:
+                self.complete(task, job)
+            except Exception:
+                continue
+        return [_TaskResult(job) for _, job in jobs], self.report()
+
+
+class _TaskResult:
+    """The result of ``fn`` of a finished timed job."""
+
+    def __init__(self, job):
+        self._job = job
+
+    def result(self):
+        return self._job.result()[0]
@@ -0,0 +1,157 @@
+"""Dependency driven processing of LB files through the levels L0, L1 and L2.
+
+Instead of waiting for all jobs of a level to finish before the next level starts, each finished
+job immediately triggers the jobs of the next level for the files it created.
+"""
+
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from stixcore.config.config import CONFIG
+from stixcore.io.product_processors.fits.processors import FitsL1Processor, FitsL2Processor
+from stixcore.processing import L0toL1, L1toL2, LBtoL0
+from stixcore.processing.workers import WorkerPool
+from stixcore.util.logging import get_logger
+
+__all__ = ["StreamingPipeline"]
+
+logger = get_logger(__name__)
+
+
+class StreamingPipeline:
+    """Process LB files to L0, L1 and L2 with jobs per product type as soon as their input is ready.
+
+    The L0 files of all product types are split into balanced jobs (see `LBtoL0.Level0.plan`),
+    jobs adding to the same daily file are serialised by the file lock of the FITS writer. In L1
+    and L2 at most one job per daily product type is running at a time, files created meanwhile
+    are queued and processed in a single follow up job. Science products are written to separate
+    files and are submitted immediately (in batches of the configured size).
+
+    Attributes
+    ----------
+    provenance : `dict`
+        each created file mapped to the set of input files of the job that created it
+    """
+
+    def __init__(self, l0_proc, l1_proc, l2_proc):
+        """Create a new streaming pipeline.
+
+        Parameters
+        ----------
+        l0_proc : `stixcore.processing.LBtoL0.Level0`
+            the LB to L0 processing step
+        l1_proc : `stixcore.processing.L0toL1.Level1`
+            the L0 to L1 processing step
+        l2_proc : `stixcore.processing.L1toL2.Level2`
+            the L1 to L2 processing step
+        """
+        self.l0_proc = l0_proc
+        self.l1_proc = l1_proc
+        self.l2_proc = l2_proc
+        self.provenance = defaultdict(set)
+        self._levels = {
+            "L1": (
+                l1_proc.product_type,
+                L0toL1.process_type,
+                lambda: FitsL1Processor(l1_proc.output_dir),
+                CONFIG.getint("Pipeline", "parallel_batchsize_L1", fallback=150),
+            ),
+            "L2": (
+                l2_proc.product_type,
+                L1toL2.process_type,
+                lambda: FitsL2Processor(l2_proc.output_dir),
+                CONFIG.getint("Pipeline", "parallel_batchsize_L2", fallback=100),
+            ),
+        }
+        self._next_level = {"L0": "L1", "L1": "L2", "L2": None}
+
+    def process(self, files):
+        """Process LB files through all levels.
+
+        Parameters
+        ----------
+        files : `list` of `pathlib.Path`
+            the LB files
+
+        Returns
+        -------
+        `tuple` (`list`, `list`, `list`)
+            all created L0, L1 and L2 files
+        """
+        with WorkerPool.instance.lease() as executor:
+            return self._process(executor, files)
+
+    def _process(self, executor, files):
+        self.provenance = defaultdict(set)
+        created = {level: set() for level in self._next_level}
+        queued = defaultdict(dict)
+        running = set()
+        pending = dict()
+
+        def submit(level, key, files):
+            _, process_type, processor, _ = self._levels[level]
+            job = executor.submit(process_type, files, processor=processor())
+            pending[job] = (level, key, files, None)
+            if key is not None:
+                running.add((level, key))
+
+        def flush(level, key):
+            if (level, key) in running or not queued[level].get(key):
+                return
+            submit(level, key, list(queued[level].pop(key)))
+
+        def route(level, new_files):
+            if level is None:
+                return
+            product_type, _, _, batch_size = self._levels[level]
+            sci_files = defaultdict(list)
+            for file in new_files:
+                key, sci = product_type(file)
+                if sci:
+                    sci_files[key].append(file)
+                else:
+                    queued[level].setdefault(key, dict())[file] = None
+            # separate output files: all batches can be processed concurrently
+            for files in sci_files.values():
+                for i in range(0, len(files), batch_size):
+                    submit(level, None, files[i : i + batch_size])
+            for key in list(queued[level]):
+                flush(level, key)
+
+        scheduler, tasks = self.l0_proc.plan(files)
+        for task, job in scheduler.submit(executor, LBtoL0.process_tm_type, tasks, processor=self.l0_proc.processor):
+            pending[job] = ("L0", task.product_type, task.files, task)
+        l0_jobs = len(tasks)
+        if l0_jobs == 0:
+            self.l0_proc.report = scheduler.report()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for job in done:
+                level, key, inputs, task = pending.pop(job)
+                running.discard((level, key))
+                try:
+                    new_files = scheduler.complete(task, job) if task is not None else job.result()
+                except Exception as e:
+                    logger.error("Error processing %s files of %s", level, key, exc_info=True)
+                    if CONFIG.getboolean("Logging", "stop_on_error", fallback=False):
+                        for other in pending:
+                            other.cancel()
+                        raise e
+                    new_files = []
+
+                if level == "L0":
+                    l0_jobs -= 1
+                    # the L0 report does not include the time of the following L1 and L2 jobs
+                    if l0_jobs == 0:
+                        self.l0_proc.report = scheduler.report()
+                        scheduler.cost_model.save()
+
+                for file in new_files:
+                    self.provenance[file].update(inputs)
+                created[level].update(new_files)
+                route(self._next_level[level], new_files)
+                if level != "L0":
+                    flush(level, key)
+
+        return list(created["L0"]), list(created["L1"]), list(created["L2"])
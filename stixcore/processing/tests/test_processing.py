@@ -1,13 +1,19 @@
 import io
+import os
 import re
 import glob
 import smtplib
+import threading
+from types import SimpleNamespace
 from pathlib import Path
 from binascii import unhexlify
 from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
+from stixpy.calibration.compression import CompressionRangeError
+from stixpy.calibration.compression import decompress as algo_decompress
 
 from astropy.io import fits
 from astropy.io.fits.diff import FITSDiff
@@ -18,15 +24,21 @@ from stixcore.ephemeris.manager import Spice, SpiceKernelManager
 from stixcore.idb.idb import IDBPolynomialCalibration
 from stixcore.idb.manager import IDBManager
 from stixcore.io.soc.manager import SOCManager, SOCPacketFile
+from stixcore.processing.decompression import decompress_sequence, lut_decompress
 from stixcore.processing.L0toL1 import Level1
 from stixcore.processing.L1toL2 import Level2
 from stixcore.processing.LBtoL0 import Level0
 from stixcore.processing.pipeline import PipelineStatus, process_tm
+from stixcore.processing.scheduler import CostModel, Task, TaskScheduler
+from stixcore.processing.streaming import StreamingPipeline
 from stixcore.processing.TMTCtoLB import process_tmtc_to_levelbinary
+from stixcore.processing.workers import SingletonState, WorkerPool
 from stixcore.products.level0.quicklookL0 import LightCurve
 from stixcore.products.product import Product
 from stixcore.soop.manager import SOOPManager
-from stixcore.tmtc.packets import GenericTMPacket
+from stixcore.tmtc.packets import GenericTMPacket, PacketSequence
+from stixcore.tmtc.parameter import Parameter
+from stixcore.tmtc.parser import PacketData
 from stixcore.util.logging import get_logger
 
 logger = get_logger(__name__)
@@ -260,6 +272,21 @@ def test_single_vs_batch(out_dir):
         CONFIG.set("Logging", "stop_on_error", str(CONTINUE_ON_ERROR))
 
 
+def test_tmtc_to_levelbinary_chunked(out_dir):
+    tm_files = [SOCPacketFile(f) for f in test_data.tmtc.XML_TM]
+
+    lb_files_w = process_tmtc_to_levelbinary(tm_files, archive_path=out_dir / "whole", chunk_size=10**9)
+    lb_files_c = process_tmtc_to_levelbinary(tm_files, archive_path=out_dir / "chunked", chunk_size=7, max_files=2)
+
+    files_w = sorted(lb_files_w, key=lambda f: f.name)
+    files_c = sorted(lb_files_c, key=lambda f: f.name)
+
+    assert len(files_w) == len(files_c) > 0
+    for f_w, f_c in zip(files_w, files_c):
+        diff = FITSDiff(f_w, f_c, ignore_keywords=["CHECKSUM", "DATASUM", "DATE", "VERS_SW", "VERS_CFG"])
+        assert diff.identical
+
+
 def test_pipeline_logging(spicekernelmanager, out_dir):
     CONTINUE_ON_ERROR = CONFIG.getboolean("Logging", "stop_on_error", fallback=False)
     FITS_ARCHIVE = CONFIG.get("Paths", "fits_archive")
@@ -351,3 +378,198 @@ if __name__ == "__main__":
     res = l2.process_fits_files(files=l1)
 
     print("DONE")
+
+
+@pytest.mark.parametrize("skm", [(0, 5, 3), (1, 3, 4), (0, 4, 4), (1, 4, 3)])
+def test_lut_decompress(skm):
+    s, k, m = skm
+    values = np.random.default_rng(0).integers(0, 256 if s == 0 else 128, size=100)
+    for raw in [values, values[:1], int(values[0]), np.append(values, 200)]:
+        decompressed, variance = lut_decompress(raw, s=s, k=k, m=m)
+        expected, expected_variance = algo_decompress(raw, s=s, k=k, m=m, return_variance=True)
+        assert decompressed.dtype == expected.dtype
+        assert np.array_equal(decompressed, expected)
+        assert np.array_equal(variance, expected_variance)
+
+    with pytest.raises(CompressionRangeError):
+        lut_decompress([256], s=s, k=k, m=m)
+
+
+def test_decompress_sequence():
+    def packet(i, s, counts):
+        data = PacketData()
+        data.NIXD0007 = Parameter("NIXD0007", s, None)
+        data.NIX00260 = Parameter("NIX00260", counts, None)
+        return SimpleNamespace(
+            data=data,
+            spid=1,
+            pi1_val=20,
+            source_packet_header=SimpleNamespace(),
+            data_header=SimpleNamespace(scet_coarse=i, scet_fine=0),
+            get_decompression_parameter=lambda: {"NIX00260": ("NIXD0007", 4, 3)},
+        )
+
+    raw = [[100, 200, 50], [100], [255, 7]]
+    packets = PacketSequence([packet(0, 0, raw[0]), packet(1, 1, raw[1]), packet(2, 0, raw[2])])
+    # one call per compression scheme
+    assert decompress_sequence(packets) == 2
+
+    expected = [algo_decompress(r, s=s, k=4, m=3, return_variance=True) for r, s in zip(raw, [0, 1, 0])]
+    assert np.array_equal(packets.get_value("NIX00260"), np.hstack([e[0] for e in expected]))
+    assert np.array_equal(packets.get_value("NIX00260", attr="error"), np.hstack([e[1] for e in expected]))
+    assert packets.get_value("NIX00260", attr="value").tolist() == [100, 200, 50, 100, 255, 7]
+    assert packets.get("NIX00260")[2].decompressed.tolist() == expected[2][0].tolist()
+    assert [skm[0].value for skm in (p.skm for p in packets.get("NIX00260"))] == [0, 1, 0]
+    # already decompressed
+    assert decompress_sequence(packets) == 0
+
+
+def test_worker_pool(tmp_path):
+    rid_lut_file = tmp_path / "rid_lut.csv"
+    state = SingletonState(
+        spice_kernel_path=None, idbm=None, soopmanager=None, rid_lut_file=rid_lut_file, config={"Pipeline": {"a": "1"}}
+    )
+    same = SingletonState(
+        spice_kernel_path=None, idbm=None, soopmanager=None, rid_lut_file=rid_lut_file, config={"Pipeline": {"a": "1"}}
+    )
+    assert state.fingerprint == same.fingerprint
+    changed = SingletonState(
+        spice_kernel_path=None, idbm=None, soopmanager=None, rid_lut_file=rid_lut_file, config={"Pipeline": {"a": "2"}}
+    )
+    assert state.fingerprint != changed.fingerprint
+
+    pool = WorkerPool(max_workers=1)
+    with patch.object(SingletonState, "current", side_effect=[state, same, changed]) as current:
+        executor = pool.executor
+        pid = executor.submit(os.getpid).result()
+        # the singletons are only checked on refresh
+        assert pool.executor is executor
+        assert pool.submit(os.getpid).result() == pid
+        assert current.call_count == 1
+        # unchanged singletons reuse the running workers
+        pool.refresh()
+        assert pool.executor is executor
+
+        with pool.lease() as leased:
+            # changed singletons restart the workers but leased executors stay alive until released
+            pool.refresh()
+            assert pool.executor is not executor
+            assert leased.submit(os.getpid).result() == pid
+        with pytest.raises(RuntimeError):
+            executor.submit(os.getpid)
+    pool.shutdown()
+
+    # a new RID LUT file changes the state as well
+    rid_lut_file.write_text("")
+    assert state.fingerprint != state._fingerprint()
+
+
+def test_task_scheduler(tmp_path):
+    def files(name, sizes):
+        paths = []
+        for i, size in enumerate(sizes):
+            path = tmp_path / f"{name}_{i}.fits"
+            path.write_bytes(b"0" * size * 1024)
+            paths.append(path)
+        return paths
+
+    cost_model = CostModel()
+    cost_model.update((3, 25, 1), 10, 10.0)
+    cost_model.update((21, 6, 24), 10, 20.0)
+    assert cost_model.rate((21, 6, 24)) == 2.0
+    # unknown types use the mean rate
+    assert cost_model.rate((21, 6, 30)) == 1.5
+
+    groups = {
+        (3, 25, 1): (files("hk", [10, 10, 10, 10]), False),
+        (21, 6, 24): (files("sci", [10] * 10), True),
+    }
+    scheduler = TaskScheduler(cost_model, 4, max_files=3)
+    tasks = scheduler.plan(groups)
+
+    # files which are not splittable stay together
+    hk = [t for t in tasks if t.product_type == (3, 25, 1)]
+    assert len(hk) == 1
+    assert len(hk[0].files) == 4
+    sci = [t for t in tasks if t.product_type == (21, 6, 24)]
+    assert sum(len(t.files) for t in sci) == 10
+    assert all(len(t.files) <= 3 for t in sci)
+    assert [t.cost for t in tasks] == sorted((t.cost for t in tasks), reverse=True)
+
+    jobs, report = scheduler.run(ThreadPoolExecutor(4), lambda files, product_type: len(files), tasks)
+    assert [job.result() for job in jobs] == [len(t.files) for t in tasks]
+    assert len(report.task_times) == len(tasks)
+    assert 0 <= report.utilisation <= 1
+
+    # L0 splits daily files as well: the writer locks the daily file
+    groups[(3, 25, 1)] = (groups[(3, 25, 1)][0], True)
+    hk = [t for t in scheduler.plan(groups) if t.product_type == (3, 25, 1)]
+    assert len(hk) > 1
+    assert sorted(f for t in hk for f in t.files) == groups[(3, 25, 1)][0]
+    assert all(len(t.files) <= 3 for t in hk)
+
+    lb_files = [
+        tmp_path / "solo_LB_stix-3-25-1_0000000000-0000086400_V02.fits",
+        tmp_path / "solo_LB_stix-21-6-24_0000000000-0000086400_V02.fits",
+    ]
+    for file in lb_files:
+        file.write_bytes(b"0" * 1024)
+    with patch.object(TaskScheduler, "plan", side_effect=lambda groups: groups) as plan:
+        _, l0_groups = Level0(tmp_path, tmp_path).plan(lb_files)
+    plan.assert_called_once()
+    assert all(splittable for _, splittable in l0_groups.values())
+
+
+def test_cost_model_file(tmp_path):
+    file = tmp_path / "cost" / "cost_model.json"
+    cost_model = CostModel(file)
+    assert cost_model.rates == {}
+    cost_model.update((21, 6, 24), 10, 20.0)
+    cost_model.save()
+
+    # later processes continue with the history
+    assert CostModel(file).rates == {(21, 6, 24): 2.0}
+    # without a file the history is per process only
+    CostModel().save()
+    assert list(file.parent.iterdir()) == [file]
+
+
+def test_streaming_pipeline(tmp_path):
+    lb_files = [tmp_path / f"lb_{i}.fits" for i in range(4)]
+    tasks = [Task((3, 25, 1), lb_files[:2]), Task((21, 6, 24), lb_files[2:3]), Task((21, 6, 24), lb_files[3:])]
+    scheduler = TaskScheduler(CostModel(), 2)
+    l0_proc = SimpleNamespace(plan=lambda files: (scheduler, tasks), processor=None, report=None)
+    # lb_3 is science data all other daily data
+    l1_proc = SimpleNamespace(product_type=lambda f: ((f.stem,), f.stem == "lb_3"), output_dir=tmp_path)
+    l2_proc = SimpleNamespace(product_type=lambda f: ((f.stem,), f.stem == "lb_3"), output_dir=tmp_path)
+
+    def process(suffix):
+        return lambda files, *args, processor: [f.with_suffix(suffix) for f in files]
+
+    reported = threading.Event()
+
+    def report():
+        reported.set()
+        return TaskScheduler.report(scheduler)
+
+    def process_l1(files, *args, processor):
+        # the L0 report is taken with the last L0 job and not after all L1 and L2 jobs
+        assert reported.wait(timeout=10)
+        return process(".l1")(files, processor=processor)
+
+    with (
+        patch.object(scheduler, "report", report),
+        patch("stixcore.processing.LBtoL0.process_tm_type", process(".l0")),
+        patch("stixcore.processing.L0toL1.process_type", process_l1),
+        patch("stixcore.processing.L1toL2.process_type", process(".l2")),
+        patch.object(WorkerPool, "executor", ThreadPoolExecutor(2)),
+    ):
+        pipeline = StreamingPipeline(l0_proc, l1_proc, l2_proc)
+        l0_files, l1_files, l2_files = pipeline.process(lb_files)
+
+    assert sorted(l0_files) == [f.with_suffix(".l0") for f in lb_files]
+    assert sorted(l1_files) == [f.with_suffix(".l1") for f in lb_files]
+    assert sorted(l2_files) == [f.with_suffix(".l2") for f in lb_files]
+    assert pipeline.provenance[lb_files[0].with_suffix(".l0")] == set(lb_files[:2])
+    assert pipeline.provenance[lb_files[3].with_suffix(".l2")] == {lb_files[3].with_suffix(".l1")}
+    assert len(l0_proc.report.task_times) == 3
@@ -0,0 +1,236 @@
+"""Long lived worker processes shared by all pipeline levels.
+
+The workers load the process wide singletons (SPICE kernels, IDB, SOOP and RID LUT manager and the
+configuration) once when started. The pool is restarted only if one of them changed since the
+workers were started (based on a fingerprint of the singletons checked once per pipeline run).
+"""
+
+import os
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from stixcore.config.config import CONFIG
+from stixcore.ephemeris.manager import Spice
+from stixcore.idb.manager import IDBManager
+from stixcore.io.RidLutManager import RidLutManager
+from stixcore.soop.manager import SOOPManager
+from stixcore.util.logging import get_logger
+from stixcore.util.singleton import Singleton
+
+__all__ = ["SingletonState", "WorkerPool"]
+
+logger = get_logger(__name__)
+
+
+def _get_instance(cls):
+    try:
+        return cls.instance
+    except ValueError:
+        return None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+class SingletonState:
+    """A snapshot of the process wide singletons required by the pipeline workers.
+
+    Attributes
+    ----------
+    spice_kernel_path : `list` or `None`
+        the meta kernels of `Spice.instance`
+    idbm : `stixcore.idb.manager.IDBManager` or `None`
+        the IDB manager
+    soopmanager : `stixcore.soop.manager.SOOPManager` or `None`
+        the SOOP manager
+    rid_lut_file : `pathlib.Path`
+        the RID LUT file the `RidLutManager` is read from
+    config : `dict`
+        the pipeline configuration by section
+    """
+
+    def __init__(self, *, spice_kernel_path, idbm, soopmanager, rid_lut_file, config):
+        self.spice_kernel_path = spice_kernel_path
+        self.idbm = idbm
+        self.soopmanager = soopmanager
+        self.rid_lut_file = rid_lut_file
+        self.config = config
+        self.fingerprint = self._fingerprint()
+
+    @classmethod
+    def current(cls):
+        """Capture the singletons of the current process.
+
+        Returns
+        -------
+        `SingletonState`
+            the current state
+        """
+        spice = _get_instance(Spice)
+        return cls(
+            spice_kernel_path=spice.meta_kernel_path if spice else None,
+            idbm=_get_instance(IDBManager),
+            soopmanager=_get_instance(SOOPManager),
+            rid_lut_file=Path(CONFIG.get("Publish", "rid_lut_file")),
+            config={section: dict(CONFIG.items(section, raw=True)) for section in CONFIG.sections()},
+        )
+
+    def _fingerprint(self):
+        spice = None
+        if self.spice_kernel_path is not None:
+            spice = tuple(
+                (str(mk), str(mk_type), str(mk_date), _mtime(mk)) for mk, mk_type, mk_date in self.spice_kernel_path
+            )
+
+        idb = None
+        if self.idbm is not None:
+            versions = tuple(
+                sorted((v["label"], _mtime(Path(v["path"]) / "idb.sqlite")) for v in self.idbm.get_versions())
+            )
+            idb = (str(self.idbm.data_root), str(self.idbm.force_version), versions)
+
+        soop = None
+        if self.soopmanager is not None:
+            soop = (str(self.soopmanager.data_root), self.soopmanager.filecounter)
+
+        config = tuple(sorted((s, tuple(sorted(items.items()))) for s, items in self.config.items()))
+        return spice, idb, soop, (str(self.rid_lut_file), _mtime(self.rid_lut_file)), config
+
+    def install(self):
+        """Set the singletons of the current (worker) process from this state."""
+        CONFIG.read_dict(self.config)
+        if self.spice_kernel_path is not None:
+            Spice.instance = Spice(self.spice_kernel_path)
+        if self.idbm is not None:
+            IDBManager.instance = self.idbm
+        if self.soopmanager is not None:
+            SOOPManager.instance = self.soopmanager
+        if self.rid_lut_file.exists():
+            RidLutManager.instance = RidLutManager(self.rid_lut_file, update=False)
+
+
+def _init_worker(state):
+    state.install()
+    logger.info(f"Worker process {os.getpid()} initialized")
+
+
+class WorkerPool(metaclass=Singleton):
+    """A process pool with persistent singletons shared across all pipeline levels.
+
+    The worker processes load the singletons once on start. `refresh` (called once per pipeline
+    run) checks if the singletons of the main process changed (e.g. new SPICE kernels, IDB
+    versions, RID LUT or SOOP files) and if so new workers are started for the next request.
+    Executors still leased by a running step are shut down once the last lease is released.
+    """
+
+    def __init__(self, max_workers=None):
+        """Create the (lazy) worker pool.
+
+        Parameters
+        ----------
+        max_workers : `int`, optional
+            the number of worker processes, by default the number of CPUs
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._state = None
+        self._leases = dict()
+        self._retired = set()
+        self._lock = threading.RLock()
+
+    @property
+    def workers(self):
+        """The number of worker processes of the pool."""
+        return self.max_workers or os.cpu_count() or 1
+
+    def refresh(self):
+        """Capture the current singletons and restart the workers on the next request if changed."""
+        state = SingletonState.current()
+        with self._lock:
+            if self._executor is not None and state.fingerprint != self._state.fingerprint:
+                logger.info("Singletons changed: restarting the worker pool")
+                self._retire(self._executor)
+                self._executor = None
+            self._state = state
+
+    @property
+    def executor(self):
+        """Get the executor with workers set up for the singletons of the last `refresh`.
+
+        Use `lease` to hold on to the executor for longer than a single submit.
+
+        Returns
+        -------
+        `concurrent.futures.ProcessPoolExecutor`
+            the shared executor
+        """
+        with self._lock:
+            if self._executor is None:
+                if self._state is None:
+                    self._state = SingletonState.current()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=_init_worker, initargs=(self._state,)
+                )
+            return self._executor
+
+    @contextmanager
+    def lease(self):
+        """Hold the current executor, it is not shut down by a `refresh` before released.
+
+        Yields
+        ------
+        `concurrent.futures.ProcessPoolExecutor`
+            the shared executor
+        """
+        with self._lock:
+            executor = self.executor
+            self._leases[executor] = self._leases.get(executor, 0) + 1
+        try:
+            yield executor
+        finally:
+            with self._lock:
+                self._leases[executor] -= 1
+                if self._leases[executor] == 0:
+                    del self._leases[executor]
+                    if executor in self._retired:
+                        self._retired.discard(executor)
+                        # submitted tasks still complete
+                        executor.shutdown(wait=False)
+
+    def _retire(self, executor):
+        if executor in self._leases:
+            self._retired.add(executor)
+        else:
+            executor.shutdown(wait=False)
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Schedule a task in the shared pool.
+
+        Returns
+        -------
+        `concurrent.futures.Future`
+            the future of the task
+        """
+        with self.lease() as executor:
+            return executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """Stop all worker processes, the pool is restarted on the next request."""
+        with self._lock:
+            executors = list(self._retired) + ([self._executor] if self._executor is not None else [])
+            self._executor = None
+            self._state = None
+            self._retired = set()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+
+# empty: one worker per CPU
+_max_workers = CONFIG.get("Pipeline", "parallel_max_workers", fallback="").strip()
+WorkerPool.instance = WorkerPool(max_workers=int(_max_workers) if _max_workers else None)
@@ -174,7 +174,6 @@ class AspectIDLProcessing(SSWIDLTask):
                 data = QTable()
 
                 idldata = result.data[result.data["parentfits"] == file_idx]
-                n = len(idldata)
 
                 data["time"] = SCETime(coarse=idldata["scet_time_c"], fine=idldata["scet_time_f"])
                 # data['timedel'] = SCETimeDelta.from_float(idldata["duration"] * u.s)
@@ -190,18 +189,16 @@ class AspectIDLProcessing(SSWIDLTask):
                 data["sas_ok"].description = "0: not usable, 1: good"
                 data["sas_error"] = [e.decode() if hasattr(e, "decode") else e for e in idldata["error"]]
 
-                data["solo_loc_carrington_lonlat"] = np.tile(np.array([0.0, 0.0]), (n, 1)).astype(np.float32) * u.deg
-                data["solo_loc_carrington_dist"] = np.tile(np.array([0.0]), (n, 1)).astype(np.float32) * u.km
-                data["solo_loc_heeq_zxy"] = np.tile(np.array([0.0, 0.0, 0.0]), (n, 1)).astype(np.float32) * u.km
-                data["roll_angle_rpy"] = np.tile(np.array([0.0, 0.0, 0.0]), (n, 1)).astype(np.float32) * u.deg
-
-                for idx, d in enumerate(data["time"]):
-                    orient, dist, car, heeq = Spice.instance.get_auxiliary_positional_data(date=d)
-
-                    data[idx]["solo_loc_carrington_lonlat"] = car.to("deg").astype(np.float32)
-                    data[idx]["solo_loc_carrington_dist"] = dist.to("km").astype(np.float32)
-                    data[idx]["solo_loc_heeq_zxy"] = heeq.to("km").astype(np.float32)
-                    data[idx]["roll_angle_rpy"] = orient.to("deg").astype(np.float32)
+                # all samples at once: interpolated on a per day grid, exact where not precise enough
+                aux_data, aux_errors = Spice.instance.sample_auxiliary_positional_data(data["time"])
+                for name, unit in [
+                    ("solo_loc_carrington_lonlat", "deg"),
+                    ("solo_loc_carrington_dist", "km"),
+                    ("solo_loc_heeq_zxy", "km"),
+                    ("roll_angle_rpy", "deg"),
+                ]:
+                    data[name] = aux_data[name].to(unit).astype(np.float32)
+                    logger.debug(f"Max interpolation error of {name}: {aux_errors[name]}")
 
                 control["parent"] = get_complete_file_name(file_path.name)
 
@@ -1,7 +1,12 @@
+import os
 import re
+import signal
+import threading
 import subprocess
 from pathlib import Path
+from contextlib import ExitStack
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -25,6 +30,89 @@ __all__ = [
 logger = get_logger(__name__)
 
 
+def _kill_process_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class _ProcessGroups:
+    """The process groups of running ECC scripts which can all be killed at once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pids = set()
+        self.killed = False
+
+    def add(self, pid):
+        """Register a started script, it is killed immediately if `kill` was called before."""
+        with self._lock:
+            self._pids.add(pid)
+            if self.killed:
+                _kill_process_group(pid)
+
+    def discard(self, pid):
+        with self._lock:
+            self._pids.discard(pid)
+
+    def kill(self):
+        """Kill all running and all later started scripts."""
+        with self._lock:
+            self.killed = True
+            for pid in self._pids:
+                _kill_process_group(pid)
+
+
+def _run_ecc_script(bash_script, *, timeout=None, groups=None):
+    """Run the ECC bash script in its own process group.
+
+    Parameters
+    ----------
+    bash_script : `str`
+        the script
+    timeout : `float`, optional
+        seconds after which the script and all its child processes are killed
+    groups : `_ProcessGroups`, optional
+        registry of the running scripts to kill the script (and its child processes) early
+
+    Returns
+    -------
+    `str`
+        the output of the script
+
+    Raises
+    ------
+    RuntimeError
+        if the script failed, timed out or was killed
+    """
+    with subprocess.Popen(
+        ["bash"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    ) as process:
+        if groups is not None:
+            groups.add(process.pid)
+        try:
+            stdout, stderr = process.communicate(bash_script, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # the ECC binaries are children of bash
+            _kill_process_group(process.pid)
+            process.communicate()
+            raise RuntimeError(f"ECC Bash script timed out after {timeout}s")
+        finally:
+            if groups is not None:
+                groups.discard(process.pid)
+    if groups is not None and groups.killed:
+        raise RuntimeError("ECC Bash script killed")
+    if process.returncode != 0:
+        raise RuntimeError(f"ECC Bash script failed: {stderr}")
+    return stdout
+
+
 class EnergyCalibration(GenericProduct, EnergyChannelsMixin, L2Mixin):
     """Quick Look energy calibration data product.
 
@@ -120,6 +208,40 @@ class EnergyCalibration(GenericProduct, EnergyChannelsMixin, L2Mixin):
                 f"ELUT change within energy calibration data time range: {ob_elut.file} to {ob_elut_end.file}"
             )
 
+        max_runs = CONFIG.getint("ECC", "parallel_runs", fallback=4)
+        timeout = CONFIG.getfloat("ECC", "run_timeout", fallback=3600)
+
+        groups = _ProcessGroups()
+        # the contexts are removed after all ECC runs finished (executor exits first)
+        with ExitStack() as contexts, ThreadPoolExecutor(max_workers=max_runs) as executor:
+            try:
+                jobs = cls._submit_ecc_runs(
+                    l1product, l2, ob_elut, ecc_manager, contexts, executor, timeout=timeout, groups=groups
+                )
+                # collect the results in order of the spectra
+                for job in jobs:
+                    products.append(job.result())
+            except BaseException:
+                # do not wait for the runs in flight up to the timeout
+                executor.shutdown(wait=False, cancel_futures=True)
+                groups.kill()
+                raise
+
+        return products
+
+    @classmethod
+    def _submit_ecc_runs(cls, l1product, l2, ob_elut, ecc_manager, contexts, executor, *, timeout, groups):
+        """Write the ECC input of each calibration spectrum into its own context and submit the ECC run.
+
+        Returns
+        -------
+        `list` of `concurrent.futures.Future`
+            the job of the ECC run and post fit for each spectrum, see `_run_ecc`
+        """
+        runs = []
+        date = l2.utc_timerange.start.datetime
+        ecc_install_path = Path(CONFIG.get("ECC", "ecc_path"))
+
         for spec_idx, spec in enumerate(l2.data["counts"]):
             if spec.shape != (32, 12, 1024):
                 logger.warning(f"Unexpected shape {spec.shape} for counts in {l1product.name}")
@@ -176,243 +298,251 @@ class EnergyCalibration(GenericProduct, EnergyChannelsMixin, L2Mixin):
                 raise ValueError(f"Invalid filename {spec_filename} for energy calibration data")
 
             spec_filename = spec_filename.replace(".fits", "_ecc_in.fits")
-            ecc_install_path = Path(CONFIG.get("ECC", "ecc_path"))
 
-            with ecc_manager.context(date) as ecc_run_context:
-                ecc_run_context_path, ecc_run_cfg = ecc_run_context
+            # each run has its own work directory
+            ecc_run_context = contexts.enter_context(ecc_manager.context(date))
+            ecc_run_context_path, ecc_run_cfg = ecc_run_context
 
-                cal.control.add_column(
-                    Column(
-                        name="ecc_config_name",
-                        data=[str(ecc_run_cfg.Name)],
-                        description="Name of the ECC configuration based on data date",
-                    )
+            cal.control.add_column(
+                Column(
+                    name="ecc_config_name",
+                    data=[str(ecc_run_cfg.Name)],
+                    description="Name of the ECC configuration based on data date",
                 )
+            )
 
-                spec_file = ecc_run_context_path / spec_filename
-                all_file = ecc_run_context_path / "spec_all.fits"
-                spec_all_erg = ecc_run_context_path / "spec_all_erg.fits"
-                erg_path = ecc_run_context_path / "ECC_para.fits"
-                bash_script = f"""#!/bin/bash
-                              cd {ecc_run_context_path}
-
-                              {ecc_install_path}/Bkg
-                              {ecc_install_path}/ECC --f_obs "{spec_filename}"
-                              {ecc_install_path}/STX_Calib spec_all.fits ECC_para.fits[1]
-                              """
-                primary_hdu = fits.PrimaryHDU()
-
-                all_spec_enc = fits.connect._encode_mixins(all_spec_table_rate)
-                all_spec = table_to_hdu(all_spec_enc)
-                all_spec.name = "RATE"
-
-                all_spec_total_enc = fits.connect._encode_mixins(all_spec_table_total_rate)
-                all_spec_total = table_to_hdu(all_spec_total_enc)
-                all_spec_total.name = "TOTAL_RATE"
-
-                hdul = [primary_hdu, all_spec, all_spec_total]
-                hdul = fits.HDUList(hdul)
-                hdul.writeto(all_file, overwrite=True, checksum=True)
-
-                primary_hdu = fits.PrimaryHDU()
-                spec_enc = fits.connect._encode_mixins(spec_ecc_table)
-                spec_hdu = table_to_hdu(spec_enc)
-                spec_hdu.name = "SPEC_ECC"
-                hdul = [primary_hdu, spec_hdu]
-                hdul = fits.HDUList(hdul)
-                hdul.writeto(spec_file, overwrite=True, checksum=True)
-
-                if not spec_file.exists():
-                    raise FileNotFoundError(f"Failed to write energy calibration data in ECC format to {spec_file}")
-                logger.info(f"Energy calibration data in ECC format written to {spec_file}")
-
-                # Run bash script directly
-                process = subprocess.run(["bash"], input=bash_script, text=True, capture_output=True)
-                if process.returncode != 0:
-                    raise RuntimeError(f"ECC Bash script failed: {process.stderr}")
-
-                logger.info("ECC bash script executed successfully: \n%s", process.stdout)
-
-                if not erg_path.exists():
-                    raise FileNotFoundError(f"Failed to read ECC result file {erg_path}")
-
-                livetime = control["live_time"].to(u.s)
-                cal.add_additional_header_keyword(
-                    ("LIVETIME", livetime.value[0], "calibration spectra live time in seconds")
+            spec_file = ecc_run_context_path / spec_filename
+            all_file = ecc_run_context_path / "spec_all.fits"
+            bash_script = f"""#!/bin/bash
+                          cd {ecc_run_context_path}
+
+                          {ecc_install_path}/Bkg
+                          {ecc_install_path}/ECC --f_obs "{spec_filename}"
+                          {ecc_install_path}/STX_Calib spec_all.fits ECC_para.fits[1]
+                          """
+            primary_hdu = fits.PrimaryHDU()
+
+            all_spec_enc = fits.connect._encode_mixins(all_spec_table_rate)
+            all_spec = table_to_hdu(all_spec_enc)
+            all_spec.name = "RATE"
+
+            all_spec_total_enc = fits.connect._encode_mixins(all_spec_table_total_rate)
+            all_spec_total = table_to_hdu(all_spec_total_enc)
+            all_spec_total.name = "TOTAL_RATE"
+
+            hdul = [primary_hdu, all_spec, all_spec_total]
+            hdul = fits.HDUList(hdul)
+            hdul.writeto(all_file, overwrite=True, checksum=True)
+
+            primary_hdu = fits.PrimaryHDU()
+            spec_enc = fits.connect._encode_mixins(spec_ecc_table)
+            spec_hdu = table_to_hdu(spec_enc)
+            spec_hdu.name = "SPEC_ECC"
+            hdul = [primary_hdu, spec_hdu]
+            hdul = fits.HDUList(hdul)
+            hdul.writeto(spec_file, overwrite=True, checksum=True)
+
+            if not spec_file.exists():
+                raise FileNotFoundError(f"Failed to write energy calibration data in ECC format to {spec_file}")
+            logger.info(f"Energy calibration data in ECC format written to {spec_file}")
+
+            runs.append(
+                executor.submit(
+                    cls._run_ecc, bash_script, cal, control, ecc_run_context, ob_elut, timeout=timeout, groups=groups
                 )
+            )
 
-                cal.data.add_column(
-                    Column(
-                        name="live_time",
-                        data=livetime.value,
-                        description="calibration spectra live time in seconds",
-                    )
-                )
-                cal.data["live_time"].unit = u.s
+        return runs
 
-                ecc_pf_df, idx_ecc = ecc_post_fit_on_fits(spec_all_erg, erg_path, livetime)
-                logger.info(
-                    "Run ecc post fit: replaced [%s %%] gain offset pairs with 'better fits'",
-                    round((len(idx_ecc) - idx_ecc.sum()) / max(1, len(idx_ecc)) * 100, ndigits=1),
-                )
+    @classmethod
+    def _run_ecc(cls, bash_script, cal, control, ecc_run_context, ob_elut, *, timeout, groups):
+        """Run ECC for a calibration spectrum and add its results and the post fit to the product.
+
+        The post fit of a spectrum starts as soon as its ECC run finished, while the ECC runs of the
+        other spectra go on.
+        """
+        output = _run_ecc_script(bash_script, timeout=timeout, groups=groups)
+        logger.info("ECC bash script executed successfully: \n%s", output)
+        return cls._add_ecc_results(cal, control, ecc_run_context, ob_elut)
+
+    @staticmethod
+    def _add_ecc_results(cal, control, ecc_run_context, ob_elut):
+        """Add the results of a finished ECC run and the post fit to the calibration product."""
+        ecc_run_context_path, ecc_run_cfg = ecc_run_context
+        spec_all_erg = ecc_run_context_path / "spec_all_erg.fits"
+        erg_path = ecc_run_context_path / "ECC_para.fits"
+        if not erg_path.exists():
+            raise FileNotFoundError(f"Failed to read ECC result file {erg_path}")
+
+        livetime = control["live_time"].to(u.s)
+        cal.add_additional_header_keyword(("LIVETIME", livetime.value[0], "calibration spectra live time in seconds"))
+
+        cal.data.add_column(
+            Column(
+                name="live_time",
+                data=livetime.value,
+                description="calibration spectra live time in seconds",
+            )
+        )
+        cal.data["live_time"].unit = u.s
 
-                gain = 1.0 / (4.0 * ecc_pf_df["Gain_Cor"].values.reshape(32, 12))
-                offset = 4.0 * ecc_pf_df["Offset_Cor"].values.reshape(32, 12)
-                goc = ecc_pf_df["goc"].values.reshape(32, 12)
+        ecc_pf_df, idx_ecc = ecc_post_fit_on_fits(spec_all_erg, erg_path, livetime)
+        logger.info(
+            "Run ecc post fit: replaced [%s %%] gain offset pairs with 'better fits'",
+            round((len(idx_ecc) - idx_ecc.sum()) / max(1, len(idx_ecc)) * 100, ndigits=1),
+        )
 
-                cal.data.add_column(
-                    Column(
-                        name="offset",
-                        data=[offset],
-                        description="offset result of the ecc spectra fitting and post fitting [ADU_Ground_Channels] (1024)",
-                    )
-                )
-                cal.data["offset"].unit = u.adu
+        gain = 1.0 / (4.0 * ecc_pf_df["Gain_Cor"].values.reshape(32, 12))
+        offset = 4.0 * ecc_pf_df["Offset_Cor"].values.reshape(32, 12)
+        goc = ecc_pf_df["goc"].values.reshape(32, 12)
 
-                cal.data.add_column(
-                    Column(
-                        name="gain",
-                        data=[gain],
-                        description="gain result of the ecc spectra fitting and post fitting [ADU_Ground_Channels/keV] (1024)",
-                    )
-                )
-                cal.data["gain"].unit = u.adu / u.keV
+        cal.data.add_column(
+            Column(
+                name="offset",
+                data=[offset],
+                description="offset result of the ecc spectra fitting and post fitting [ADU_Ground_Channels] (1024)",
+            )
+        )
+        cal.data["offset"].unit = u.adu
 
-                cal.data.add_column(
-                    Column(
-                        name="goc",
-                        data=[goc],
-                        description="goodness of correlation result of the ecc spectra fitting",
-                    )
-                )
+        cal.data.add_column(
+            Column(
+                name="gain",
+                data=[gain],
+                description="gain result of the ecc spectra fitting and post fitting [ADU_Ground_Channels/keV] (1024)",
+            )
+        )
+        cal.data["gain"].unit = u.adu / u.keV
+
+        cal.data.add_column(
+            Column(
+                name="goc",
+                data=[goc],
+                description="goodness of correlation result of the ecc spectra fitting",
+            )
+        )
 
-                # just keeping track of ECC + post fit results for now
-                # off_gain_ecc = np.array(
-                #     [
-                #         4.0 * ecc_pf_df["Offset_ECC"].values.reshape(32, 12),
-                #         1.0 / (4.0 * ecc_pf_df["Gain_ECC"].values.reshape(32, 12)),
-                #         ecc_pf_df["goc"].values.reshape(32, 12),
-                #     ]
-                # )
-
-                # cal.data.add_column(
-                #     Column(
-                #         name="ecc_only_offset_gain_goc",
-                #         data=[off_gain_ecc],
-                #         description="result of the ecc fitting only: offset, gain, goc",
-                #     )
-                # )
-
-                cal.data.add_column(
-                    Column(
-                        name="ecc_error",
-                        data=[
-                            np.array(
-                                [
-                                    ecc_pf_df["err_P31"].values.reshape(32, 12),
-                                    ecc_pf_df["err_dE31"].values.reshape(32, 12),
-                                    ecc_pf_df["err_P81"].values.reshape(32, 12),
-                                    ecc_pf_df["err_dE81"].values.reshape(32, 12),
-                                ]
-                            )
-                        ],
-                        description="error estimate from ECC post fit: err_P31, err_dE31, err_P81, err_dE81",
+        # just keeping track of ECC + post fit results for now
+        # off_gain_ecc = np.array(
+        #     [
+        #         4.0 * ecc_pf_df["Offset_ECC"].values.reshape(32, 12),
+        #         1.0 / (4.0 * ecc_pf_df["Gain_ECC"].values.reshape(32, 12)),
+        #         ecc_pf_df["goc"].values.reshape(32, 12),
+        #     ]
+        # )
+
+        # cal.data.add_column(
+        #     Column(
+        #         name="ecc_only_offset_gain_goc",
+        #         data=[off_gain_ecc],
+        #         description="result of the ecc fitting only: offset, gain, goc",
+        #     )
+        # )
+
+        cal.data.add_column(
+            Column(
+                name="ecc_error",
+                data=[
+                    np.array(
+                        [
+                            ecc_pf_df["err_P31"].values.reshape(32, 12),
+                            ecc_pf_df["err_dE31"].values.reshape(32, 12),
+                            ecc_pf_df["err_P81"].values.reshape(32, 12),
+                            ecc_pf_df["err_dE81"].values.reshape(32, 12),
+                        ]
                     )
-                )
+                ],
+                description="error estimate from ECC post fit: err_P31, err_dE31, err_P81, err_dE81",
+            )
+        )
 
-                gain_range_ok = True
-                for h in ecc_pf_df.index[ecc_pf_df["Gain_Prime"] > ecc_run_cfg.Max_Gain_Prime]:
-                    det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
-                    if det_pix_can not in ecc_run_cfg.Ignore_Max_Gain_Prime_Det_Pix_List:
-                        logger.warning(
-                            f"ECC result Gain_Prime {ecc_pf_df['Gain_Prime'][h]} "
-                            f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} exceeds "
-                            f"Max_Gain {ecc_run_cfg.Max_Gain_Prime}, "
-                            "but not in ignore list"
-                        )
-                        gain_range_ok = False
-
-                for h in ecc_pf_df.index[ecc_pf_df["Gain_Prime"] < ecc_run_cfg.Min_Gain_Prime]:
-                    det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
-                    if det_pix_can not in ecc_run_cfg.Ignore_Min_Gain_Prime_Det_Pix_List:
-                        logger.warning(
-                            f"ECC result Gain_Prime {ecc_pf_df['Gain_Prime'][h]} "
-                            f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} falls below "
-                            f"Min_Gain_Prime {ecc_run_cfg.Min_Gain_Prime}, "
-                            "but not in ignore list"
-                        )
-                        gain_range_ok = False
-
-                for h in ecc_pf_df.index[ecc_pf_df["Gain_Cor"] < ecc_run_cfg.Min_Gain]:
-                    det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
-                    if det_pix_can not in ecc_run_cfg.Ignore_Min_Gain_Det_Pix_List:
-                        logger.warning(
-                            f"ECC result Gain_Cor {ecc_pf_df['Gain_Cor'][h]} "
-                            f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} falls below "
-                            f"Min_Gain {ecc_run_cfg.Min_Gain}, "
-                            "but not in ignore list"
-                        )
-                        gain_range_ok = False
-
-                cal.data.add_column(
-                    Column(name="gain_range_ok", data=[gain_range_ok], description="is gain in expected range")
+        gain_range_ok = True
+        for h in ecc_pf_df.index[ecc_pf_df["Gain_Prime"] > ecc_run_cfg.Max_Gain_Prime]:
+            det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
+            if det_pix_can not in ecc_run_cfg.Ignore_Max_Gain_Prime_Det_Pix_List:
+                logger.warning(
+                    f"ECC result Gain_Prime {ecc_pf_df['Gain_Prime'][h]} "
+                    f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} exceeds "
+                    f"Max_Gain {ecc_run_cfg.Max_Gain_Prime}, "
+                    "but not in ignore list"
                 )
-
-                # calculate the actual energy edges taking the applied ELUT into
-                # account for calibration of data recorded with the ELUT
-                e_actual = (ob_elut.adc - offset[..., None]) * gain[..., None]
-
-                e_actual_ext = np.pad(
-                    e_actual,
-                    # pad last axis by 1 on both sides
-                    pad_width=((0, 0), (0, 0), (1, 1)),
-                    mode="constant",
-                    # first pad with 0, last pad with inf
-                    constant_values=(0, np.inf),
+                gain_range_ok = False
+
+        for h in ecc_pf_df.index[ecc_pf_df["Gain_Prime"] < ecc_run_cfg.Min_Gain_Prime]:
+            det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
+            if det_pix_can not in ecc_run_cfg.Ignore_Min_Gain_Prime_Det_Pix_List:
+                logger.warning(
+                    f"ECC result Gain_Prime {ecc_pf_df['Gain_Prime'][h]} "
+                    f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} falls below "
+                    f"Min_Gain_Prime {ecc_run_cfg.Min_Gain_Prime}, "
+                    "but not in ignore list"
+                )
+                gain_range_ok = False
+
+        for h in ecc_pf_df.index[ecc_pf_df["Gain_Cor"] < ecc_run_cfg.Min_Gain]:
+            det_pix_can = [ecc_pf_df["DET"][h], ecc_pf_df["PIX"][h]]
+            if det_pix_can not in ecc_run_cfg.Ignore_Min_Gain_Det_Pix_List:
+                logger.warning(
+                    f"ECC result Gain_Cor {ecc_pf_df['Gain_Cor'][h]} "
+                    f"for DET {det_pix_can[0]} PIX {det_pix_can[1]} falls below "
+                    f"Min_Gain {ecc_run_cfg.Min_Gain}, "
+                    "but not in ignore list"
                 )
+                gain_range_ok = False
 
-                cal.data.add_column(
-                    Column(
-                        name="e_edges_actual",
-                        data=[e_actual_ext],
-                        description="actual energy edges fitted by ECC and post fitting E = (chan + offset) * gain",
-                    )
-                )  # noqa
-                cal.data["e_edges_actual"].unit = u.keV
-
-                # just keeping track of ECC + post fit results for now
-                # gain_ecc = off_gain_ecc[1, :, :]
-                # offset_ecc = off_gain_ecc[0, :, :]
-
-                # # calculate the actual energy edges taking the applied ELUT into
-                # # account for calibration of data recorded with the ELUT
-                # e_actual_ecc = (ob_elut.adc - offset_ecc[..., None]) * gain_ecc[..., None]
-
-                # e_actual_ext_ecc = np.pad(
-                #     e_actual_ecc,
-                #     # pad last axis by 1 on both sides
-                #     pad_width=((0, 0), (0, 0), (1, 1)),
-                #     mode="constant",
-                #     # first pad with 0, last pad with inf
-                #     constant_values=(0, np.inf),
-                # )
-
-                # cal.data.add_column(
-                #     Column(
-                #         name="ecc_only_e_edges_actual",
-                #         data=[e_actual_ext_ecc],
-                #         description="actual energy edges fitted by ECC only",
-                #     )
-                # )  # noqa
-                # cal.data["ecc_only_e_edges_actual"].unit = u.keV
-
-            # end of ECC context block
-            del cal.data["counts_comp_err"]
-            del cal.data["counts"]
-            products.append(cal)
-            # end of for each spectrum
+        cal.data.add_column(Column(name="gain_range_ok", data=[gain_range_ok], description="is gain in expected range"))
 
-        return products
+        # calculate the actual energy edges taking the applied ELUT into
+        # account for calibration of data recorded with the ELUT
+        e_actual = (ob_elut.adc - offset[..., None]) * gain[..., None]
+
+        e_actual_ext = np.pad(
+            e_actual,
+            # pad last axis by 1 on both sides
+            pad_width=((0, 0), (0, 0), (1, 1)),
+            mode="constant",
+            # first pad with 0, last pad with inf
+            constant_values=(0, np.inf),
+        )
+
+        cal.data.add_column(
+            Column(
+                name="e_edges_actual",
+                data=[e_actual_ext],
+                description="actual energy edges fitted by ECC and post fitting E = (chan + offset) * gain",
+            )
+        )  # noqa
+        cal.data["e_edges_actual"].unit = u.keV
+
+        # just keeping track of ECC + post fit results for now
+        # gain_ecc = off_gain_ecc[1, :, :]
+        # offset_ecc = off_gain_ecc[0, :, :]
+
+        # # calculate the actual energy edges taking the applied ELUT into
+        # # account for calibration of data recorded with the ELUT
+        # e_actual_ecc = (ob_elut.adc - offset_ecc[..., None]) * gain_ecc[..., None]
+
+        # e_actual_ext_ecc = np.pad(
+        #     e_actual_ecc,
+        #     # pad last axis by 1 on both sides
+        #     pad_width=((0, 0), (0, 0), (1, 1)),
+        #     mode="constant",
+        #     # first pad with 0, last pad with inf
+        #     constant_values=(0, np.inf),
+        # )
+
+        # cal.data.add_column(
+        #     Column(
+        #         name="ecc_only_e_edges_actual",
+        #         data=[e_actual_ext_ecc],
+        #         description="actual energy edges fitted by ECC only",
+        #     )
+        # )  # noqa
+        # cal.data["ecc_only_e_edges_actual"].unit = u.keV
+
+        del cal.data["counts_comp_err"]
+        del cal.data["counts"]
+        return cal
 
     def __add__(self, other):
         raise NotCombineException(f"Tried to combine 2 cal_energy products: \n{self} and \n{other}")
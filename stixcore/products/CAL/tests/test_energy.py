@@ -1,7 +1,14 @@
+import time
+import threading
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import pytest
 
-from stixcore.calibration.ecc_post_fit import ecc_post_fit_on_fits
+from stixcore.calibration.ecc_post_fit import BA_FIT_DTYPE, ecc_post_fit_on_fits, fit_ba_lines
 from stixcore.data.test import test_data
+from stixcore.products.CAL.energy import EnergyCalibration, _ProcessGroups, _run_ecc_script
 
 
 def test_ecc_post_fit():
@@ -796,3 +803,81 @@ def test_ecc_post_fit():
 
     assert np.allclose(res_off, ecc_pf_df.Offset_Cor.values)
     assert np.allclose(res_gain, ecc_pf_df.Gain_Cor.values)
+
+
+def test_fit_ba_lines():
+    rng = np.random.default_rng(42)
+    erg_c = np.linspace(0, 150, 2024)
+    lines = 2000 * np.exp(-((erg_c - 30.9) ** 2) / 0.4) + 600 * np.exp(-((erg_c - 81.0) ** 2) / 0.7)
+    spectra = rng.poisson(lines + 50 * np.exp(-erg_c / 60) + 5, size=(14, 2024)) / 1000.0
+    # no lines
+    spectra[3] = 0.005
+
+    res = fit_ba_lines(erg_c, spectra, max_workers=1)
+    assert res.dtype == BA_FIT_DTYPE
+    assert np.array_equal(res["DET"], [1] * 12 + [2] * 2)
+    assert np.array_equal(res["PIX"], list(range(12)) + [0, 1])
+    assert not res["Flag81"][3]
+    ok = np.delete(res, 3)
+    assert ok["Flag31"].all()
+    assert ok["Flag81"].all()
+    assert np.allclose(ok["P81"], 81.0, atol=0.1)
+
+    assert np.array_equal(fit_ba_lines(erg_c, spectra, max_workers=2), res)
+    # by default no process pool is started within the pipeline workers
+    with patch("stixcore.calibration.ecc_post_fit.ProcessPoolExecutor", side_effect=AssertionError):
+        assert np.array_equal(fit_ba_lines(erg_c, spectra), res)
+
+
+def test_run_ecc_script(tmp_path):
+    assert _run_ecc_script(f"cd {tmp_path}\necho ok > out.txt\necho done").strip() == "done"
+    assert (tmp_path / "out.txt").read_text().strip() == "ok"
+
+    with pytest.raises(RuntimeError, match="failed: broken"):
+        _run_ecc_script("echo broken >&2\nexit 1")
+
+    # the timeout kills the children of the script as well: the output pipes are only closed
+    # (and the call returns) if all processes of the script ended
+    with pytest.raises(RuntimeError, match="timed out"):
+        _run_ecc_script("(sleep 600) &\nsleep 600", timeout=0.1)
+
+
+def test_run_ecc_script_kill(tmp_path):
+    started = tmp_path / "started"
+    groups = _ProcessGroups()
+    with ThreadPoolExecutor(1) as executor:
+        job = executor.submit(_run_ecc_script, f"touch {started}\n(sleep 600) &\nsleep 600", groups=groups)
+        while not started.exists() and not job.done():
+            time.sleep(0.01)
+        groups.kill()
+        with pytest.raises(RuntimeError, match="killed"):
+            job.result()
+
+    # scripts started after the kill are killed immediately
+    with pytest.raises(RuntimeError, match="killed"):
+        _run_ecc_script("sleep 600", groups=groups)
+
+
+def test_run_ecc_post_fit_in_pool():
+    calls = []
+
+    def add_ecc_results(cal, control, ecc_run_context, ob_elut):
+        calls.append(("post fit", cal, threading.current_thread()))
+        return cal
+
+    with (
+        patch("stixcore.products.CAL.energy._run_ecc_script", side_effect=lambda *a, **kw: calls.append("ecc")),
+        patch.object(EnergyCalibration, "_add_ecc_results", side_effect=add_ecc_results),
+        ThreadPoolExecutor(2) as executor,
+    ):
+        jobs = [
+            executor.submit(EnergyCalibration._run_ecc, "", cal, None, None, None, timeout=1, groups=None)
+            for cal in ("cal0", "cal1")
+        ]
+        assert [job.result() for job in jobs] == ["cal0", "cal1"]
+
+    # the post fit of each spectrum runs on the ECC thread pool after its ECC run
+    assert calls.count("ecc") == 2
+    post_fits = [call for call in calls if call != "ecc"]
+    assert sorted(cal for _, cal, _ in post_fits) == ["cal0", "cal1"]
+    assert all(thread is not threading.main_thread() for *_, thread in post_fits)
@@ -55,7 +55,10 @@ class HKProduct(GenericProduct):
 
     @classmethod
     def from_levelb(cls, levelb, *, parent="", keep_parse_tree=True):
-        """Converts level binary HK packets to a L1 product.
+        """Converts level binary HK packets to a L0 product.
+
+        The static HK packets are decoded all at once. Only if that is not possible the packets
+        are parsed one by one.
 
         Parameters
         ----------
@@ -63,30 +66,69 @@ class HKProduct(GenericProduct):
             The binary level product.
         parent : `str`, optional
             The parent data file name the binary packed comes from, by default ''
-        NIX00405_offset : int, optional
-            [description], by default 0
         keep_parse_tree : bool, optional
             Whether to keep the parse tree in each packet for debugging and printing, by default True
 
         Returns
         -------
-        tuple (packets, idb_versions, control)
-            the converted packets
-            all used IDB versions and time periods
-            initialized control table
+        `HKProduct`
+            the converted HK product
         """
-        packets, idb_versions = GenericProduct.getLeveL0Packets(levelb, keep_parse_tree=keep_parse_tree)
+        packets = None
+        static = GenericProduct.getLeveL0StaticData(levelb)
+        if static is not None:
+            headers, values, parameters, idb_versions = static
+            service_type, service_subtype, ssid = (
+                int(headers[h][0]) for h in ["service_type", "service_subtype", "pi1_val"]
+            )
+            scet_coarse, scet_fine = headers["scet_coarse"], headers["scet_fine"]
+            columns = {nix: (values[nix], idb_info) for nix, idb_info in parameters.items()}
+        else:
+            packets, idb_versions = GenericProduct.getLeveL0Packets(levelb, keep_parse_tree=keep_parse_tree)
+            service_type, service_subtype, ssid = packets.service_type, packets.service_subtype, packets.ssid
+            scet_coarse, scet_fine = packets.get("scet_coarse"), packets.get("scet_fine")
+            columns = {
+                nix: (packets.get_value(nix, attr="value"), param.idb_info)
+                for nix, param in packets.parameters.items()
+                if not (nix.startswith("NIXG") or nix == "NIX00020")
+            }
 
         control = Control()
-        control["scet_coarse"] = packets.get("scet_coarse")
-        control["scet_fine"] = packets.get("scet_fine")
+        control["scet_coarse"] = scet_coarse
+        control["scet_fine"] = scet_fine
         control["integration_time"] = 0
         control["index"] = range(len(control))
         control["raw_file"] = levelb.control["raw_file"]
         control["packet"] = levelb.control["packet"]
         control["parent"] = parent
 
-        return packets, idb_versions, control
+        # Data
+        data = Data()
+        data["time"] = SCETime(control["scet_coarse"], control["scet_fine"])
+        data["timedel"] = SCETimeDelta(0, 0)
+
+        for nix, (value, idb_info) in columns.items():
+            if nix.startswith("NIXG") or nix == "NIX00020":
+                continue
+
+            name = idb_info.get_product_attribute_name()
+            data[name] = value
+            data[name].meta = {"NIXS": nix, "PCF_CURTX": idb_info.PCF_CURTX}
+
+            if nix in ["NIX00078", "NIX00079", "NIX00080", "NIX00081"]:
+                data[name].description = "accumulated over time from last report (reference is time bin end)"
+
+        data["control_index"] = range(len(control))
+
+        return cls(
+            service_type=service_type,
+            service_subtype=service_subtype,
+            ssid=ssid,
+            control=control,
+            data=data,
+            idb_versions=idb_versions,
+            packets=packets,
+        )
 
 
 class MiniReport(HKProduct):
@@ -111,36 +153,6 @@ class MiniReport(HKProduct):
         )
         self.name = "mini"
 
-    @classmethod
-    def from_levelb(cls, levelb, parent="", keep_parse_tree=True):
-        packets, idb_versions, control = super().from_levelb(levelb, parent=parent, keep_parse_tree=keep_parse_tree)
-
-        # Create array of times as dt from date_obs
-        times = SCETime(control["scet_coarse"], control["scet_fine"])
-
-        # Data
-        data = Data()
-        data["time"] = times
-        data["timedel"] = SCETimeDelta(0, 0)
-        for nix, param in packets.data[0].__dict__.items():
-            if nix.startswith("NIXG") or nix == "NIX00020":
-                continue
-
-            name = param.idb_info.get_product_attribute_name()
-            data.add_basic(name=name, nix=nix, attr="value", packets=packets)
-
-        data["control_index"] = range(len(control))
-
-        return cls(
-            service_type=packets.service_type,
-            service_subtype=packets.service_subtype,
-            ssid=packets.ssid,
-            control=control,
-            data=data,
-            idb_versions=idb_versions,
-            packets=packets,
-        )
-
     @classmethod
     def is_datasource_for(cls, *, service_type, service_subtype, ssid, **kwargs):
         return kwargs["level"] == "L0" and service_type == 3 and service_subtype == 25 and ssid == 1
@@ -169,40 +181,6 @@ class MaxiReport(HKProduct):
         )
         self.name = "maxi"
 
-    @classmethod
-    def from_levelb(cls, levelb, parent="", keep_parse_tree=True):
-        packets, idb_versions, control = super().from_levelb(levelb, parent=parent, keep_parse_tree=keep_parse_tree)
-
-        # Create array of times as dt from date_obs
-        times = SCETime(control["scet_coarse"], control["scet_fine"])
-
-        # Data
-        data = Data()
-        data["time"] = times
-        data["timedel"] = SCETimeDelta(0, 0)
-
-        for nix, param in packets.data[0].__dict__.items():
-            if nix.startswith("NIXG") or nix == "NIX00020":
-                continue
-
-            name = param.idb_info.get_product_attribute_name()
-            data.add_basic(name=name, nix=nix, attr="value", packets=packets)
-
-            if nix in ["NIX00078", "NIX00079", "NIX00080", "NIX00081"]:
-                data[name].description = "accumulated over time from last report (reference is time bin end)"
-
-        data["control_index"] = range(len(control))
-
-        return cls(
-            service_type=packets.service_type,
-            service_subtype=packets.service_subtype,
-            ssid=packets.ssid,
-            control=control,
-            data=data,
-            idb_versions=idb_versions,
-            packets=packets,
-        )
-
     @classmethod
     def is_datasource_for(cls, *, service_type, service_subtype, ssid, **kwargs):
         return kwargs["level"] == "L0" and service_type == 3 and service_subtype == 25 and ssid == 2
@@ -939,7 +939,7 @@ class Aspect(ScienceProduct):
     @classmethod
     def from_levelb(cls, levelb, parent="", keep_parse_tree=True):
         packets, idb_versions = GenericProduct.getLeveL0Packets(levelb, keep_parse_tree=keep_parse_tree)
-        if len(packets.data) == 0:
+        if len(packets) == 0:
             logger.warning("No data all packets empty %s", levelb)
             return None
         control = ControlSci()
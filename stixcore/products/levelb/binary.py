@@ -1,3 +1,4 @@
+from binascii import unhexlify
 from collections import defaultdict
 
 import numpy as np
@@ -6,18 +7,70 @@ import astropy.units as u
 from astropy.table.operations import unique, vstack
 from astropy.table.table import Table
 
-from stixcore.products.product import BaseProduct
+from stixcore.config.config import CONFIG
+from stixcore.products.product import BaseProduct, index_join
 from stixcore.time import SCETime
 from stixcore.time.datetime import SEC_IN_DAY
-from stixcore.tmtc.packets import SequenceFlag, TMPacket
+from stixcore.tmtc.packets import SequenceFlag, TMPacket, scan_tm_header
 from stixcore.util.logging import get_logger
 
-__all__ = ["LevelB"]
+__all__ = ["LevelB", "to_binary_column", "to_hex_column", "packet_lengths"]
 
 logger = get_logger(__name__)
 logger.setLevel("DEBUG")
 
 
+def to_binary_column(column):
+    """Convert the packet data column to variable length uint8 arrays.
+
+    Parameters
+    ----------
+    column : iterable
+        the packets as hex strings or byte like objects
+
+    Returns
+    -------
+    `numpy.ndarray`
+        object array of uint8 arrays one per packet (stored in the FITS heap)
+    """
+    res = np.empty(len(column), dtype=object)
+    for i, d in enumerate(column):
+        res[i] = np.frombuffer(unhexlify(d) if isinstance(d, str) else d, dtype=np.uint8)
+    return res
+
+
+def to_hex_column(column):
+    """Convert the packet data column to hex strings.
+
+    Parameters
+    ----------
+    column : iterable
+        the packets as hex strings or byte like objects
+
+    Returns
+    -------
+    `list`
+        list of hex strings one per packet
+    """
+    return [d if isinstance(d, str) else bytes(d).hex() for d in column]
+
+
+def packet_lengths(column):
+    """Get the length in bytes of each packet of the packet data column.
+
+    Parameters
+    ----------
+    column : iterable
+        the packets as hex strings or byte like objects
+
+    Returns
+    -------
+    `numpy.ndarray`
+        length of each packet in bytes
+    """
+    return np.array([len(d) // 2 if isinstance(d, str) else len(d) for d in column], dtype=np.int64)
+
+
 class LevelB(BaseProduct):
     """Class representing level binary data (TM products)."""
 
@@ -42,9 +95,9 @@ class LevelB(BaseProduct):
         self.type = ""
 
         # TODO better encapsulated time handling?
-        times = [SCETime(c, f) for c, f in self.control[["scet_coarse", "scet_fine"]]]
-        self.control["scet_coarse"] = [t.coarse for t in times]
-        self.control["time_sync"] = [t.time_sync for t in times]
+        times = SCETime(np.asarray(self.control["scet_coarse"]), np.asarray(self.control["scet_fine"]))
+        self.control["scet_coarse"] = times.coarse
+        self.control["time_sync"] = times.time_sync
 
         # TODO check if need to sort before this
         self.obt_beg = SCETime(self.control["scet_coarse"][0], self.control["scet_fine"][0])
@@ -55,6 +108,17 @@ class LevelB(BaseProduct):
     def fits_daily_file(self):
         return None
 
+    @property
+    def is_binary(self):
+        """Are the packets stored as raw binary (uint8 arrays) or as hex strings.
+
+        Returns
+        -------
+        `bool`
+            True if the packets are stored as variable length uint8 arrays.
+        """
+        return self.data["data"].dtype == object
+
     @property
     def parent(self):
         """
@@ -110,6 +174,10 @@ class LevelB(BaseProduct):
 
         # Copy so don't overwrite
         other = other[:]
+        if other.is_binary != self.is_binary:
+            other.data["data"] = (
+                to_binary_column(other.data["data"]) if self.is_binary else to_hex_column(other.data["data"])
+            )
         other.control["index"] = other.control["index"].data + self.control["index"].data.max() + 1
         other.data["control_index"] = other.data["control_index"] + self.control["index"].max() + 1
 
@@ -123,10 +191,10 @@ class LevelB(BaseProduct):
         control["index"] = new_index
 
         data = vstack((self.data, other.data))
-        data = data[np.nonzero(orig_indices[:, None] == data["control_index"].data)[1]]
+        data = data[index_join(orig_indices, data["control_index"])]
         data["control_index"] = np.array(range(len(data)), dtype=np.int64)
 
-        if np.abs([((len(data["data"][i]) / 2) - (control["data_length"][i] + 7)) for i in range(len(data))]).sum() > 0:
+        if np.any(packet_lengths(data["data"]) != control["data_length"] + 7):
             logger.error("Expected and actual data length do not match")
 
         return type(self)(
@@ -217,26 +285,91 @@ class LevelB(BaseProduct):
         )
 
     @classmethod
-    def from_tm(cls, tmfile):
+    def from_tm(cls, tmfile, *, binary=None, packet_filter=None):
         """Process the given SOC file and creates LevelB FITS files.
 
         Parameters
         ----------
         tmfile : `SOCPacketFile`
             The input data file.
+        binary : `bool`, optional
+            store the packets as raw binary (variable length uint8 arrays) instead of hex strings,
+            by default None: read from config 'Pipeline.levelb_binary_data'
+        packet_filter : `~stixcore.tmtc.packets.PacketFilter`, optional
+            only keep the packets selected by the filter, by default None: all packets
+        """
+        try:
+            packet_data = cls.read_packets(
+                tmfile.get_packet_binaries(), raw_file=tmfile.file.name, packet_filter=packet_filter
+            )
+        except Exception:
+            return
+
+        yield from cls.from_packets(packet_data, binary=binary)
+
+    @staticmethod
+    def read_packets(binaries, *, raw_file, packet_filter=None):
+        """Read the packet headers and group the packets by product key.
+
+        Parameters
+        ----------
+        binaries : iterable of (`int`, `bytes`)
+            packet number and binary data of the packets e.g. `SOCPacketFile.get_packet_binaries`
+        raw_file : `str`
+            name of the raw file the packets come from
+        packet_filter : `~stixcore.tmtc.packets.PacketFilter`, optional
+            only keep the packets selected by the filter. The filter is applied to the headers read
+            by `~stixcore.tmtc.packets.scan_tm_header` so skipped packets are never fully
+            created. By default None: all packets
+
+        Returns
+        -------
+        `dict`
+            all `TMPacket` grouped by the product key (service, subservice, ssid)
+
+        Raises
+        ------
+        Exception
+            If a packet can not be parsed.
         """
         packet_data = defaultdict(list)
 
-        for packet_no, binary in tmfile.get_packet_binaries():
+        for packet_no, packet_binary in binaries:
             try:
-                packet = TMPacket(binary)
+                if packet_filter is not None and not packet_filter(
+                    scan_tm_header(packet_binary, pi1_val=packet_filter.needs_pi1_val)
+                ):
+                    continue
+                packet = TMPacket(packet_binary)
             except Exception:
-                logger.error("Error parsing %s, %d", tmfile.name, packet_no, exc_info=True)
-                return
+                logger.error("Error parsing %s, %d", raw_file, packet_no, exc_info=True)
+                raise
 
-            packet.source = (tmfile.file.name, packet_no)
+            packet.source = (raw_file, packet_no)
             packet_data[packet.key].append(packet)
 
+        return packet_data
+
+    @classmethod
+    def from_packets(cls, packet_data, *, binary=None):
+        """Create LevelB products from grouped packets.
+
+        Parameters
+        ----------
+        packet_data : `dict`
+            all `TMPacket` grouped by product key see `LevelB.read_packets`
+        binary : `bool`, optional
+            store the packets as raw binary (variable length uint8 arrays) instead of hex strings,
+            by default None: read from config 'Pipeline.levelb_binary_data'
+
+        Yields
+        ------
+        `LevelB`
+            the next level binary product one for each product key.
+        """
+        if binary is None:
+            binary = CONFIG.getboolean("Pipeline", "levelb_binary_data", fallback=False)
+
         for prod_key, packets in packet_data.items():
             headers = []
             hex_data = []
@@ -244,7 +377,8 @@ class LevelB(BaseProduct):
                 sh = vars(packet.source_packet_header)
                 rid = packet.bsd_requestid
                 bs = sh.pop("bitstream")
-                hex_data.append(bs.hex)
+                raw = sh.pop("binary")
+                hex_data.append(np.frombuffer(raw, dtype=np.uint8) if binary else bs.hex)
                 dh = vars(packet.data_header)
                 dh.pop("datetime")
                 headers.append(
@@ -258,12 +392,12 @@ class LevelB(BaseProduct):
 
             data = Table()
             data["control_index"] = np.array(control["index"], dtype=np.int64)
-            data["data"] = hex_data
+            data["data"] = to_binary_column(hex_data) if binary else hex_data
 
             control = unique(control, keys=["scet_coarse", "scet_fine", "sequence_count"])
 
             # Only keep data that is in the control table via index
-            data = data[np.nonzero(control["index"][:, None] == data["control_index"])[1]]
+            data = data[index_join(control["index"], data["control_index"])]
 
             # now reindex both data and control
             control["index"] = range(len(control))
@@ -1,8 +1,17 @@
+import tracemalloc
+from types import SimpleNamespace
+from pathlib import Path
+
 import numpy as np
 
+from astropy.table import Table
+
 from stixcore.data.test import test_data
+from stixcore.io.product_processors.fits.processors import FitsLBProcessor
 from stixcore.products import Product
-from stixcore.products.levelb.binary import LevelB
+from stixcore.products.levelb.binary import LevelB, packet_lengths, to_binary_column, to_hex_column
+from stixcore.products.product import index_join
+from stixcore.tmtc.packet_factory import Packet
 from stixcore.tmtc.packets import TMPacket
 
 
@@ -62,3 +71,79 @@ def test_add():
     assert np.all(prod1.control == res.control)
     assert np.all(prod2.data == res.data)
     assert np.all(prod2.control == res.control)
+
+
+def test_binary_storage(tmp_path):
+    lb_hex = Product(test_data.products.LB_21_6_30_fits)
+    assert not lb_hex.is_binary
+
+    lb_bin = lb_hex[:]
+    lb_bin.data["data"] = to_binary_column(lb_bin.data["data"])
+    assert lb_bin.is_binary
+    assert np.all(packet_lengths(lb_bin.data["data"]) == packet_lengths(lb_hex.data["data"]))
+    assert np.all(packet_lengths(lb_bin.data["data"]) == lb_bin.control["data_length"] + 7)
+    assert to_hex_column(lb_bin.data["data"]) == to_hex_column(lb_hex.data["data"])
+
+    # raw binary data is parsed without hex decoding
+    p_hex = Packet(lb_hex.data["data"][0])
+    p_bin = Packet(lb_bin.data["data"][0])
+    assert p_hex.data.NIX00405.value == p_bin.data.NIX00405.value
+
+    # adding converts to the storage of the left product
+    assert (lb_bin + lb_hex).is_binary
+    assert not (lb_hex + lb_bin).is_binary
+
+    files = FitsLBProcessor(tmp_path).write_fits(lb_bin)
+    lb_bin_io = Product(files[0])
+    assert lb_bin_io.is_binary
+    assert to_hex_column(lb_bin_io.data["data"]) == to_hex_column(lb_hex.data["data"])
+
+
+def test_from_tm_storage():
+    with test_data.tmtc.TM_21_6_30.open("r") as file:
+        packets = [bytes.fromhex(line.strip()) for line in file.readlines() if line.strip()]
+    tmfile = SimpleNamespace(
+        file=Path("PktTmRaw.xml"), name="PktTmRaw.xml", get_packet_binaries=lambda: enumerate(packets)
+    )
+
+    # hex strings by default
+    lb_hex = list(LevelB.from_tm(tmfile))[0]
+    assert not lb_hex.is_binary
+    assert isinstance(lb_hex.data["data"][0], str)
+
+    lb_bin = list(LevelB.from_tm(tmfile, binary=True))[0]
+    assert lb_bin.is_binary
+    assert to_hex_column(lb_bin.data["data"]) == to_hex_column(lb_hex.data["data"])
+
+
+def test_index_join():
+    rng = np.random.default_rng(42)
+    for n_keys, n_values in [(0, 5), (5, 0), (10, 10), (50, 200)]:
+        keys = rng.permutation(n_keys) if n_keys > 10 else rng.integers(0, 12, n_keys)
+        values = rng.integers(0, 60, n_values)
+        expected = np.nonzero(keys[:, None] == values)[1]
+        assert np.array_equal(index_join(keys, values), expected)
+
+
+def test_add_linear_memory():
+    n = 200_000
+    control = Table()
+    control["scet_coarse"] = np.arange(n, dtype=np.uint32)
+    control["scet_fine"] = np.zeros(n, dtype=np.uint16)
+    control["sequence_count"] = (control["scet_coarse"] % 2**14).astype(np.uint16)
+    control["data_length"] = np.full(n, 25, dtype=np.uint16)
+    control["index"] = np.arange(n, dtype=np.int64)
+    data = Table()
+    data["control_index"] = np.arange(n, dtype=np.int64)
+    data["data"] = to_binary_column([bytes(32)] * n)
+    lb = LevelB(service_type=3, service_subtype=25, ssid=2, control=control, data=data)
+
+    tracemalloc.start()
+    res = lb[: n // 2] + lb[n // 4 :]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(res.control) == len(res.data) == n
+    assert np.array_equal(res.control["scet_coarse"], control["scet_coarse"])
+    # the former N x M broadcast join alone needed n**2 * 3/8 bytes (~15GB)
+    assert peak < 200 * n
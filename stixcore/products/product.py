@@ -20,8 +20,13 @@ import stixcore.processing.engineering as engineering
 from stixcore.idb.manager import IDBManager
 from stixcore.time import SCETime, SCETimeDelta, SCETimeRange
 from stixcore.tmtc.packet_factory import Packet
-from stixcore.tmtc.packets import PacketSequence
-from stixcore.util.util import get_incomplete_file_name
+from stixcore.tmtc.packets import (
+    SOURCE_PACKET_HEADER_STRUCTURE,
+    TM_DATA_HEADER_STRUCTURE,
+    PacketSequence,
+)
+from stixcore.tmtc.parser import binaries_to_buffer, parse_bitstream_batch, parse_static_batch
+from stixcore.util.util import get_incomplete_file_name, get_journal_files
 
 __all__ = [
     "GenericProduct",
@@ -30,6 +35,8 @@ __all__ = [
     "ControlSci",
     "EnergyChannelsMixin",
     "read_qtable",
+    "index_join",
+    "renumber_indices",
     "Control",
     "Data",
     "L1Mixin",
@@ -97,6 +104,67 @@ def read_qtable(file, hdu, hdul=None):
     return qtable
 
 
+def index_join(keys, values):
+    """
+    Find the positions in `values` matching each of the `keys`.
+
+    Equivalent to ``np.nonzero(keys[:, None] == values)[1]`` but uses a stable sort and binary search
+    so memory and time scale linear (N log N) instead of with the N x M comparison matrix.
+
+    Parameters
+    ----------
+    keys : `numpy.ndarray`
+        The keys to look up e.g. the control indices
+    values : `numpy.ndarray`
+        The values to search in e.g. the control_index column of the data
+
+    Returns
+    -------
+    `numpy.ndarray`
+        The positions in `values` grouped by key in order of `keys` and in order of appearance within
+        a key, keys without a match are skipped.
+    """
+    keys = np.asarray(keys)
+    values = np.asarray(values)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    start = np.searchsorted(sorted_values, keys, side="left")
+    counts = np.searchsorted(sorted_values, keys, side="right") - start
+    offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+    return order[offsets + np.arange(offsets.size)]
+
+
+def renumber_indices(control_index, data_control_index):
+    """
+    Renumber the control indices to a new sequence in order of first appearance in the data.
+
+    Parameters
+    ----------
+    control_index : `numpy.ndarray`
+        The index column of the control table
+    data_control_index : `numpy.ndarray`
+        The control_index column of the data table
+
+    Returns
+    -------
+    `tuple`
+        The new data control indices, the new control indices and a mask of the control rows used by
+        the data (the new index of unused control rows is 0).
+    """
+    old_ids, first, inverse = np.unique(np.asarray(data_control_index), return_index=True, return_inverse=True)
+    new_ids = np.empty(len(old_ids), dtype=np.int64)
+    new_ids[np.argsort(first)] = np.arange(len(old_ids))
+
+    control_index = np.asarray(control_index)
+    pos = np.searchsorted(old_ids, control_index)
+    used = pos < len(old_ids)
+    used[used] = old_ids[pos[used]] == control_index[used]
+    control_ids = np.zeros(len(control_index), dtype=np.int64)
+    control_ids[used] = new_ids[pos[used]]
+
+    return new_ids[inverse.ravel()], control_ids, used
+
+
 class AddParametersMixin:
     def add_basic(self, *, name, nix, packets, attr=None, dtype=None, reshape=False):
         r"""
@@ -330,6 +398,16 @@ class ProductFactory(BasicRegistrationFactory):
                 if isinstance(p, (L1Mixin, L2Mixin)):
                     p.fits_header = pri_header
 
+                # fold in the pure time appends journaled next to a daily file and not yet compacted
+                # the header of the file is kept but extended to the end of the journaled data
+                for journal_file in get_journal_files(file_path):
+                    journal = self(journal_file)
+                    header = p.fits_header if isinstance(p, (L1Mixin, L2Mixin)) else None
+                    p = journal + p
+                    if header is not None:
+                        header.update({key: journal.fits_header[key] for key in ("OBT_END", "DATE-END")})
+                        p.fits_header = header
+
                 return p
 
     def _check_registered_widget(self, *args, **kwargs):
@@ -650,11 +728,12 @@ class GenericProduct(BaseProduct):
         self_control = self.control[:]
         self_data = self.data[:]
 
-        # keep old index in a unique way
-        other_control["old_index"] = [f"o{i}" for i in other_control["index"]]
-        self_control["old_index"] = [f"s{i}" for i in self_control["index"]]
-        other_data["old_index"] = [f"o{i}" for i in other_data["control_index"]]
-        self_data["old_index"] = [f"s{i}" for i in self_data["control_index"]]
+        # keep old index in a unique way: tag the other indices with an offset past all self indices
+        self_control["old_index"] = np.asarray(self_control["index"], dtype=np.int64)
+        self_data["old_index"] = np.asarray(self_data["control_index"], dtype=np.int64)
+        offset = max(self_control["old_index"].max(initial=-1), self_data["old_index"].max(initial=-1)) + 1
+        other_control["old_index"] = np.asarray(other_control["index"], dtype=np.int64) + offset
+        other_data["old_index"] = np.asarray(other_data["control_index"], dtype=np.int64) + offset
 
         if (self.service_type, self.service_subtype) == (3, 25):
             self_data["time"] = SCETime(self_control["scet_coarse"], self_control["scet_fine"])
@@ -677,33 +756,15 @@ class GenericProduct(BaseProduct):
 
         data.remove_column("time_float")
 
-        # update the control index in data to a new unique sequence
-        newids = dict()
-
-        data["control_index"] = data["control_index"].astype(np.min_scalar_type(len(control)))
-
-        for row in data:
-            oid = row["old_index"]
-
-            if oid not in newids:
-                newids[oid] = len(newids)
-            nid = newids[oid]
-            row["control_index"] = nid
-
-        del_rows = list()
+        # update the control index in data to a new unique sequence in order of first appearance
+        data_ids, control_ids, used = renumber_indices(control["old_index"], data["old_index"])
+        data["control_index"] = data_ids.astype(np.min_scalar_type(len(control)))
 
         # update the index in control as used in data
-        for idx, row in enumerate(control):
-            oid = row["old_index"]
-
-            if oid not in newids:
-                del_rows.append(idx)
-                continue
-            nid = newids[oid]
-            row["index"] = nid
+        control["index"][used] = control_ids[used]
 
         # when a old index from the control is not used any more in data it will be deleted
-        control.remove_rows(del_rows)
+        control.remove_rows(np.nonzero(~used)[0])
 
         # sort the data by index (driven by the time in data)
         control.sort("index")
@@ -814,7 +875,18 @@ class GenericProduct(BaseProduct):
 
     @classmethod
     def getLeveL0Packets(cls, levelb, keep_parse_tree=True):
-        packets = [Packet(d, keep_parse_tree=keep_parse_tree) for d in levelb.data["data"]]
+        idbm = IDBManager.instance
+        control_rows = index_join(levelb.data["control_index"], levelb.control["index"])
+        coarse = np.asarray(levelb.control["scet_coarse"])[control_rows]
+        fine = np.asarray(levelb.control["scet_fine"])[control_rows]
+
+        packets = []
+        idb_versions = defaultdict(SCETimeRange)
+        # resolve the IDB once per run of packets with the same version instead of per packet
+        for _, run in idbm.find_version_runs(coarse, fine):
+            idb = idbm.get_idb(obt=SCETime(coarse=coarse[run.start], fine=fine[run.start]))
+            packets.extend(Packet(d, idb=idb, keep_parse_tree=keep_parse_tree) for d in levelb.data["data"][run])
+            idb_versions[idb.version].expand(SCETime(coarse=coarse[run], fine=fine[run]))
         # packets = []
         # pid = psutil.Process()
         # logger.info(f"parsing {len(levelb.data)} packages from level B data")
@@ -829,17 +901,88 @@ class GenericProduct(BaseProduct):
         #         logger.warning(f"corrupt package {i}", exc_info=e)
         #         pass
 
-        idb_versions = defaultdict(SCETimeRange)
-
-        for i, packet in enumerate(packets):
-            decompression.decompress(packet)
+        for packet in packets:
+            if keep_parse_tree:
+                # the packets are kept (e.g. for exporting) so each of them needs the decompressed values
+                decompression.decompress(packet)
             engineering.raw_to_engineering(packet)
-            idb_versions[packet.get_idb().version].expand(packet.data_header.datetime)
 
-        packets = PacketSequence(packets)
+        packets = PacketSequence(packets, keep_packets=keep_parse_tree)
+        decompression.decompress_sequence(packets)
 
         return packets, idb_versions
 
+    @classmethod
+    def getLeveL0StaticData(cls, levelb):
+        """Decode all packets of a level binary product at once if they have a static layout.
+
+        Parameters
+        ----------
+        levelb : `stixcore.products.levelb.binary.LevelB`
+            The binary level product (all packets of the same type).
+
+        Returns
+        -------
+        `tuple` (headers, values, parameters, idb_versions) or `None`
+            the header fields as arrays (incl. `pi1_val`), the parameter values as structured array,
+            the IDB parameter definitions by NIX name and all used IDB versions and time periods.
+            `None` if the packets are not static and have to be parsed one by one.
+        """
+        buffer, lengths = binaries_to_buffer(levelb.data["data"])
+        if len(lengths) == 0:
+            return None
+
+        header_structure = {**SOURCE_PACKET_HEADER_STRUCTURE, **TM_DATA_HEADER_STRUCTURE}
+        header_bits = sum(int(f.split(":")[1]) for f in header_structure.values())
+        headers = parse_bitstream_batch(buffer, header_structure, lengths=lengths)
+        service_type = np.unique(headers["service_type"])
+        service_subtype = np.unique(headers["service_subtype"])
+        if len(service_type) != 1 or len(service_subtype) != 1:
+            return None
+        service_type, service_subtype = int(service_type[0]), int(service_subtype[0])
+
+        idbm = IDBManager.instance
+        versions = idbm.find_versions(headers["scet_coarse"], headers["scet_fine"])
+
+        headers["pi1_val"] = np.full(len(lengths), -1, dtype=np.int64)
+        idb_versions = defaultdict(SCETimeRange)
+        parameters = None
+        values = None
+        for version in np.unique(versions).tolist():
+            in_version = versions == version
+            idb = idbm.get_idb(version)
+
+            pi1_val = None
+            pi1_pos = idb.get_packet_pi1_val_position(service_type, service_subtype)
+            if pi1_pos:
+                pi1_vals = parse_bitstream_batch(
+                    buffer[in_version],
+                    {"pi1_val": f"uint:{pi1_pos.width}"},
+                    lengths=lengths[in_version],
+                    pos=header_bits + pi1_pos.offset,
+                )["pi1_val"]
+                if len(np.unique(pi1_vals)) != 1:
+                    return None
+                pi1_val = int(pi1_vals[0])
+                headers["pi1_val"][in_version] = pi1_val
+
+            plan = idb.get_parse_plan(service_type, service_subtype, pi1_val)
+            if not plan.is_static:
+                return None
+
+            version_values = parse_static_batch(buffer[in_version], plan, lengths=lengths[in_version])
+            if values is None:
+                values = np.empty(len(lengths), dtype=version_values.dtype)
+                parameters = {instr[0].name: instr[0].parameter for instr in plan.instructions}
+            elif values.dtype != version_values.dtype:
+                return None
+            values[in_version] = version_values
+            idb_versions[version].expand(
+                SCETime(coarse=headers["scet_coarse"][in_version], fine=headers["scet_fine"][in_version])
+            )
+
+        return headers, values, parameters, idb_versions
+
     @classmethod
     def from_levelb(cls, levelb, *, parent=""):
         pass
@@ -1068,9 +1211,9 @@ class DefaultProduct(GenericProduct, L1Mixin, L2Mixin):
 
         reshape_nixs = {"NIX00103", "NIX00104"}
         reshape = False
-        if reshape_nixs.intersection(packets.data[0].__dict__.keys()):
+        if reshape_nixs.intersection(packets.parameters.keys()):
             reshape = True
-        for nix, param in packets.data[0].__dict__.items():
+        for nix, param in packets.parameters.items():
             name = param.idb_info.get_product_attribute_name()
             data.add_basic(name=name, nix=nix, attr="value", packets=packets, reshape=reshape)
 
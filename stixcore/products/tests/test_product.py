@@ -0,0 +1,107 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from astropy.table.operations import unique, vstack
+from astropy.table.table import QTable
+
+from stixcore.products.product import GenericProduct
+from stixcore.time import SCETime, SCETimeDelta, SCETimeRange
+
+
+def _legacy_add(self, other):
+    """Table merge of the former (row loop based) `GenericProduct.__add__` as reference."""
+    other_control = other.control[:]
+    other_data = other.data[:]
+    self_control = self.control[:]
+    self_data = self.data[:]
+
+    other_control["old_index"] = [f"o{i}" for i in other_control["index"]]
+    self_control["old_index"] = [f"s{i}" for i in self_control["index"]]
+    other_data["old_index"] = [f"o{i}" for i in other_data["control_index"]]
+    self_data["old_index"] = [f"s{i}" for i in self_data["control_index"]]
+
+    control = vstack((self_control, other_control))
+    data = vstack((self_data, other_data))
+
+    data["time_float"] = np.around((data["time"] - data["time"].min()).as_float().to("cs"))
+    data = unique(data, keys=["time_float"])
+    data.remove_column("time_float")
+
+    newids = dict()
+    data["control_index"] = data["control_index"].astype(np.min_scalar_type(len(control)))
+    for row in data:
+        oid = row["old_index"]
+        if oid not in newids:
+            newids[oid] = len(newids)
+        row["control_index"] = newids[oid]
+
+    del_rows = list()
+    for idx, row in enumerate(control):
+        oid = row["old_index"]
+        if oid not in newids:
+            del_rows.append(idx)
+            continue
+        row["index"] = newids[oid]
+
+    control.remove_rows(del_rows)
+    control.sort("index")
+
+    del control["old_index"]
+    del data["old_index"]
+    return control, data
+
+
+def _product(start, n_control, n_samples, index_start=0):
+    control = QTable()
+    control["index"] = np.arange(index_start, index_start + n_control, dtype=np.uint16)
+    control["num_samples"] = np.full(n_control, n_samples, dtype=np.uint16)
+    control["raw_file"] = [f"raw_{start}_{i}.xml" for i in range(n_control)]
+
+    n = n_control * n_samples
+    data = QTable()
+    data["time"] = SCETime(coarse=start + 4 * np.arange(n), fine=np.arange(n) % 3)
+    data["timedel"] = SCETimeDelta(np.full(n, 4 * 2**16, dtype=np.int32))
+    data["control_index"] = np.repeat(control["index"], n_samples)
+    data["counts"] = np.arange(start, start + n, dtype=np.uint32)
+
+    return GenericProduct(
+        service_type=21,
+        service_subtype=6,
+        ssid=30,
+        control=control,
+        data=data,
+        idb_versions=defaultdict(SCETimeRange),
+        level="L0",
+    )
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ((1000, 5, 8, 0), (1000 + 4 * 20, 5, 8, 0)),  # partly overlapping
+        ((1000, 5, 8, 0), (1000 + 4 * 40, 5, 8, 0)),  # consecutive
+        ((1000 + 4 * 40, 5, 8, 3), (1000, 5, 8, 0)),  # other before self
+        ((1000, 5, 8, 0), (1000 + 4 * 8, 2, 8, 7)),  # other covered by self
+        ((1000, 1, 1, 0), (1000, 1, 1, 0)),  # identical
+    ],
+)
+def test_add_equivalence(first, second):
+    a = _product(*first)
+    b = _product(*second)
+
+    res = a + b
+    control, data = _legacy_add(a, b)
+
+    assert res.control.colnames == control.colnames
+    for name in control.colnames:
+        assert res.control[name].dtype == control[name].dtype
+        assert np.array_equal(res.control[name], control[name])
+
+    assert res.data.colnames == data.colnames
+    assert res.data["control_index"].dtype == data["control_index"].dtype
+    for name in ["control_index", "counts"]:
+        assert np.array_equal(res.data[name], data[name])
+    assert np.array_equal(res.data["time"].as_float(), data["time"].as_float())
+    assert np.array_equal(res.data["timedel"].as_float(), data["timedel"].as_float())
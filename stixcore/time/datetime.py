@@ -4,8 +4,10 @@ Array like time objects
 
 import logging
 import operator
+from datetime import timezone
 
 import numpy as np
+from spiceypy.utils.exceptions import SpiceyError
 from sunpy.time.timerange import TimeRange
 
 import astropy.units as u
@@ -450,9 +452,16 @@ class SCETime(SCETBase):
         """
 
         try:
-            utc = [Spice.instance.scet_to_datetime(t.to_string()) for t in self]
-        except TypeError:
-            utc = Spice.instance.scet_to_datetime(self.to_string())
+            utc64 = Spice.instance.scet_to_datetime64(self.coarse, self.fine)
+            utc = [t.replace(tzinfo=timezone.utc) for t in np.atleast_1d(utc64).astype(object)]
+            if self.shape == ():
+                utc = utc[0]
+        except (ValueError, SpiceyError) as e:
+            logger.debug(f"Vectorised SCET conversion failed falling back to spice: {e}")
+            try:
+                utc = [Spice.instance.scet_to_datetime(t.to_string()) for t in self]
+            except TypeError:
+                utc = Spice.instance.scet_to_datetime(self.to_string())
 
         kernel_date = Spice.instance.get_mk_date(meta_kernel_type="flown")
 
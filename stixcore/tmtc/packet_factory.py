@@ -1,5 +1,7 @@
 from binascii import unhexlify
 
+import numpy as np
+
 from stixcore.tmtc.packets import GenericPacket, GenericTMPacket, SourcePacketHeader
 
 __all__ = [
@@ -91,6 +93,9 @@ class TMTCPacketFactory(BaseFactory):
     def __call__(self, data, **kwargs):
         if isinstance(data, str):
             data = unhexlify(data)
+        elif isinstance(data, np.ndarray):
+            # raw binary level b data: no copy
+            data = memoryview(data)
         sph = SourcePacketHeader(data)
         packet = self._check_registered(sph)
         return self.tm_packet_factory(packet, **kwargs)
@@ -9,7 +9,7 @@ from stixcore.idb.idb import IDB
 from stixcore.idb.manager import IDBManager
 from stixcore.time import SCETime
 from stixcore.tmtc.parameter import CompressedParameter, EngineeringParameter, Parameter
-from stixcore.tmtc.parser import parse_binary, parse_bitstream, parse_variable
+from stixcore.tmtc.parser import parse_binary, parse_bitstream, parse_plan, parse_variable
 
 __all__ = [
     "TMTC",
@@ -21,7 +21,11 @@ __all__ = [
     "TCPacket",
     "GenericTMPacket",
     "PacketSequence",
+    "ParameterColumn",
+    "PacketParameter",
     "SequenceFlag",
+    "PacketFilter",
+    "scan_tm_header",
 ]
 
 from stixcore.util.logging import get_logger
@@ -118,6 +122,8 @@ class SourcePacketHeader:
         res = parse_binary(data, SOURCE_PACKET_HEADER_STRUCTURE)
         [setattr(self, key, value) for key, value in res["fields"].items()]
         self.bitstream = res["bitstream"]
+        # keep the raw data for direct (no copy) access by the parser
+        self.binary = data if isinstance(data, (bytes, bytearray, memoryview)) else self.bitstream.tobytes()
 
         # if (self.data_length + 7) * 8 != self.bitstream.len:
         #     raise ValueError(f'Source packet header data length: {self.data_length} '
@@ -132,7 +138,7 @@ class SourcePacketHeader:
         return (self.version << 13) | (self.packet_type << 12) | (self.header_flag << 11) | self.apid
 
     def __repr__(self):
-        param_names_values = [f"{k}={v}" for k, v in self.__dict__.items() if k != "bitstream"]
+        param_names_values = [f"{k}={v}" for k, v in self.__dict__.items() if k not in ("bitstream", "binary")]
         return f"{self.__class__.__name__}({', '.join(param_names_values)})"
 
     def __str__(self):
@@ -363,6 +369,144 @@ class TCPacket(GenericPacket):
         return sph.packet_category == 12 and sph.process_id == 90
 
 
+def scan_tm_header(binary, idb=None, *, pi1_val=True):
+    """Read the source packet header, TM data header and PI1 value of a TM packet.
+
+    The fields are read directly from the first bytes of the packet without creating a
+    `TMPacket`, `TMDataHeader` or `SCETime`.
+
+    Parameters
+    ----------
+    binary : `bytes` or hex `str`
+        the binary data of the packet
+    idb : `~stixcore.idb.idb.IDB`, optional
+        the IDB to look up the PI1 position, by default the IDB valid for the packet time
+    pi1_val : `bool`, optional
+        read the PI1 value (needs the IDB), by default True
+
+    Returns
+    -------
+    `dict`
+        the header fields as in `SourcePacketHeader` and `TMDataHeader` and the `pi1_val`
+        (`None` if the packet type has no PI1 value)
+    """
+    if isinstance(binary, str):
+        binary = bytes.fromhex(binary.removeprefix("0x"))
+
+    word0, word1, data_length = (int.from_bytes(binary[i : i + 2], "big") for i in (0, 2, 4))
+    header = {
+        "version": word0 >> 13,
+        "packet_type": (word0 >> 12) & 0x1,
+        "header_flag": (word0 >> 11) & 0x1,
+        "process_id": (word0 >> 4) & 0x7F,
+        "packet_category": word0 & 0xF,
+        "sequence_flag": word1 >> 14,
+        "sequence_count": word1 & 0x3FFF,
+        "data_length": data_length,
+        "pus_version": (binary[6] >> 4) & 0x7,
+        "service_type": binary[7],
+        "service_subtype": binary[8],
+        "destination_id": binary[9],
+        "scet_coarse": int.from_bytes(binary[10:14], "big"),
+        "scet_fine": int.from_bytes(binary[14:16], "big"),
+    }
+
+    header["pi1_val"] = None
+    if not pi1_val:
+        return header
+
+    if idb is None:
+        idb = IDBManager.instance.get_idb(obt=SCETime(header["scet_coarse"], header["scet_fine"]))
+    pi1_pos = idb.get_packet_pi1_val_position(header["service_type"], header["service_subtype"])
+    if pi1_pos:
+        start = int(pi1_pos.PIC_PI1_OFF) * 8
+        end = start + pi1_pos.width
+        first, last = start >> 3, (end + 7) >> 3
+        value = int.from_bytes(binary[first:last], "big") >> ((last << 3) - end)
+        header["pi1_val"] = value & ((1 << pi1_pos.width) - 1)
+    return header
+
+
+class PacketFilter:
+    """A predicate to select TM packets based on their headers only.
+
+    Each criterion is optional; a packet is selected if it matches all given criteria.
+
+    Examples
+    --------
+    >>> from stixcore.tmtc.packets import PacketFilter
+    >>> lc_and_flare = PacketFilter(service_type=21, service_subtype=6, ssid=(30, 34))
+    >>> lc_and_flare({"service_type": 21, "service_subtype": 6, "pi1_val": 30,
+    ...               "scet_coarse": 0, "scet_fine": 0})
+    True
+    """
+
+    def __init__(self, *, service_type=None, service_subtype=None, ssid=None, start=None, end=None):
+        """Create a packet filter.
+
+        Parameters
+        ----------
+        service_type : `int` or iterable of `int`, optional
+            the accepted service types
+        service_subtype : `int` or iterable of `int`, optional
+            the accepted service subtypes
+        ssid : `int` or iterable of `int`, optional
+            the accepted SSIDs (PI1 values)
+        start : `~stixcore.time.SCETime`, optional
+            the earliest accepted packet time (inclusive)
+        end : `~stixcore.time.SCETime`, optional
+            the latest accepted packet time (exclusive)
+        """
+        self.service_type = self._as_set(service_type)
+        self.service_subtype = self._as_set(service_subtype)
+        self.ssid = self._as_set(ssid)
+        self.start = None if start is None else int(start.as_bintime())
+        self.end = None if end is None else int(end.as_bintime())
+
+    @staticmethod
+    def _as_set(value):
+        if value is None:
+            return None
+        return set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+
+    @property
+    def needs_pi1_val(self):
+        return self.ssid is not None
+
+    def __call__(self, header):
+        """Check if a packet with the given headers is selected.
+
+        Parameters
+        ----------
+        header : `dict`
+            the packet headers see `scan_tm_header`
+
+        Returns
+        -------
+        `bool`
+            True if the packet is selected
+        """
+        if self.service_type is not None and header["service_type"] not in self.service_type:
+            return False
+        if self.service_subtype is not None and header["service_subtype"] not in self.service_subtype:
+            return False
+        if self.ssid is not None and header["pi1_val"] not in self.ssid:
+            return False
+        if self.start is not None or self.end is not None:
+            btime = (header["scet_coarse"] << 16) + header["scet_fine"]
+            if self.start is not None and btime < self.start:
+                return False
+            if self.end is not None and btime >= self.end:
+                return False
+        return True
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(service_type={self.service_type}, "
+            f"service_subtype={self.service_subtype}, ssid={self.ssid}, start={self.start}, end={self.end})"
+        )
+
+
 class GenericTMPacket:
     """Generic TM packet all specific TM packets are subclasses of this class.
 
@@ -536,18 +680,12 @@ class GenericTMPacket:
         )
         self.spid = packet_info.PID_SPID
 
-        tree = {}
-        if packet_info.is_variable():
-            tree = idb.get_variable_structure(
-                self.data_header.service_type, self.data_header.service_subtype, self.pi1_val
-            )
-        else:
-            tree = idb.get_static_structure(
-                self.data_header.service_type, self.data_header.service_subtype, self.pi1_val
-            )
+        plan = idb.get_parse_plan(self.data_header.service_type, self.data_header.service_subtype, self.pi1_val)
 
         try:
-            data, structure = parse_variable(self.source_packet_header.bitstream, tree)
+            data, structure = parse_plan(
+                self.source_packet_header.binary, plan, pos=self.source_packet_header.bitstream.pos
+            )
         except Exception as e:
             logger.error(
                 f"Packet parsing error: {self}\nidb version:{idb}\npacket data:"
@@ -695,18 +833,223 @@ class GenericTMPacket:
         return p
 
 
+class ParameterColumn:
+    """All values of one parameter (NIX) of a packet sequence stored as contiguous arrays.
+
+    The raw, engineering, decompressed and error values of all packets are concatenated into one
+    array each (as returned by `PacketSequence.get_value`), `offsets` hold the start of each packet
+    for repeated and variable length parameters. Indexing returns a lightweight view of the
+    parameter in a single packet.
+
+    Attributes
+    ----------
+    name : `str`
+        The parameter name.
+    idb_info : `stixcore.idb.idb.IDBParameter`
+        The IDB definition of the parameter (from the first packet).
+    default_attr : `str` or `None`
+        The attribute used by `PacketSequence.get_value` if not specified: 'engineering' for
+        calibrated, 'decompressed' for compressed, 'value' for plain parameters and `None` if the
+        packet data is not a parameter at all.
+    unit : `str` or `None`
+        The unit of the engineering values.
+    skm : `list`
+        The (s, k, m) compression parameters of each packet for compressed parameters.
+    """
+
+    def __init__(self, name, params):
+        """Create the column from the parameter of each packet.
+
+        Parameters
+        ----------
+        name : `str`
+            The parameter name.
+        params : `list`
+            The parameter (or packet data entry) of each packet.
+        """
+        self.name = name
+        first = params[0]
+        self.idb_info = getattr(first, "idb_info", None)
+        self.unit = getattr(first, "unit", None)
+        self.skm = [p.skm for p in params] if isinstance(first, CompressedParameter) else None
+
+        if isinstance(first, EngineeringParameter):
+            self.default_attr = "engineering"
+            attrs = ("value", "engineering")
+        elif isinstance(first, CompressedParameter):
+            self.default_attr = "decompressed"
+            attrs = ("value", "decompressed", "error")
+        elif isinstance(first, Parameter):
+            self.default_attr = "value"
+            attrs = ("value",)
+        else:
+            self.default_attr = None
+            attrs = ()
+            self.objects = list(params)
+
+        self.columns = dict()
+        self.offsets = dict()
+        self.scalar = dict()
+        for attr in attrs:
+            self.columns[attr], self.offsets[attr], self.scalar[attr] = self._concatenate(
+                [getattr(p, attr) for p in params]
+            )
+        self._len = len(params)
+
+    @staticmethod
+    def _concatenate(values):
+        flat = []
+        counts = np.empty(len(values), dtype=np.int64)
+        scalar = np.zeros(len(values), dtype=bool)
+        for i, v in enumerate(values):
+            if isinstance(v, list):
+                flat.extend(v)
+                counts[i] = len(v)
+            else:
+                flat.append(v)
+                ndim = np.ndim(v)
+                counts[i] = np.shape(v)[0] if ndim > 0 else 1
+                scalar[i] = ndim == 0
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return np.hstack(flat), offsets, scalar
+
+    def set_decompressed(self, decompressed, error, skm):
+        """Attach the decompressed values of all packets to the column.
+
+        Parameters
+        ----------
+        decompressed : `numpy.ndarray`
+            The decompressed values aligned with the raw values.
+        error : `numpy.ndarray`
+            The variance of the decompressed values.
+        skm : `list`
+            The (s, k, m) compression parameters of each packet.
+        """
+        for attr, column in (("decompressed", decompressed), ("error", error)):
+            self.columns[attr] = column
+            self.offsets[attr] = self.offsets["value"]
+            self.scalar[attr] = np.zeros(self._len, dtype=bool)
+        self.skm = list(skm)
+        self.default_attr = "decompressed"
+
+    def get_value(self, attr=None):
+        """Get the values of all packets as one array.
+
+        Parameters
+        ----------
+        attr : `str`, optional
+            The attribute e.g. 'value', 'engineering', 'decompressed' or 'error', by default
+            `default_attr`.
+
+        Returns
+        -------
+        `numpy.ndarray` | `astropy.units.Quantity` | `list`
+            The concatenated values or the packet data entries if not a parameter.
+        """
+        attr = self.default_attr if attr is None else attr
+        if attr is None:
+            return list(self.objects)
+        try:
+            # a copy so callers can modify the values in place without changing the sequence
+            return self.columns[attr].copy()
+        except KeyError:
+            raise AttributeError(f"'{self.name}' has no attribute '{attr}'")
+
+    def packet_value(self, attr, index):
+        """Get the values of a single packet.
+
+        Parameters
+        ----------
+        attr : `str`
+            The attribute e.g. 'value', 'engineering', 'decompressed' or 'error'.
+        index : `int`
+            The packet index.
+
+        Returns
+        -------
+        `any`
+            The scalar value or the array of values for repeated parameters.
+        """
+        if attr not in self.columns:
+            raise AttributeError(f"'{self.name}' has no attribute '{attr}'")
+        column = self.columns[attr]
+        offsets = self.offsets[attr]
+        if self.scalar[attr][index]:
+            return column[offsets[index]]
+        return column[offsets[index] : offsets[index + 1]]
+
+    def __getitem__(self, index):
+        if self.default_attr is None:
+            return self.objects[index]
+        if not -self._len <= index < self._len:
+            raise IndexError(f"packet index {index} out of range")
+        return PacketParameter(self, index % self._len)
+
+    def __len__(self):
+        return self._len
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name}, {self._len} packets)"
+
+
+class PacketParameter:
+    """A view on a parameter of a single packet within a `ParameterColumn`."""
+
+    def __init__(self, column, index):
+        self.column = column
+        self.index = index
+
+    @property
+    def name(self):
+        return self.column.name
+
+    @property
+    def idb_info(self):
+        return self.column.idb_info
+
+    @property
+    def unit(self):
+        return self.column.unit
+
+    @property
+    def skm(self):
+        return self.column.skm[self.index] if self.column.skm is not None else None
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return self.column.packet_value(attr, self.index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name}, packet={self.index})"
+
+
 class PacketSequence:
     """
     A sequence of packets
+
+    After parsing all parameters are stored column wise (see `ParameterColumn`) so no per packet
+    parameter objects are kept.
     """
 
-    def __init__(self, packets):
-        self.source_headers = []
-        self.data_headers = []
-        self.data = []
+    def __init__(self, packets, *, keep_packets=True):
+        """Create a sequence of (parsed, decompressed and calibrated) packets.
+
+        Parameters
+        ----------
+        packets : `list` of `GenericTMPacket`
+            the packets
+        keep_packets : `bool`, optional
+            keep a reference to the packets (e.g. for exporting), by default True
+        """
+        data = []
+        source_headers = []
+        data_headers = []
         self.spid = []
         self.pi1_val = []
-        self.packets = packets
+        self.decompression_parameters = []
+        self.packets = packets if keep_packets else None
         for packet in packets:
             try:
                 has_data = getattr(packet.data.get("NIX00089"), "value", 1) > 0
@@ -715,44 +1058,40 @@ class PacketSequence:
             if has_data:
                 self.spid.append(packet.spid)
                 self.pi1_val.append(packet.pi1_val)
-                self.source_headers.append(packet.source_packet_header)
-                self.data_headers.append(packet.data_header)
-                self.data.append(packet.data)
+                self.decompression_parameters.append(packet.get_decompression_parameter())
+                source_headers.append(packet.source_packet_header)
+                data_headers.append(packet.data_header)
+                data.append(packet.data)
             else:
                 logger.warn("Dropping empty packet (NIX00089 == 0)")
 
+        self.headers = dict()
+        for name in SOURCE_PACKET_HEADER_STRUCTURE.keys():
+            self.headers[name] = np.array([getattr(h, name, None) for h in source_headers])
+        for name in TM_DATA_HEADER_STRUCTURE.keys():
+            self.headers[name] = np.array([getattr(h, name, None) for h in data_headers])
+
+        self.parameters = dict()
+        if data:
+            for name in data[0].__dict__.keys():
+                self.parameters[name] = ParameterColumn(name, [getattr(d, name) for d in data])
+
+    def __len__(self):
+        return len(self.spid)
+
     def get(self, name):
         try:
             if name in {"spid", "pi1_val"}:
                 return self.__getattribute__(name)
-            elif name in SOURCE_PACKET_HEADER_STRUCTURE.keys():
-                return [header.__getattribute__(name) for header in self.source_headers]
-            elif name in TM_DATA_HEADER_STRUCTURE.keys():
-                return [header.__getattribute__(name) for header in self.data_headers]
+            elif name in self.headers:
+                return self.headers[name]
             else:
-                return [data.__getattribute__(name) for data in self.data]
+                return self.parameters[name]
         except KeyError:
             logger.debug("Key %s not found", name)
 
     def get_value(self, name, attr=None):
-        if attr is None:
-            if isinstance(self.data[0].__getattribute__(name), EngineeringParameter):
-                attr = "engineering"
-            elif isinstance(self.data[0].__getattribute__(name), CompressedParameter):
-                attr = "decompressed"
-            elif isinstance(self.data[0].__getattribute__(name), Parameter):
-                attr = "value"
-            else:
-                return [data.__getattribute__(name) for data in self.data]
-
-        res = []
-        for d in self.data:
-            p = d.__getattribute__(name).__getattribute__(attr)
-            if isinstance(p, list):
-                res.extend(p)
-            else:
-                res.append(p)
-        return np.hstack(res)
+        return self.parameters[name].get_value(attr)
 
     @property
     def service_type(self):
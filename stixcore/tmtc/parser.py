@@ -1,7 +1,8 @@
+import binascii
 from collections import defaultdict
 
 import numpy as np
-from bitstring import ConstBitStream
+from bitstring import ConstBitStream, ReadError
 
 from stixcore.tmtc.parameter import Parameter
 from stixcore.util.logging import get_logger
@@ -162,9 +163,12 @@ def parse_binary(binary, structure):
     return parse_bitstream(bitstream, structure)
 
 
-def _parse_tree(bitstream, parent, fields):
+def _parse_tree(bitstream, parent, fields, counter=None):
     """Recursive parsing of TM data.
 
+    The shared parse tree is only read, the live repeater count is passed down the recursion so
+    several threads can parse against the same (cached) tree.
+
     Parameters
     ----------
     bitstream : `bitstream.ConstBitstream`
@@ -173,10 +177,13 @@ def _parse_tree(bitstream, parent, fields):
         the dynamic parse tree defined by the IDB
     fields : `list[stixcore.tmtc.parser.Parameter]`
         The parsed parameters - mutable out data.
+    counter : `int`, optional
+        how often the children of parent are repeated, by default `parent.counter`
     """
     if not parent:
         return
-    counter = parent.counter
+    if counter is None:
+        counter = parent.counter
 
     for i in range(0, counter):
         for pnode in parent.children:
@@ -197,9 +204,8 @@ def _parse_tree(bitstream, parent, fields):
                 is_valid = False
                 if isinstance(num_children, int):
                     if num_children > 0:
-                        pnode.counter = num_children
                         is_valid = True
-                        _parse_tree(bitstream, pnode, children)
+                        _parse_tree(bitstream, pnode, children, num_children)
                 if not is_valid:
                     if pnode.name != "NIXD0159":
                         # repeater NIXD0159 can be zero according to STIX ICD-0812-ESC Table 93 P123
@@ -234,6 +240,228 @@ def parse_variable(bitstream, tree):
     return (merged, fields)
 
 
+def _read_bits(data, pos, width, signed):
+    """Read an integer of `width` bits starting at bit `pos` from a bytes like object."""
+    end = pos + width
+    if pos < 0 or end > len(data) * 8:
+        raise ReadError(f"Reading off the end of the data. Tried to read {width} bits at position {pos}.")
+    first = pos >> 3
+    last = (end + 7) >> 3
+    value = (int.from_bytes(data[first:last], "big") >> ((last << 3) - end)) & ((1 << width) - 1)
+    if signed and width and value >> (width - 1):
+        value -= 1 << width
+    return value
+
+
+def _execute_plan(data, instructions, start, stop, pos, fields):
+    """Execute the read instructions `start` to `stop` of a compiled parse plan.
+
+    Parameters
+    ----------
+    data : `bytes`
+        Input binary data
+    instructions : `tuple`
+        see `~stixcore/idb/idb/IDBParsePlan.instructions`
+    start : `int`
+        index of the first instruction to execute
+    stop : `int`
+        index after the last instruction to execute
+    pos : `int`
+        current bit position in the data
+    fields : `list[stixcore.tmtc.parser.Parameter]`
+        The parsed parameters - mutable out data.
+
+    Returns
+    -------
+    `int`
+        the bit position after the last read
+    """
+    i = start
+    while i < stop:
+        pnode, is_static, offset, width, signed, end = instructions[i]
+        # static packets: each parameter describes its own absolute position
+        # dynamic packets might jump back or forward
+        pos = offset if is_static else pos + offset
+
+        raw_val = _read_bits(data, pos, width, signed)
+        pos += width
+        children = []
+        if end > i + 1:
+            if raw_val > 0:
+                for _ in range(raw_val):
+                    pos = _execute_plan(data, instructions, i + 1, end, pos, children)
+            elif pnode.name != "NIXD0159":
+                # repeater NIXD0159 can be zero according to STIX ICD-0812-ESC Table 93 P123
+                logger.warning(f"Repeater {pnode.name}  has an invalid value: {raw_val}")
+
+        fields.append(Parameter(name=pnode.name, value=raw_val, idb_info=pnode.parameter, children=children))
+        i = end
+    return pos
+
+
+def parse_plan(bitstream, plan, pos=None):
+    """Parse binary data using a compiled parse plan.
+
+    Gives the same result as `parse_variable` for the tree the plan was compiled from but
+    reads directly from the underlying bytes and does not touch the (shared) parse tree.
+
+    Parameters
+    ----------
+    bitstream : `bitstream.ConstBitstream` or `bytes` or `memoryview`
+        Input binary data
+    plan : `~stixcore/idb/idb/IDBParsePlan`
+        the compiled parse plan defined by the IDB
+    pos : `int`, optional
+        the bit position to start parsing, by default the current position of the bitstream or 0
+        for bytes
+
+    Returns
+    -------
+    `PacketData`
+        The parsed (nested) telemetry packet parameters.
+    """
+    if isinstance(bitstream, (bytes, bytearray, memoryview)):
+        data, pos = bitstream, pos or 0
+    else:
+        data, pos = bitstream.tobytes(), bitstream.pos if pos is None else pos
+
+    fields = []
+    pos = _execute_plan(data, plan.instructions, 0, len(plan.instructions), pos, fields)
+    if not isinstance(bitstream, (bytes, bytearray, memoryview)):
+        bitstream.pos = pos
+
+    _keep_order(fields, 0)
+    pd = PacketData.parameter_list_2_PacketData(fields)
+    merged = pd.merge()
+    return (merged, fields)
+
+
+def binaries_to_buffer(binaries):
+    """Lay out a sequence of packets into a 2D byte buffer one row per packet.
+
+    Parameters
+    ----------
+    binaries : `list` of `bytes` or `numpy.ndarray` or hex `str`
+        The binary packets e.g. the `data` column of a level binary product.
+
+    Returns
+    -------
+    `tuple` (`numpy.ndarray`, `numpy.ndarray`)
+        The (n, max_length) uint8 buffer (shorter packets are zero padded) and the length of each
+        packet in bytes.
+    """
+    binaries = [np.frombuffer(binascii.unhexlify(b) if isinstance(b, str) else b, dtype=np.uint8) for b in binaries]
+    lengths = np.array([len(b) for b in binaries], dtype=np.int64)
+    width = lengths.max() if len(lengths) > 0 else 0
+    if np.all(lengths == width):
+        buffer = np.stack(binaries) if binaries else np.zeros((0, 0), dtype=np.uint8)
+    else:
+        buffer = np.zeros((len(binaries), width), dtype=np.uint8)
+        for i, b in enumerate(binaries):
+            buffer[i, : len(b)] = b
+    return buffer, lengths
+
+
+def _read_bits_batch(buffer, lengths, pos, width, signed):
+    """Read an integer of up to 64 bits starting at bit `pos` from each row of a byte buffer."""
+    end = pos + width
+    if width > 64:
+        raise ValueError(f"Batch reading is limited to 64 bits, tried to read {width} bits.")
+    if pos < 0 or np.any(lengths * 8 < end):
+        raise ReadError(f"Reading off the end of the data. Tried to read {width} bits at position {pos}.")
+    first = pos >> 3
+    last = (end + 7) >> 3
+
+    # up to 8 trailing bytes fit into uint64, an unaligned 64 bit read spans one more leading byte
+    value = np.zeros(buffer.shape[0], dtype=np.uint64)
+    for b in range(max(first, last - 8), last):
+        value = (value << np.uint64(8)) | buffer[:, b]
+    value = value >> np.uint64((last << 3) - end)
+    if last - first > 8:
+        value |= buffer[:, first].astype(np.uint64) << np.uint64(64 - ((last << 3) - end))
+    value &= np.uint64((1 << width) - 1)
+    if signed:
+        value = value.astype(np.int64)
+        if 0 < width < 64:
+            value[value >= (1 << (width - 1))] -= 1 << width
+        return value
+    return value if width == 64 else value.astype(np.int64)
+
+
+def parse_bitstream_batch(buffer, structure, lengths=None, pos=0):
+    """Parse the same structure from each row of a byte buffer at once.
+
+    Vectorized counterpart to `parse_bitstream` for many packets with a fixed layout.
+
+    Parameters
+    ----------
+    buffer : `numpy.ndarray`
+        (n, m) uint8 buffer one row per packet, see `binaries_to_buffer`
+    structure : dict
+        Name and data type mapping e.g. `{'myparam': uint:8}`
+    lengths : `numpy.ndarray`, optional
+        the valid length of each row in bytes, by default the full row
+    pos : `int`, optional
+        the bit position to start reading, by default 0
+
+    Returns
+    -------
+    dict
+        The parsed data fields as arrays
+    """
+    if lengths is None:
+        lengths = np.full(buffer.shape[0], buffer.shape[1])
+    parsed = {}
+    for name, format in structure.items():
+        dtype, width = format.split(":")
+        width = int(width)
+        if dtype != "pad":
+            parsed[name] = _read_bits_batch(buffer, lengths, pos, width, dtype == "int")
+        pos += width
+    return parsed
+
+
+def parse_static_batch(buffer, plan, lengths=None):
+    """Parse many static (fixed layout) packets at once using a compiled parse plan.
+
+    Every parameter of a static packet sits at a known bit position so each parameter is read
+    for all packets at once with NumPy shift and mask operations.
+
+    Parameters
+    ----------
+    buffer : `numpy.ndarray`
+        (n, m) uint8 buffer one row per packet, see `binaries_to_buffer`
+    plan : `~stixcore/idb/idb/IDBParsePlan`
+        the compiled parse plan of a static packet
+    lengths : `numpy.ndarray`, optional
+        the valid length of each row in bytes, by default the full row
+
+    Returns
+    -------
+    `numpy.ndarray`
+        Structured array with one (integer) field per parameter in order of the plan.
+
+    Raises
+    ------
+    ValueError
+        if the plan is not for a static packet
+    """
+    if not plan.is_static:
+        raise ValueError("Batch parsing is only possible for static packets")
+    if lengths is None:
+        lengths = np.full(buffer.shape[0], buffer.shape[1])
+
+    columns = {}
+    for pnode, _, offset, width, signed, _ in plan.instructions:
+        if pnode.name not in columns:
+            columns[pnode.name] = _read_bits_batch(buffer, lengths, offset, width, signed)
+
+    res = np.empty(buffer.shape[0], dtype=[(name, col.dtype) for name, col in columns.items()])
+    for name, col in columns.items():
+        res[name] = col
+    return res
+
+
 def _keep_order(fields, counter):
     for p in fields:
         counter += 1
@@ -1,17 +1,28 @@
+from types import SimpleNamespace
+
 import bitstring
+import numpy as np
 import pytest
 
+import astropy.units as u
+
 from stixcore.data.test import test_data
 from stixcore.idb.manager import IDBManager
+from stixcore.time import SCETime
 from stixcore.tmtc.packets import (
     SOURCE_PACKET_HEADER_STRUCTURE,
     TC_DATA_HEADER_STRUCTURE,
     TM_DATA_HEADER_STRUCTURE,
+    PacketFilter,
+    PacketSequence,
     SourcePacketHeader,
     TCPacket,
     TMDataHeader,
     TMPacket,
+    scan_tm_header,
 )
+from stixcore.tmtc.parameter import CompressedParameter, EngineeringParameter, Parameter
+from stixcore.tmtc.parser import PacketData
 from stixcore.tmtc.tm.tm_1 import TM_1_1
 
 
@@ -84,3 +95,79 @@ def test_tm_1_1(idb):
     assert packet.source_packet_header.packet_category == 1
     assert packet.data_header.service_type == 1
     assert packet.data_header.service_subtype == 1
+
+
+def test_scan_tm_header(idb):
+    combind_structures = {**SOURCE_PACKET_HEADER_STRUCTURE, **TM_DATA_HEADER_STRUCTURE}
+    test_fmt = ", ".join(combind_structures.values())
+    test_values = {n: 2 ** int(v.split(":")[-1]) - 1 for n, v in combind_structures.items()}
+    test_binary = bitstring.pack(test_fmt, *test_values.values())
+    header = scan_tm_header(test_binary.tobytes(), pi1_val=False)
+    assert all([header[key] == value for key, value in test_values.items() if not key.startswith("spare")])
+    assert header["pi1_val"] is None
+
+    packet = TM_1_1("0x0da1c066000d100101782628a9c4e71e1dacc0a0", idb=idb)
+    header = scan_tm_header("0x0da1c066000d100101782628a9c4e71e1dacc0a0", idb=idb)
+    assert header["service_type"] == packet.data_header.service_type
+    assert header["scet_coarse"] == packet.data_header.scet_coarse
+    assert header["scet_fine"] == packet.data_header.scet_fine
+    assert header["pi1_val"] == packet.pi1_val
+
+
+def test_packet_filter():
+    header = {"service_type": 21, "service_subtype": 6, "pi1_val": 30, "scet_coarse": 100, "scet_fine": 5}
+    assert PacketFilter()(header)
+    assert PacketFilter(service_type=21, service_subtype=6, ssid=(30, 34))(header)
+    assert not PacketFilter(service_type=3)(header)
+    assert not PacketFilter(ssid=[31, 34])(header)
+    assert PacketFilter(start=SCETime(100, 5), end=SCETime(101, 0))(header)
+    assert not PacketFilter(start=SCETime(100, 6))(header)
+    assert not PacketFilter(end=SCETime(100, 5))(header)
+    assert PacketFilter(ssid=30).needs_pi1_val
+    assert not PacketFilter(service_type=21).needs_pi1_val
+
+
+def test_packet_sequence():
+    def packet(i, n):
+        data = PacketData()
+        data.NIX00089 = Parameter("NIX00089", n, None)
+        data.NIX00001 = Parameter("NIX00001", i, None)
+        data.NIX00002 = Parameter("NIX00002", [i] * n, None)
+        data.NIX00003 = EngineeringParameter(name="NIX00003", value=i, idb_info=None, engineering=i * 2.0, unit="s")
+        data.NIX00004 = CompressedParameter(
+            name="NIX00004",
+            value=[i] * n,
+            idb_info=None,
+            decompressed=np.full(n, i * 10),
+            error=np.ones(n),
+            skm=(i, 0, 0),
+        )
+        header = SimpleNamespace(scet_coarse=100 + i, scet_fine=i)
+        return SimpleNamespace(
+            data=data,
+            spid=1,
+            pi1_val=i,
+            source_packet_header=SimpleNamespace(),
+            data_header=header,
+            get_decompression_parameter=lambda: None,
+        )
+
+    packets = PacketSequence([packet(0, 2), packet(1, 0), packet(2, 3)], keep_packets=False)
+    # the empty packet is dropped
+    assert len(packets) == 2
+    assert packets.packets is None
+    assert packets.get("pi1_val") == [0, 2]
+    assert packets.get("scet_coarse").tolist() == [100, 102]
+    assert packets.get_value("NIX00001").tolist() == [0, 2]
+    assert packets.get_value("NIX00002").tolist() == [0, 0, 2, 2, 2]
+    assert np.all(packets.get_value("NIX00003") == [0, 4] * u.s)
+    assert packets.get_value("NIX00003", attr="value").tolist() == [0, 2]
+    assert packets.get_value("NIX00004").tolist() == [0, 0, 20, 20, 20]
+    assert packets.get_value("NIX00004", attr="error").tolist() == [1] * 5
+
+    column = packets.get("NIX00004")
+    assert len(column) == 2
+    assert [p.skm for p in column] == [(0, 0, 0), (2, 0, 0)]
+    assert column[1].decompressed.tolist() == [20, 20, 20]
+    assert packets.get("NIX00001")[-1].value == 2
+    assert packets.get("NIX99999") is None
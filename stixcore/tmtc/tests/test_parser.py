@@ -1,7 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import bitstring
 import pytest
 
-from stixcore.tmtc.parser import Parameter, parse_binary, parse_repeated, split_into_length
+from stixcore.idb.idb import IDBPacketTree, IDBParsePlan, IDBStaticParameter, IDBVariableParameter
+from stixcore.tmtc.parser import (
+    Parameter,
+    binaries_to_buffer,
+    parse_binary,
+    parse_bitstream_batch,
+    parse_plan,
+    parse_repeated,
+    parse_static_batch,
+    parse_variable,
+    split_into_length,
+)
 
 
 def test_parse_binary():
@@ -77,3 +90,182 @@ def test_parser_repeated():
     test_binary = bitstring.pack(fmt, *values)
     res = parse_repeated(test_binary, {"param": "uint:4"}, 4)
     assert res["fields"]["param"] == [[0], [1], [2], [3]]
+
+
+def _idb_param(cls, name, bin_format, **kwargs):
+    return cls(
+        PID_SPID=1,
+        PID_DESCR="test",
+        PID_TPSD=1,
+        PCF_NAME=name,
+        PCF_DESCR=name,
+        PCF_WIDTH=int(bin_format.split(":")[1]),
+        PCF_PFC=0,
+        PCF_PTC=0,
+        PCF_CURTX=None,
+        S2K_TYPE="I" if bin_format.startswith("int") else "U",
+        bin_format=bin_format,
+        **kwargs,
+    )
+
+
+def _variable_node(name, bin_format, children=None, offset=0):
+    children = children or []
+    param = _idb_param(IDBVariableParameter, name, bin_format, VPD_POS=0, VPD_OFFSET=offset, VPD_GRPSIZE=len(children))
+    return IDBPacketTree(name=name, counter=0, parameter=param, children=children)
+
+
+def _static_node(name, bin_format, offby, offbi):
+    param = _idb_param(IDBStaticParameter, name, bin_format, PLF_OFFBY=offby, PLF_OFFBI=offbi)
+    return IDBPacketTree(name=name, counter=0, parameter=param)
+
+
+def _variable_tree():
+    inner = _variable_node("NIX00003", "uint:2", [_variable_node("NIX00004", "int:7")])
+    return IDBPacketTree(
+        children=[
+            _variable_node("NIX00001", "uint:16"),
+            _variable_node("NIX00002", "uint:8", [_variable_node("NIX00005", "uint:13"), inner]),
+            _variable_node("NIXD0159", "uint:4", [_variable_node("NIX00065", "uint:3")]),
+            _variable_node("NIX00006", "uint:5", offset=3),
+        ]
+    )
+
+
+def _values(fields):
+    return [(p.name, p.value, p.order, _values(p.children)) for p in fields]
+
+
+def test_parse_plan_variable():
+    fmt = "uint:16, uint:8, uint:13, uint:2, int:7, int:7, uint:13, uint:2, uint:4, pad:3, uint:5"
+    values = [1234, 2, 100, 2, -5, 7, 8191, 0, 0, 31]
+    binary = bitstring.pack(fmt, *values)
+
+    plan = IDBParsePlan(_variable_tree())
+    assert len(plan) == 8
+
+    expected_data, expected_fields = parse_variable(bitstring.ConstBitStream(binary), _variable_tree())
+    bitstream = bitstring.ConstBitStream(binary)
+    data, fields = parse_plan(bitstream, plan)
+
+    assert bitstream.pos == bitstream.len
+    assert _values(fields) == _values(expected_fields)
+    assert data.NIX00004.value == [-5, 7]
+    assert data.NIX00005.value == [100, 8191]
+    assert data.NIX00006.value == 31
+    assert data.__dict__.keys() == expected_data.__dict__.keys()
+
+    # the plan can be executed directly on bytes and does not depend on the tree counters
+    _, fields_bytes = parse_plan(binary.tobytes(), plan)
+    assert _values(fields_bytes) == _values(expected_fields)
+
+
+def test_parse_variable_shared_tree_threads():
+    fmt = "uint:16, uint:8, uint:13, uint:2, int:7, int:7, uint:13, uint:2, uint:4, pad:3, uint:5"
+    values = [1234, 2, 100, 2, -5, 7, 8191, 0, 0, 31]
+    binaries = [bitstring.pack(fmt, *([i] + values[1:])) for i in range(32)]
+    # a second layout with a different repeater count
+    binaries.append(bitstring.pack("uint:16, uint:8, uint:13, uint:2, uint:4, pad:3, uint:5", 7, 1, 5, 0, 0, 1))
+    tree = _variable_tree()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda b: parse_variable(bitstring.ConstBitStream(b), tree)[1], binaries))
+
+    # the shared tree is not modified by parsing
+    assert [c.counter for c in tree.children] == [0, 0, 0, 0]
+    for binary, fields in zip(binaries, results):
+        _, expected = parse_variable(bitstring.ConstBitStream(binary), _variable_tree())
+        assert _values(fields) == _values(expected)
+    assert results[0][0].value == 0
+    assert results[-1][1].value == 1
+
+
+def test_parse_plan_static():
+    binary = bitstring.pack("uint:8, int:12, uint:4, uint:16", 9, -2, 5, 65535)
+    tree = IDBPacketTree(
+        children=[
+            _static_node("NIX00001", "uint:8", 0, 0),
+            _static_node("NIX00002", "int:12", 1, 0),
+            _static_node("NIX00003", "uint:4", 2, 4),
+            # overlapping read of the last two bytes
+            _static_node("NIX00004", "uint:16", 3, 0),
+            _static_node("NIX00005", "uint:8", 3, 4),
+        ]
+    )
+    _, fields = parse_plan(bitstring.ConstBitStream(binary), IDBParsePlan(tree))
+    assert [p.value for p in fields] == [9, -2, 5, 65535, 255]
+
+    _, expected_fields = parse_variable(bitstring.ConstBitStream(binary), tree)
+    assert _values(fields) == _values(expected_fields)
+
+
+def test_parse_plan_read_error():
+    binary = bitstring.pack("uint:16, uint:8, uint:13", 1234, 2, 100)
+    with pytest.raises(bitstring.ReadError):
+        parse_plan(bitstring.ConstBitStream(binary), IDBParsePlan(_variable_tree()))
+
+
+def test_parse_static_batch():
+    tree = IDBPacketTree(
+        children=[
+            _static_node("NIX00001", "uint:8", 0, 0),
+            _static_node("NIX00002", "int:12", 1, 0),
+            _static_node("NIX00003", "uint:4", 2, 4),
+            _static_node("NIX00004", "uint:32", 3, 0),
+            _static_node("NIX00005", "int:7", 7, 1),
+        ]
+    )
+    plan = IDBParsePlan(tree)
+    assert plan.is_static
+    assert not IDBParsePlan(_variable_tree()).is_static
+
+    values = [(9, -2, 5, 2**32 - 1, -64), (0, 2047, 0, 1, 63), (255, -2048, 15, 123456, 0)]
+    binaries = [bitstring.pack("uint:8, int:12, uint:4, uint:32, pad:1, int:7", *v).tobytes() for v in values]
+    # the level binary products store the packets as hex strings
+    binaries[1] = binaries[1].hex()
+
+    buffer, lengths = binaries_to_buffer(binaries)
+    assert buffer.shape == (3, 8)
+    res = parse_static_batch(buffer, plan, lengths=lengths)
+
+    assert res.dtype.names == ("NIX00001", "NIX00002", "NIX00003", "NIX00004", "NIX00005")
+    assert [tuple(int(v) for v in r) for r in res] == values
+    for binary, row in zip(binaries, res):
+        binary = bytes.fromhex(binary) if isinstance(binary, str) else binary
+        _, fields = parse_plan(binary, plan)
+        assert [p.value for p in fields] == [int(v) for v in row]
+
+    headers = parse_bitstream_batch(buffer, {"a": "uint:4", "b": "pad:4", "c": "uint:4"})
+    assert headers.keys() == {"a", "c"}
+    assert headers["a"].tolist() == [0, 0, 15]
+    assert headers["c"].tolist() == [15, 7, 8]
+
+    with pytest.raises(ValueError):
+        parse_static_batch(buffer, IDBParsePlan(_variable_tree()))
+
+    buffer, lengths = binaries_to_buffer([binaries[0], binaries[2][:6]])
+    with pytest.raises(bitstring.ReadError):
+        parse_static_batch(buffer, plan, lengths=lengths)
+
+
+def test_parse_static_batch_unaligned_wide():
+    tree = IDBPacketTree(
+        children=[
+            _static_node("NIX00001", "uint:3", 0, 0),
+            # spans 9 bytes
+            _static_node("NIX00002", "uint:64", 0, 3),
+            _static_node("NIX00003", "int:61", 0, 3),
+        ]
+    )
+    plan = IDBParsePlan(tree)
+    assert plan.is_static
+    assert not IDBParsePlan(IDBPacketTree(children=[_static_node("NIX00004", "uint:72", 0, 0)])).is_static
+
+    values = [(5, 2**64 - 1), (2, 2**63 + 12345), (0, 1)]
+    binaries = [bitstring.pack("uint:3, uint:64, pad:5", *v).tobytes() for v in values]
+    buffer, lengths = binaries_to_buffer(binaries)
+    res = parse_static_batch(buffer, plan, lengths=lengths)
+    for binary, row in zip(binaries, res):
+        _, fields = parse_plan(binary, plan)
+        assert [p.value for p in fields] == [int(v) for v in row]
+    assert [int(v) for v in res["NIX00002"]] == [v[1] for v in values]
@@ -54,7 +54,7 @@ class TM_21_6_21(GenericTMPacket):
         # https://github.com/i4Ds/STIX-FSW/issues/953
         # In older version of the FSW the trigger were incorrectly compressed with the count
         # compression scheme so need to modify default parameters
-        idb = self.idb.get_idb(obt=self.data_header.datetime)
+        idb = self.get_idb()
         idb_version = tuple(map(int, idb.version.split(".")))
         if idb_version < (2, 26, 35):
             count_skm = params["NIX00260"]
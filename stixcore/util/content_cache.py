@@ -0,0 +1,215 @@
+"""Content addressed on-disk cache shared by all processes of the pipeline."""
+
+import os
+import json
+import stat
+import time
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from stixcore.config.config import CONFIG
+from stixcore.util.logging import get_logger
+
+__all__ = ["ContentCache", "hash_files", "link_tree"]
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "stixcore_cache"
+
+
+def hash_files(path):
+    """Get the hash of the content of a file or of all files of a directory.
+
+    Parameters
+    ----------
+    path : `pathlib.Path`
+        the file or directory
+
+    Returns
+    -------
+    `str`
+        the sha256 hex digest of the relative file names and contents
+    """
+    path = Path(path)
+    files = sorted(f for f in path.rglob("*") if f.is_file()) if path.is_dir() else [path]
+    content_hash = hashlib.sha256()
+    for file in files:
+        content_hash.update(str(file.relative_to(path) if path.is_dir() else file.name).encode())
+        content_hash.update(file.read_bytes())
+    return content_hash.hexdigest()
+
+
+def link_tree(source, target):
+    """Populate a directory with hard links to all files of a source directory.
+
+    Files are copied if they can not be linked (e.g. different file systems).
+
+    Parameters
+    ----------
+    source : `pathlib.Path`
+        the source directory
+    target : `pathlib.Path`
+        the target directory
+
+    Raises
+    ------
+    FileNotFoundError
+        if the source directory does not exist
+    """
+    if not Path(source).is_dir():
+        raise FileNotFoundError(f"Directory not found: {source}")
+    for file in Path(source).rglob("*"):
+        dest = Path(target) / file.relative_to(source)
+        if file.is_dir():
+            dest.mkdir(parents=True, exist_ok=True)
+            continue
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(file, dest)
+        except OSError:
+            shutil.copy2(file, dest)
+
+
+class ContentCache:
+    """Cache of immutable entries in a directory shared by all processes.
+
+    Each entry is a directory named by a key derived from the content it was created from (e.g. a
+    file hash). It holds meta data (JSON), numpy arrays (``.npy`` loaded as read-only memory maps)
+    and read-only snapshots of files. Entries are created atomically and never changed. Above the
+    configured number of entries the least recently used ones are removed, but only if not used
+    within the grace period (another process might be about to use them). The read-only file
+    permissions do not protect the snapshots against processes running as root.
+    """
+
+    def __init__(self, root=None, *, max_entries=None, grace=None):
+        """Create a new cache. The directory is created with the first entry.
+
+        Parameters
+        ----------
+        root : `str` or `pathlib.Path`, optional
+            the cache directory, by default config 'Paths.calibration_cache'
+        max_entries : `int`, optional
+            the maximum number of entries, by default config 'Pipeline.calibration_cache_entries'
+        grace : `float`, optional
+            seconds since the last use before an entry can be evicted, by default config
+            'Pipeline.calibration_cache_grace'
+        """
+        if root is None:
+            root = CONFIG.get("Paths", "calibration_cache", fallback="") or DEFAULT_CACHE_DIR
+        if max_entries is None:
+            max_entries = CONFIG.getint("Pipeline", "calibration_cache_entries", fallback=64)
+        if grace is None:
+            grace = CONFIG.getfloat("Pipeline", "calibration_cache_grace", fallback=3600)
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.grace = grace
+
+    def path(self, key):
+        """Get the directory of an entry.
+
+        Parameters
+        ----------
+        key : `str`
+            the key of the entry
+
+        Returns
+        -------
+        `pathlib.Path`
+            the directory of the entry
+        """
+        return self.root / key
+
+    def get(self, key):
+        """Get an entry and mark it as recently used.
+
+        Parameters
+        ----------
+        key : `str`
+            the key of the entry
+
+        Returns
+        -------
+        `tuple` (`dict`, `dict`) or `None`
+            the meta data and the read-only memory mapped arrays by name or `None` if not cached
+        """
+        path = self.path(key)
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+            arrays = {f.stem: np.load(f, mmap_mode="r") for f in path.glob("*.npy")}
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta, arrays
+
+    def put(self, key, *, meta=None, arrays=None, files=None):
+        """Add an entry if not present yet.
+
+        Parameters
+        ----------
+        key : `str`
+            the key of the entry
+        meta : `dict`, optional
+            JSON serializable meta data
+        arrays : `dict`, optional
+            numpy arrays by name
+        files : `pathlib.Path`, optional
+            a directory copied read-only into the 'files' folder of the entry
+
+        Returns
+        -------
+        `pathlib.Path`
+            the directory of the entry
+        """
+        path = self.path(key)
+        if (path / "meta.json").exists():
+            return path
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.root))
+        try:
+            if files is not None:
+                shutil.copytree(files, tmp / "files")
+                for file in (tmp / "files").rglob("*"):
+                    if file.is_file():
+                        file.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            for name, array in (arrays or {}).items():
+                np.save(tmp / f"{name}.npy", np.asarray(array))
+            (tmp / "meta.json").write_text(json.dumps(meta or {}))
+            os.chmod(tmp, 0o755)
+            # atomic: a concurrent process might have added the same entry meanwhile
+            os.rename(tmp, path)
+            logger.info(f"Added {key} to cache {self.root}")
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not (path / "meta.json").exists():
+                raise
+        self.evict()
+        return path
+
+    def evict(self):
+        """Remove the least recently used entries above the maximum number of entries.
+
+        Entries used within the grace period are kept even above the maximum number of entries.
+        """
+        entries = [e for e in self.root.iterdir() if e.is_dir() and not e.name.startswith(".")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        unused = time.time() - self.grace
+        for entry in entries[: len(entries) - self.max_entries]:
+            try:
+                if entry.stat().st_mtime > unused:
+                    break
+            except FileNotFoundError:
+                continue
+            # open memory maps and hard links of the files stay valid
+            shutil.rmtree(entry, ignore_errors=True)
+            logger.info(f"Evicted {entry.name} from cache {self.root}")
+
+    def clear(self):
+        """Remove all entries."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,150 @@
+"""Inter process locks for files written by several pipeline workers."""
+
+import os
+import time
+import fcntl
+import socket
+from pathlib import Path
+
+from stixcore.config.config import CONFIG
+from stixcore.util.logging import get_logger
+
+__all__ = ["FileLock", "FileLockTimeout"]
+
+logger = get_logger(__name__)
+
+
+class FileLockTimeout(TimeoutError):
+    """Raised if a file lock could not be acquired in time."""
+
+
+class FileLock:
+    """Exclusive advisory lock (``flock``) of a file shared by several processes.
+
+    The lock is held on a separate hidden lock file next to the file. The lock file contains the
+    lease of the holder (host, pid and time). The lock is released by the operating system if the
+    holder dies, so a held lock is never broken: processes waiting for a lock held longer than the
+    lease time only log a warning.
+
+    Examples
+    --------
+    >>> with FileLock(fitspath):  # doctest: +SKIP
+    ...     prod = prod + Product(fitspath)
+    ...     write(prod, fitspath)
+    """
+
+    def __init__(self, path, *, timeout=None, lease=None, poll_interval=0.1):
+        """Create a lock for the given file.
+
+        Parameters
+        ----------
+        path : `pathlib.Path`
+            the file to lock
+        timeout : `float`, optional
+            seconds to wait for the lock, by default config 'Pipeline.file_lock_timeout'
+        lease : `float`, optional
+            seconds after which a waiting process warns about the held lock, by default config
+            'Pipeline.file_lock_lease'
+        poll_interval : `float`, optional
+            seconds between the attempts to get the lock
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+        if timeout is None:
+            timeout = CONFIG.getfloat("Pipeline", "file_lock_timeout", fallback=3600)
+        if lease is None:
+            lease = CONFIG.getfloat("Pipeline", "file_lock_lease", fallback=6 * 3600)
+        self.timeout = timeout
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    @property
+    def locked(self):
+        """If the lock is held by this object."""
+        return self._fd is not None
+
+    def acquire(self):
+        """Wait for the lock and take it.
+
+        Raises
+        ------
+        `FileLockTimeout`
+            if the lock could not be acquired before the timeout.
+        """
+        if self.locked:
+            raise RuntimeError(f"Lock of {self.path} already held")
+        deadline = time.monotonic() + self.timeout
+        warned = False
+        while True:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o664)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                if not warned:
+                    warned = self._warn_exceeded_lease()
+                if time.monotonic() > deadline:
+                    raise FileLockTimeout(f"Could not lock {self.path} within {self.timeout}s")
+                time.sleep(self.poll_interval)
+                continue
+
+            # the lock file might have been removed by the previous holder
+            try:
+                current = os.stat(self.lock_path).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                os.close(fd)
+                continue
+
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{socket.gethostname()} {os.getpid()} {time.time()}".encode())
+            self._fd = fd
+            return self
+
+    def release(self):
+        """Release the lock and remove the lock file."""
+        if not self.locked:
+            return
+        try:
+            if os.stat(self.lock_path).st_ino == os.fstat(self._fd).st_ino:
+                os.unlink(self.lock_path)
+        except FileNotFoundError:
+            pass
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def lease_info(self):
+        """Read the lease of the current holder of the lock.
+
+        Returns
+        -------
+        `tuple` (`str`, `int`, `float`) or `None`
+            the host, pid and time the lock was taken or `None` if not available
+        """
+        try:
+            host, pid, taken = self.lock_path.read_text().split()
+            return host, int(pid), float(taken)
+        except (OSError, ValueError):
+            return None
+
+    def _warn_exceeded_lease(self):
+        lease = self.lease_info()
+        if lease is None:
+            return False
+        host, pid, taken = lease
+        if time.time() - taken <= self.lease:
+            return False
+        logger.warning(f"Waiting for the lock of {self.path} held by {host}:{pid} since {taken}")
+        return True
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __del__(self):
+        self.release()
@@ -0,0 +1,58 @@
+# benchmark of the batched Ba line post fit (fit_ba_lines) against the former pixel by pixel
+# fitting into one row DataFrames, on the bundled ECC test calibration data by default
+#
+# usage: python stixcore/util/scripts/ecc_post_fit_benchmark.py [erg_fits [livetime [workers ...]]]
+
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from stixcore.calibration.ecc_post_fit import (
+    Fit_Ba_Lines_Robust,
+    Read_fits_STIX_One_Pixel,
+    fit_ba_lines,
+    open_fits_tables,
+    read_all_pixels,
+)
+from stixcore.data.test import test_data
+
+
+def per_pixel_fit(data_erg, livetime):
+    accumulator = []
+    for DET in np.arange(32) + 1:
+        for PIX in range(12):
+            erg_c, obs, _ = Read_fits_STIX_One_Pixel(data_erg, PIX=PIX, DETECTOR_ID=DET)
+            P31, P81, dE31, dE81, err_P31, err_P81, err_dE31, err_dE81, H31, H81, Flag31, Flag81 = Fit_Ba_Lines_Robust(
+                erg_c, obs / livetime
+            )
+            row = {"DET": [DET], "PIX": [PIX], "P31": [P31], "P81": [P81], "Flag31": [Flag31], "Flag81": [Flag81]}
+            accumulator.append(pd.DataFrame(row))
+    return pd.concat(accumulator).reset_index(drop=True)
+
+
+def batched_fit(data_erg, livetime, workers):
+    erg_c, obs = read_all_pixels(data_erg)
+    return fit_ba_lines(erg_c, obs / livetime, max_workers=workers)
+
+
+if __name__ == "__main__":
+    erg_file = sys.argv[1] if len(sys.argv) > 1 else test_data.ecc.ecc_post_fit_erg_fits
+    livetime = float(sys.argv[2]) if len(sys.argv) > 2 else 17514.111
+    workers = [int(w) for w in sys.argv[3:]] or sorted({1, os.cpu_count() or 1})
+    data_erg = open_fits_tables(erg_file)[1][0]
+
+    tstart = perf_counter()
+    ref = per_pixel_fit(data_erg, livetime)
+    ref_time = perf_counter() - tstart
+    print(f"{'method':>20} {'time [s]':>10} {'speedup':>10} {'equal':>10}")
+    print(f"{'per pixel':>20} {ref_time:>10.3f} {1:>10.2f} {'':>10}")
+
+    for n in workers:
+        tstart = perf_counter()
+        res = batched_fit(data_erg, livetime, n)
+        duration = perf_counter() - tstart
+        equal = all(np.array_equal(ref[name].values, res[name]) for name in ref.columns)
+        print(f"{f'batched {n} workers':>20} {duration:>10.3f} {ref_time / duration:>10.2f} {str(equal):>10}")
@@ -0,0 +1,64 @@
+# benchmark of the LevelB control/data index joins (LevelB.__add__ and LevelB.from_packets)
+# on synthetic products, the peak memory has to scale linear with the number of packets
+# the former broadcast join (N x M boolean matrix) would need ~1TB for 1M packets
+#
+# usage: python stixcore/util/scripts/levelb_join_benchmark.py [n_packets ...]
+
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from astropy.table import Table
+
+from stixcore.products.levelb.binary import LevelB
+from stixcore.products.product import index_join
+
+PACKET_LENGTH = 32
+
+
+def synthetic_levelb(n, start=0):
+    control = Table()
+    control["scet_coarse"] = np.arange(start, start + n, dtype=np.uint32)
+    control["scet_fine"] = np.zeros(n, dtype=np.uint16)
+    control["sequence_count"] = (control["scet_coarse"] % 2**14).astype(np.uint16)
+    control["data_length"] = np.full(n, PACKET_LENGTH - 7, dtype=np.uint16)
+    control["index"] = np.arange(n, dtype=np.int64)
+
+    packets = np.zeros((n, PACKET_LENGTH), dtype=np.uint8)
+    packet_column = np.empty(n, dtype=object)
+    packet_column[:] = list(packets)
+    data = Table()
+    data["control_index"] = np.arange(n, dtype=np.int64)
+    data["data"] = packet_column
+    return LevelB(service_type=3, service_subtype=25, ssid=2, control=control, data=data)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    tstart = perf_counter()
+    res = func(*args)
+    duration = perf_counter() - tstart
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, duration, peak
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'packets':>10} {'join [s]':>10} {'join [MB]':>10} {'add [s]':>10} {'add [MB]':>10} {'MB/packet':>10}")
+    for n in sizes:
+        a = synthetic_levelb(n)
+        # half overlapping product -> 50% duplicates to remove
+        b = synthetic_levelb(n, start=n // 2)
+
+        keys = np.random.permutation(n)
+        _, join_time, join_peak = measure(index_join, keys, np.arange(n))
+        merged, add_time, add_peak = measure(LevelB.__add__, a, b)
+        assert len(merged.control) == len(merged.data) == n + n - n // 2
+
+        print(
+            f"{n:>10} {join_time:>10.3f} {join_peak / 1e6:>10.1f} {add_time:>10.3f} "
+            f"{add_peak / 1e6:>10.1f} {add_peak / 1e6 / (2 * n):>10.5f}"
+        )
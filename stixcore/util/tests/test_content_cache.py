@@ -0,0 +1,57 @@
+import os
+import time
+
+import numpy as np
+
+from stixcore.util.content_cache import ContentCache, hash_files, link_tree
+
+
+def test_content_cache(tmp_path):
+    cache = ContentCache(tmp_path / "cache", max_entries=2, grace=5)
+    assert cache.get("a") is None
+
+    path = cache.put("a", meta={"name": "a"}, arrays={"x": np.arange(6).reshape(2, 3)})
+    assert path == cache.path("a")
+    meta, arrays = cache.get("a")
+    assert meta == {"name": "a"}
+    assert isinstance(arrays["x"], np.memmap)
+    assert not arrays["x"].flags.writeable
+    assert np.array_equal(arrays["x"], np.arange(6).reshape(2, 3))
+
+    # existing entries are not replaced
+    cache.put("a", meta={"name": "other"})
+    assert cache.get("a")[0] == {"name": "a"}
+
+    # least recently used entry is evicted
+    cache.put("b")
+    os.utime(cache.path("b"), (time.time() - 10, time.time() - 10))
+    cache.get("a")
+    cache.put("c")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    # entries used within the grace period are kept above the maximum number of entries
+    cache.put("d")
+    assert all(cache.get(key) is not None for key in "acd")
+
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_content_cache_files(tmp_path):
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.txt").write_text("a")
+    (source / "sub" / "b.txt").write_text("b")
+    key = hash_files(source)
+
+    cache = ContentCache(tmp_path / "cache")
+    entry = cache.put(key, files=source)
+    target = tmp_path / "target"
+    link_tree(entry / "files", target)
+    assert (target / "sub" / "b.txt").samefile(entry / "files" / "sub" / "b.txt")
+    assert (target / "a.txt").read_text() == "a"
+
+    (source / "a.txt").write_text("changed")
+    assert hash_files(source) != key
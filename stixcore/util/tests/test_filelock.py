@@ -0,0 +1,62 @@
+import os
+import socket
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from stixcore.util.filelock import FileLock, FileLockTimeout
+
+
+def _append(path, value):
+    with FileLock(path, poll_interval=0.01):
+        # read, modify, write like the daily FITS writers
+        content = path.read_text() if path.exists() else ""
+        path.write_text(content + value)
+
+
+def test_file_lock(tmp_path):
+    path = tmp_path / "daily.fits"
+    lock = FileLock(path, timeout=0.1, poll_interval=0.01)
+    with lock:
+        assert lock.locked
+        assert lock.lock_path.exists()
+        host, pid, _ = lock.lease_info()
+        assert (host, pid) == (socket.gethostname(), os.getpid())
+        with pytest.raises(FileLockTimeout):
+            FileLock(path, timeout=0.1, poll_interval=0.01).acquire()
+    assert not lock.locked
+    assert not lock.lock_path.exists()
+
+
+def _hold(path):
+    FileLock(path).acquire()
+    # dies without releasing the lock
+    os._exit(0)
+
+
+def test_file_lock_exceeded_lease(tmp_path):
+    path = tmp_path / "daily.fits"
+    holder = FileLock(path).acquire()
+    # a lock held longer than the lease is not broken
+    with pytest.raises(FileLockTimeout):
+        FileLock(path, timeout=0.1, lease=0, poll_interval=0.01).acquire()
+    assert holder.lease_info()[1] == os.getpid()
+    holder.release()
+
+
+def test_file_lock_dead_holder(tmp_path):
+    path = tmp_path / "daily.fits"
+    process = multiprocessing.Process(target=_hold, args=(path,))
+    process.start()
+    process.join()
+    # the lock of a dead holder is released by the operating system
+    with FileLock(path, timeout=1, poll_interval=0.01) as lock:
+        assert lock.lease_info()[1] == os.getpid()
+
+
+def test_file_lock_processes(tmp_path):
+    path = tmp_path / "daily.txt"
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_append, [path] * 40, [str(i % 10) for i in range(40)]))
+    assert sorted(path.read_text()) == sorted("".join(str(i % 10) for i in range(40)))
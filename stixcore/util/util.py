@@ -9,6 +9,8 @@ __all__ = [
     "get_complete_file_name_and_path",
     "get_incomplete_file_name_and_path",
     "is_incomplete_file_name",
+    "get_journal_files",
+    "get_journal_file_name_and_path",
     "url_to_path",
 ]
 
@@ -38,6 +40,17 @@ def get_incomplete_file_name(name):
     return re.sub(r"_V([0-9]+)([\._])", r"_V\1U\2", name)
 
 
+def get_journal_files(path):
+    # sidecar files of pure time appends to a daily FITS file not yet compacted into the file
+    path = Path(path)
+    return sorted(path.parent.glob(f".{path.name}.*.journal"))
+
+
+def get_journal_file_name_and_path(path, number):
+    path = Path(path)
+    return path.parent / f".{path.name}.{number:04d}.journal"
+
+
 def url_to_path(fido_res: StixQueryResponse):
     if "url" in fido_res.columns:
         fido_res["path"] = [